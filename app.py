@@ -1,13 +1,23 @@
 from flask import Flask, jsonify
-from core.database import init_db
-from core.firebase_admin import init_firebase
+from core.database import init_db, close_client, start_index_build
+from core.firebase_admin import init_firebase, close_firebase
+from core.password_hashing import shutdown_password_hashing
+from core.tracing import shutdown_tracing
+from core.structured_logging import init_logging
+from core.scheduler import init_scheduler
+from core.principal_cache import init_principal_cache
+from core.token_denylist import init_token_denylist
+from core.presence import init_presence
+from core.health import init_health
+from core.single_flight import init_single_flight
 from features.auth.routes import auth_bp
 from features.orders.routes import orders_bp
 from features.notifications.routes import notifications_bp
 from features.history.routes import history_bp
+from features.notifications.services import dispatch_scheduled_notification
 
 from core.middleware import configure_middleware
-import logging
+from core.json_provider import BSONJSONProvider
 import os
 from dotenv import load_dotenv
 
@@ -18,20 +28,39 @@ def create_app():
     """Crea y configura la aplicación Flask"""
     app = Flask(__name__)
     
-    logging.basicConfig(
-        level=getattr(logging, os.getenv('LOG_LEVEL', 'INFO')),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    # JSON con ObjectId y fechas de MongoDB codificados directamente
+    app.json = BSONJSONProvider(app)
     
     # Cargar configuraciones
     app.config.from_object('config')
     
+    # Logs estructurados escritos desde un hilo aparte
+    init_logging(app)
+    
     # Inicializar Firebase Admin SDK
     init_firebase(app)
     
     # Inicializar conexión a MongoDB
     init_db(app)
     
+    # Caché de usuarios/repartidores autenticados
+    init_principal_cache(app)
+    
+    # Lecturas compartidas idénticas y simultáneas con una sola consulta
+    init_single_flight(app)
+    
+    # Tokens de acceso revocados (logout)
+    init_token_denylist(app)
+    
+    # Presencia de repartidores (heartbeats)
+    init_presence(app)
+    
+    # Planificador de notificaciones diferidas
+    init_scheduler(app, dispatch_scheduled_notification)
+    
+    # Sondas /healthz y /readyz con el estado cacheado de las dependencias
+    init_health(app)
+    
   
     configure_middleware(app)
     
@@ -69,6 +98,45 @@ def create_app():
     
     return app
 
+def start_background_services(app):
+    """
+    Arranca en el proceso actual los hilos en segundo plano de la aplicación.
+    Con BACKGROUND_SERVICES_AUTOSTART desactivado create_app no los arranca
+    y gunicorn llama a esta función en cada worker tras el fork.
+    """
+    start_index_build(app)
+    for name in ('log_pipeline', 'notification_scheduler', 'presence_tracker', 'health_monitor'):
+        service = app.extensions.get(name)
+        if service is not None:
+            service.start()
+
+def shutdown_app(app):
+    """
+    Detiene los trabajadores en segundo plano de la aplicación y libera los
+    recursos del proceso (al terminar un worker del servidor).
+    """
+    scheduler = app.extensions.get('notification_scheduler')
+    if scheduler is not None:
+        scheduler.stop(timeout=app.config.get('SHUTDOWN_TIMEOUT_SECONDS', 10))
+    
+    health = app.extensions.get('health_monitor')
+    if health is not None:
+        health.stop(timeout=app.config.get('SHUTDOWN_TIMEOUT_SECONDS', 10))
+    
+    presence = app.extensions.get('presence_tracker')
+    if presence is not None:
+        presence.stop(timeout=app.config.get('SHUTDOWN_TIMEOUT_SECONDS', 10))
+    
+    shutdown_password_hashing(wait=True)
+    close_firebase()
+    close_client()
+    shutdown_tracing()
+    
+    # Último: escribe los registros pendientes, incluidos los del cierre
+    log_pipeline = app.extensions.get('log_pipeline')
+    if log_pipeline is not None:
+        log_pipeline.stop()
+
 if __name__ == '__main__':
     app = create_app()
     port = int(os.getenv('PORT', 5000))
@@ -0,0 +1,8 @@
+"""
+Punto de entrada ASGI para producción.
+
+    hypercorn --workers 4 --bind 0.0.0.0:8000 asgi:app
+"""
+from async_app import create_async_app
+
+app = create_async_app()
@@ -0,0 +1,100 @@
+from quart import Quart
+from asgiref.wsgi import WsgiToAsgi
+from hypercorn.middleware import ProxyFixMiddleware
+from werkzeug.exceptions import HTTPException
+from app import create_app, shutdown_app
+from core.async_database import init_async_db
+from core.async_middleware import configure_async_middleware
+from features.auth.async_routes import auth_async_bp
+from features.orders.async_routes import orders_async_bp
+from features.notifications.async_routes import notifications_async_bp
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDispatcher:
+    """
+    Aplicación ASGI que atiende con Quart las rutas con versión asíncrona
+    (lecturas frecuentes y asignación de pedidos, con motor y FCM asíncrono)
+    y delega el resto en la aplicación Flask a través de un puente WSGI.
+    
+    Las rutas de ambas aplicaciones tienen los mismos endpoints, así que
+    comparten los límites de peticiones, la lista de tokens revocados, la
+    caché de principales y la presencia de repartidores.
+    """
+    def __init__(self, async_app, flask_app):
+        """
+        Inicializa el despachador.
+        
+        Args:
+            async_app (Quart): Aplicación con las rutas asíncronas.
+            flask_app (Flask): Aplicación síncrona completa.
+        """
+        self.async_app = async_app
+        self.flask_app = flask_app
+        self.handler = async_app
+        # Las rutas delegadas ya pasan por el ProxyFix de la aplicación Flask
+        trusted_hops = flask_app.config.get('PROXY_FIX_TRUSTED_HOPS', 0)
+        if trusted_hops > 0:
+            self.handler = ProxyFixMiddleware(async_app, mode="legacy", trusted_hops=trusted_hops)
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.adapter = async_app.url_map.bind('')
+    
+    def is_async_route(self, path, method):
+        """
+        Indica si una petición tiene versión asíncrona.
+        
+        Args:
+            path (str): Ruta de la petición.
+            method (str): Método HTTP.
+        
+        Returns:
+            bool: True si la atiende la aplicación asíncrona.
+        """
+        # Las peticiones preflight de CORS las resuelve flask_cors
+        if method == 'OPTIONS':
+            return False
+        try:
+            self.adapter.match(path, method)
+            return True
+        except HTTPException:
+            # 404, 405 y redirecciones siguen el comportamiento de Flask
+            return False
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and not self.is_async_route(scope['path'], scope['method']):
+            return await self.wsgi(scope, receive, send)
+        return await self.handler(scope, receive, send)
+
+
+def create_async_app():
+    """
+    Crea la aplicación ASGI: la API asíncrona sobre la misma configuración
+    y los mismos componentes que create_app.
+    
+    Returns:
+        AsyncDispatcher: Aplicación ASGI.
+    """
+    flask_app = create_app()
+    
+    app = Quart(__name__)
+    app.config.from_mapping(flask_app.config)
+    app.extensions['flask_app'] = flask_app
+    
+    # Cliente motor del proceso (se abre al arrancar el servidor)
+    init_async_db(app)
+    
+    configure_async_middleware(app)
+    
+    # Mismos prefijos y nombres de blueprint que la API síncrona
+    api_prefix = app.config.get('API_PREFIX', '/api')
+    app.register_blueprint(auth_async_bp, url_prefix=f"{api_prefix}/auth")
+    app.register_blueprint(orders_async_bp, url_prefix=f"{api_prefix}/orders")
+    app.register_blueprint(notifications_async_bp, url_prefix=f"{api_prefix}/notifications")
+    
+    @app.after_serving
+    async def shutdown():
+        shutdown_app(flask_app)
+    
+    return AsyncDispatcher(app, flask_app)
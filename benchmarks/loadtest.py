@@ -0,0 +1,478 @@
+"""
+Pruebas de carga de los endpoints principales.
+
+Arranca create_app en el propio proceso contra un mongod local (--mongo-uri)
+o, por defecto, contra una base de datos en memoria (mongomock), con un
+backend FCM falso que simula la latencia de Firebase. Siembra usuarios,
+repartidores, dispositivos, historial y pedidos pendientes, y ejecuta los
+escenarios en orden:
+
+    shift_start       los repartidores inician sesión y envían un heartbeat,
+                      y los usuarios inician sesión
+    order_burst       ráfaga de pedidos (cada uno avisa a los repartidores)
+    pending_poll      tormenta de consultas de pedidos pendientes
+    history_browsing  historial, estadísticas y detalle de pedidos
+
+El informe (JSON con --output) incluye, por escenario y endpoint, el número
+de peticiones, errores, rendimiento y latencias p50/p95/p99. Con --compare
+se muestran las diferencias frente a un informe anterior.
+
+Uso:
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/loadtest.py [--mongo-uri mongodb://localhost:27017]
+        [--couriers 50] [--users 25] [--concurrency 16] [--polls 10]
+        [--fcm-latency-ms 40] [--output loadtest.json] [--compare anterior.json]
+
+Con --mongo-uri la base de datos --mongo-db se borra y se vuelve a sembrar.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PASSWORD = 'loadtest-password'
+SCENARIOS = ('shift_start', 'order_burst', 'pending_poll', 'history_browsing')
+
+
+class InMemoryMongoClient:
+    """
+    Sustituto de MongoClient sobre un único cliente mongomock compartido por
+    el proceso. Responde a los comandos de administración que usa la
+    aplicación (ismaster, ping).
+    """
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        import mongomock
+
+        with self._lock:
+            if InMemoryMongoClient._shared is None:
+                InMemoryMongoClient._shared = mongomock.MongoClient()
+
+    @property
+    def admin(self):
+        return self
+
+    def command(self, *args, **kwargs):
+        return {"ok": 1.0}
+
+    def __getitem__(self, name):
+        return self._shared[name]
+
+    def __getattr__(self, name):
+        return getattr(self._shared, name)
+
+    def close(self):
+        pass
+
+
+class FakeFCM:
+    """
+    Backend FCM falso: cada envío espera la latencia configurada y devuelve
+    una respuesta correcta por token, con la forma de las del SDK.
+    """
+    def __init__(self, latency):
+        self.latency = latency
+        self.messages = 0
+        self.calls = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _count(self, messages):
+        with self._lock:
+            self.calls += 1
+            self.messages += messages
+
+    def _responses(self, tokens):
+        from firebase_admin import messaging
+
+        return messaging.BatchResponse([
+            messaging.SendResponse({"name": f"projects/loadtest/messages/{next(self._ids)}"}, None)
+            for _ in tokens
+        ])
+
+    def send(self, message, dry_run=False, app=None):
+        time.sleep(self.latency)
+        self._count(1)
+        return f"projects/loadtest/messages/{next(self._ids)}"
+
+    def send_each_for_multicast(self, multicast_message, dry_run=False, app=None):
+        time.sleep(self.latency)
+        self._count(len(multicast_message.tokens))
+        return self._responses(multicast_message.tokens)
+
+    async def send_each_for_multicast_async(self, multicast_message, dry_run=False, app=None):
+        await asyncio.sleep(self.latency)
+        self._count(len(multicast_message.tokens))
+        return self._responses(multicast_message.tokens)
+
+    def install(self):
+        from firebase_admin import messaging
+        import core.firebase_admin
+
+        messaging.send = self.send
+        messaging.send_each_for_multicast = self.send_each_for_multicast
+        messaging.send_each_for_multicast_async = self.send_each_for_multicast_async
+        # Sin credenciales reales: basta con que haya una aplicación
+        core.firebase_admin.get_firebase_app = lambda: object()
+
+
+class Recorder:
+    """
+    Latencias y errores por endpoint del escenario en curso.
+    """
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, elapsed, ok):
+        with self._lock:
+            self.samples.setdefault(endpoint, []).append(elapsed)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self, duration):
+        endpoints = {}
+        for endpoint, samples in sorted(self.samples.items()):
+            samples = sorted(samples)
+            endpoints[endpoint] = {
+                "count": len(samples),
+                "errors": self.errors.get(endpoint, 0),
+                "throughput_rps": round(len(samples) / duration, 1),
+                "p50_ms": percentile(samples, 50),
+                "p95_ms": percentile(samples, 95),
+                "p99_ms": percentile(samples, 99),
+                "max_ms": round(samples[-1] * 1000, 2)
+            }
+        total = sum(len(samples) for samples in self.samples.values())
+        return {
+            "duration_s": round(duration, 3),
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "throughput_rps": round(total / duration, 1),
+            "endpoints": endpoints
+        }
+
+
+def percentile(sorted_samples, p):
+    """
+    Percentil por rango más cercano, en milisegundos.
+    """
+    index = max(0, min(len(sorted_samples) - 1, -(-len(sorted_samples) * p // 100) - 1))
+    return round(sorted_samples[int(index)] * 1000, 2)
+
+
+class LoadClient:
+    """
+    Cliente de pruebas de Flask por hilo que registra cada petición bajo el
+    nombre de su endpoint (método y plantilla de la ruta).
+    """
+    def __init__(self, app):
+        self.app = app
+        # Se sustituye al empezar cada escenario
+        self.recorder = Recorder()
+        self._local = threading.local()
+
+    def request(self, method, path, endpoint, token=None, json_body=None, expected=(200, 201)):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+        started = time.perf_counter()
+        response = client.open(path, method=method, headers=headers, json=json_body)
+        elapsed = time.perf_counter() - started
+
+        ok = response.status_code in expected
+        self.recorder.record(f"{method} {endpoint}", elapsed, ok)
+        return response.get_json(silent=True) if ok else None
+
+
+def seed(db, args, rng):
+    """
+    Siembra la base de datos con datos realistas.
+
+    Returns:
+        dict: Cuentas sembradas ('users', 'couriers') con email y token FCM.
+    """
+    from werkzeug.security import generate_password_hash
+    from features.auth.models import User, Courier, DeviceToken
+    from features.orders.models import Order
+    from features.notifications.models import Notification
+    from config import PASSWORD_HASH_METHOD
+
+    # Mismo hash para todas las cuentas: el login verifica con el coste real
+    password_hash = generate_password_hash(PASSWORD, PASSWORD_HASH_METHOD)
+    now = datetime.utcnow()
+
+    accounts = {"users": [], "couriers": []}
+    devices = []
+    for role, model, count in (('user', User, args.users), ('courier', Courier, args.couriers)):
+        docs = []
+        for i in range(count):
+            token = f"loadtest-{role}-{i:06d}-" + 'x' * 48
+            doc = model(f"{role}{i}@loadtest.example", f"{role.title()} {i:04d}", f"55{i:08d}", password_hash, token).to_dict()
+            docs.append(doc)
+            accounts[f"{role}s"].append({"email": doc["email"], "fcm_token": token})
+        result = getattr(db, f"{role}s").insert_many(docs)
+        for doc, account, _id in zip(docs, accounts[f"{role}s"], result.inserted_ids):
+            account["_id"] = _id
+            device = DeviceToken(_id, role, account["fcm_token"], DeviceToken.PLATFORM_ANDROID).to_dict()
+            devices.append(device)
+            # Algunos tienen un segundo dispositivo
+            if rng.random() < 0.3:
+                devices.append(DeviceToken(_id, role, account["fcm_token"] + '-tablet', DeviceToken.PLATFORM_IOS).to_dict())
+    db.device_tokens.insert_many(devices)
+
+    # Historial: pedidos completados repartidos en los últimos 30 días
+    orders = []
+    for user in accounts["users"]:
+        for _ in range(args.history):
+            courier = rng.choice(accounts["couriers"])
+            order = Order(user["_id"], "Pedido de prueba con varias cosas", "Av. Siempre Viva 742", {"name": user["email"]}).to_dict()
+            created_at = now - timedelta(minutes=rng.randint(60, 30 * 24 * 60))
+            order.update({
+                "status": Order.STATUS_COMPLETED,
+                "courier_id": courier["_id"],
+                "courier_info": {"name": courier["email"]},
+                "created_at": created_at,
+                "updated_at": created_at + timedelta(minutes=35),
+                "assigned_at": created_at + timedelta(minutes=5),
+                "completed_at": created_at + timedelta(minutes=35)
+            })
+            orders.append(order)
+    for _ in range(args.pending):
+        user = rng.choice(accounts["users"])
+        orders.append(Order(user["_id"], "Pedido pendiente de prueba", "Calle Falsa 123", {"name": user["email"]}).to_dict())
+    if orders:
+        db.orders.insert_many(orders)
+
+    notifications = [
+        {
+            "user_id": user["_id"],
+            "role": Notification.ROLE_USER,
+            "title": "Tu pedido está en camino",
+            "body": "El repartidor ya salió",
+            "data": {},
+            "type": "order_update",
+            "related_id": None,
+            "read": rng.random() < 0.7,
+            "created_at": now - timedelta(minutes=rng.randint(1, 10000))
+        }
+        for user in accounts["users"] for _ in range(args.history)
+    ]
+    if notifications:
+        db.notifications.insert_many(notifications)
+
+    return accounts
+
+def run_scenario(pool, tasks):
+    """
+    Ejecuta las tareas con el pool y devuelve la duración en segundos.
+    """
+    started = time.perf_counter()
+    for future in [pool.submit(task) for task in tasks]:
+        future.result()
+    return time.perf_counter() - started
+
+def build_scenarios(client, accounts, args, rng):
+    """
+    Devuelve los escenarios como funciones que generan la lista de tareas,
+    evaluadas en orden (cada escenario usa las sesiones del anterior).
+    """
+    sessions = {"users": {}, "couriers": {}}
+    prefix = '/api'
+
+    def courier_shift(courier):
+        def task():
+            body = client.request('POST', f'{prefix}/auth/couriers/login', '/api/auth/couriers/login', json_body={
+                "email": courier["email"], "password": PASSWORD, "fcm_token": courier["fcm_token"]
+            })
+            if body:
+                sessions["couriers"][courier["email"]] = body["token"]
+                client.request('POST', f'{prefix}/auth/couriers/heartbeat', '/api/auth/couriers/heartbeat', token=body["token"])
+        return task
+
+    def user_login(user):
+        def task():
+            body = client.request('POST', f'{prefix}/auth/users/login', '/api/auth/users/login', json_body={
+                "email": user["email"], "password": PASSWORD, "fcm_token": user["fcm_token"]
+            })
+            if body:
+                sessions["users"][user["email"]] = body["access_token"]
+        return task
+
+    def create_order(token, i):
+        def task():
+            client.request('POST', f'{prefix}/orders/', '/api/orders/', token=token, json_body={
+                "notes": f"Ráfaga de pedidos #{i}: dos pizzas y un refresco",
+                "address": f"Calle {i} número {rng.randint(1, 999)}"
+            })
+        return task
+
+    def poll_pending(token):
+        def task():
+            for _ in range(args.polls):
+                client.request('GET', f'{prefix}/orders/pending?limit=20&skip=0', '/api/orders/pending', token=token)
+        return task
+
+    def browse_history(token):
+        def task():
+            body = client.request('GET', f'{prefix}/history?limit=20&skip=0', '/api/history', token=token)
+            client.request('GET', f'{prefix}/history?limit=20&skip=20', '/api/history', token=token)
+            client.request('GET', f'{prefix}/history/statistics', '/api/history/statistics', token=token)
+            orders = (body or {}).get("orders") or []
+            for order in orders[:3]:
+                client.request('GET', f'{prefix}/history/orders/{order["_id"]}', '/api/history/orders/<order_id>', token=token)
+            client.request('GET', f'{prefix}/notifications?limit=20', '/api/notifications', token=token)
+        return task
+
+    return {
+        "shift_start": lambda: [courier_shift(c) for c in accounts["couriers"]] + [user_login(u) for u in accounts["users"]],
+        "order_burst": lambda: [
+            create_order(token, i)
+            for i, token in enumerate(itertools.islice(itertools.cycle(sessions["users"].values()), args.orders))
+        ] if sessions["users"] else [],
+        "pending_poll": lambda: [poll_pending(token) for token in sessions["couriers"].values()],
+        "history_browsing": lambda: [browse_history(token) for token in sessions["users"].values()]
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def compare(results, baseline_path):
+    """
+    Muestra la variación de p95 y rendimiento frente a un informe anterior.
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    print(f"\nComparación con {baseline_path} ({baseline['meta'].get('commit')}):")
+    for scenario, summary in results["scenarios"].items():
+        previous = baseline["scenarios"].get(scenario, {}).get("endpoints", {})
+        for endpoint, stats in summary["endpoints"].items():
+            before = previous.get(endpoint)
+            if not before:
+                continue
+            p95 = (stats["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0
+            rps = (stats["throughput_rps"] - before["throughput_rps"]) / before["throughput_rps"] * 100 if before["throughput_rps"] else 0
+            print(f"  {scenario:<17} {endpoint:<38} p95 {p95:+7.1f}%  rps {rps:+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mongo-uri', help='mongod local; por defecto mongomock en memoria')
+    parser.add_argument('--mongo-db', default='delivery_loadtest', help='Base de datos (se borra al empezar)')
+    parser.add_argument('--users', type=int, default=25)
+    parser.add_argument('--couriers', type=int, default=50)
+    parser.add_argument('--history', type=int, default=20, help='Pedidos completados por usuario')
+    parser.add_argument('--pending', type=int, default=40, help='Pedidos pendientes iniciales')
+    parser.add_argument('--orders', type=int, default=50, help='Pedidos de la ráfaga')
+    parser.add_argument('--polls', type=int, default=10, help='Consultas de pendientes por repartidor')
+    parser.add_argument('--concurrency', type=int, default=16, help='Hilos cliente')
+    parser.add_argument('--fcm-latency-ms', type=float, default=40)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='Escenarios a ejecutar (todos por defecto)')
+    parser.add_argument('--output', help='Fichero JSON donde guardar el informe')
+    parser.add_argument('--compare', help='Informe JSON anterior con el que comparar')
+    args = parser.parse_args()
+
+    # Configuración de la aplicación antes de importarla
+    os.environ['MONGO_URI'] = args.mongo_uri or 'mongodb://in-memory'
+    os.environ['MONGO_DB_NAME'] = args.mongo_db
+    os.environ['MONGO_INDEX_BUILD'] = 'startup'
+    os.environ.setdefault('LOG_LEVEL', 'ERROR')
+    os.environ.setdefault('RATE_LIMIT_ENABLED', 'False')
+    os.environ.setdefault('TRACING_ENABLED', 'False')
+
+    import core.database
+    if not args.mongo_uri:
+        core.database.MongoClient = InMemoryMongoClient
+    fcm = FakeFCM(args.fcm_latency_ms / 1000)
+    fcm.install()
+
+    from app import create_app, shutdown_app
+
+    app = create_app()
+    with app.app_context():
+        core.database.get_client().drop_database(args.mongo_db)
+    core.database.ensure_indexes(app)
+
+    rng = random.Random(args.seed)
+    with app.app_context():
+        accounts = seed(core.database.get_db(), args, rng)
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "backend": "mongod" if args.mongo_uri else "mongomock",
+            "started_at": datetime.utcnow().isoformat() + 'Z',
+            "params": {key: value for key, value in vars(args).items() if key not in ('output', 'compare')}
+        },
+        "scenarios": {}
+    }
+
+    client = LoadClient(app)
+    scenarios = build_scenarios(client, accounts, args, rng)
+    # shift_start siempre se ejecuta: abre las sesiones del resto
+    selected = [name for name in SCENARIOS if not args.scenario or name in args.scenario or name == 'shift_start']
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for name in selected:
+            client.recorder = Recorder()
+            duration = run_scenario(pool, scenarios[name]())
+            results["scenarios"][name] = client.recorder.summary(duration)
+
+    results["meta"]["fcm"] = {"calls": fcm.calls, "messages": fcm.messages}
+
+    # Los heartbeats del turno deben llegar a MongoDB: un fallo del volcado
+    # solo se registra en el log y dejaría la prueba sin escrituras
+    presence = app.extensions.get('presence_tracker')
+    if presence is not None:
+        presence.flush()
+        with app.app_context():
+            persisted = core.database.get_db().couriers.count_documents({"last_seen_at": {"$exists": True}})
+        results["meta"]["presence"] = {"persisted": persisted, "pending": len(presence.pending_ids())}
+    shutdown_app(app)
+
+    print(f"{'escenario':<17} {'endpoint':<38} {'n':>6} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, summary in results["scenarios"].items():
+        for endpoint, stats in summary["endpoints"].items():
+            print(
+                f"{name:<17} {endpoint:<38} {stats['count']:>6} {stats['errors']:>4} {stats['throughput_rps']:>8.1f} "
+                f"{stats['p50_ms']:>7.1f}ms {stats['p95_ms']:>7.1f}ms {stats['p99_ms']:>7.1f}ms"
+            )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+    pending = results["meta"].get("presence", {}).get("pending")
+    if pending:
+        print(f"\nNo se pudo guardar la presencia de {pending} repartidores (ver el log)")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""
+Micro-benchmarks de los caminos en Python puro que se ejecutan en cada
+petición: serialización de pedidos y notificaciones, post-procesado de las
+filas del historial, validación de tokens FCM e ObjectId, formateo del
+payload de send_notification y verificación del JWT en token_required.
+
+Los datos de entrada son fijos (IDs, fechas y tokens constantes) para que
+los resultados sean comparables entre commits. Las lecturas de MongoDB y
+los envíos a FCM se sustituyen por respuestas fijas: solo se mide CPU.
+
+Uso:
+    python benchmarks/micro.py [--repeat 5] [--output micro.json]
+        [--baseline micro.json] [--max-regression 0.25]
+
+Con --baseline se compara cada caso con un resultado anterior y el script
+termina con código 1 si alguno es más lento que --max-regression.
+"""
+from datetime import datetime, timedelta
+from bson import ObjectId
+import argparse
+import importlib
+import json
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+import jwt
+
+from core.utils import validate_fcm_token, validate_objectid
+from core.middleware import authenticate_token
+from core.token_denylist import init_token_denylist
+from features.orders.models import Order
+from features.notifications.models import Notification
+import core.firebase_admin
+
+# El paquete reexporta las funciones con el mismo nombre que sus módulos
+user_history_module = importlib.import_module('features.history.services.get_user_history')
+courier_history_module = importlib.import_module('features.history.services.get_courier_history')
+
+JWT_SECRET = 'microbench-secret-key-with-32-bytes!'
+BASE_DATE = datetime(2024, 5, 17, 12, 30, 0)
+USER_ID = ObjectId('65f1a2b3c4d5e6f708192a3b')
+COURIER_ID = ObjectId('65f1a2b3c4d5e6f708192a3c')
+FCM_TOKEN = 'dQw4w9WgXcQ:APA91bHun4MxP5egoKMwt2KZFBaFUH-1RYqx' + 'A1b2C3d4_-' * 10
+
+
+def order_fixture(i=0):
+    """
+    Pedido completado con todos sus campos, como sale de MongoDB.
+    """
+    created_at = BASE_DATE + timedelta(minutes=i)
+    return {
+        "_id": ObjectId('65f1a2b3c4d5e6f7%08x' % i),
+        "user_id": USER_ID,
+        "notes": "Dos pizzas medianas, una sin cebolla, y dos refrescos de cola",
+        "address": "Av. Insurgentes Sur 1602, piso 4, Col. Crédito Constructor",
+        "user_info": {"name": "Ana María López", "phone": "5512345678", "email": "ana@example.com"},
+        "status": Order.STATUS_COMPLETED,
+        "courier_id": COURIER_ID,
+        "courier_info": {"name": "Luis Pérez", "phone": "5587654321"},
+        "created_at": created_at,
+        "updated_at": created_at + timedelta(minutes=41),
+        "assigned_at": created_at + timedelta(minutes=4),
+        "completed_at": created_at + timedelta(minutes=41)
+    }
+
+def notification_fixture():
+    return {
+        "_id": ObjectId('65f1a2b3c4d5e6f708192a40'),
+        "user_id": USER_ID,
+        "role": Notification.ROLE_USER,
+        "title": "Tu pedido está en camino",
+        "body": "Luis Pérez ha recogido tu pedido y va hacia tu dirección",
+        "data": {"order_id": "65f1a2b3c4d5e6f708192a3d", "type": "order_assigned"},
+        "type": "order_assigned",
+        "related_id": "65f1a2b3c4d5e6f708192a3d",
+        "read": False,
+        "created_at": BASE_DATE
+    }
+
+
+class FixedCollection:
+    """
+    Colección que devuelve filas fijas: las del historial para la consulta
+    paginada y una fila de estadísticas para el $group.
+    """
+    def __init__(self, rows, stats):
+        self.rows = rows
+        self.stats = stats
+
+    def aggregate(self, pipeline):
+        if any("$group" in stage for stage in pipeline):
+            return iter([dict(self.stats)])
+        # El servicio modifica las filas: se entrega una copia en cada llamada
+        return iter([dict(row) for row in self.rows])
+
+    def count_documents(self, query):
+        return 240
+
+
+class FixedDatabase:
+    def __init__(self, rows, stats):
+        self.orders = FixedCollection(rows, stats)
+
+
+def history_rows(courier=False):
+    rows = []
+    for i in range(20):
+        row = order_fixture(i)
+        if courier:
+            row.update({
+                "assignment_duration_minutes": 4.016666666666667 + i / 7,
+                "delivery_duration_minutes": 37.03333333333333 + i / 3,
+                "total_duration_minutes": 41.05 + i / 3
+            })
+        else:
+            row["duration_minutes"] = 41.05 + i / 3
+        rows.append(row)
+    return rows
+
+def build_cases(app):
+    """
+    Devuelve los casos como pares (nombre, función sin argumentos).
+    """
+    order = order_fixture()
+    notification = notification_fixture()
+
+    user_db = FixedDatabase(history_rows(), {
+        "_id": None, "total_orders": 240, "avg_duration": 42.3333333, "min_duration": 18.5, "max_duration": 95.25
+    })
+    courier_db = FixedDatabase(history_rows(courier=True), {
+        "_id": None, "total_orders": 240, "avg_assignment_duration": 4.5, "avg_delivery_duration": 37.75,
+        "avg_total_duration": 42.25
+    })
+    user_history_module.get_db = lambda: user_db
+    courier_history_module.get_db = lambda: courier_db
+
+    # Sin red: se mide la preparación del mensaje, no el envío
+    core.firebase_admin.get_firebase_app = lambda: None
+    core.firebase_admin._send_message = lambda message: 'projects/microbench/messages/1'
+
+    access_token = jwt.encode({
+        'exp': datetime(2100, 1, 1), 'iat': BASE_DATE, 'jti': 'f' * 32, 'type': 'access',
+        'user_id': str(USER_ID), 'role': 'user', 'name': 'Ana María López', 'active': True
+    }, JWT_SECRET, algorithm="HS256")
+    auth_header = f"Bearer {access_token}"
+    payload_data = {"order_id": "65f1a2b3c4d5e6f708192a3d", "type": "new_order", "related_id": 12345, "urgent": True}
+
+    def in_app(fn):
+        def run():
+            with app.app_context():
+                return fn()
+        return run
+
+    return [
+        ("order.serialize_for_api", lambda: Order.serialize_for_api(order)),
+        ("notification.serialize_for_api", lambda: Notification.serialize_for_api(notification)),
+        ("history.user_rows_20", lambda: user_history_module.get_user_history(str(USER_ID))),
+        ("history.courier_rows_20", lambda: courier_history_module.get_courier_history(str(COURIER_ID))),
+        ("utils.validate_fcm_token", lambda: validate_fcm_token(FCM_TOKEN)),
+        ("utils.validate_fcm_token_invalid", lambda: validate_fcm_token('token-corto')),
+        ("utils.validate_objectid", lambda: validate_objectid('65f1a2b3c4d5e6f708192a3b')),
+        ("utils.validate_objectid_invalid", lambda: validate_objectid('no-es-un-objectid')),
+        ("fcm.send_notification_payload", lambda: core.firebase_admin.send_notification(FCM_TOKEN, "Nuevo pedido disponible", "Ana María ha realizado un nuevo pedido", payload_data)),
+        ("jwt.decode", lambda: jwt.decode(access_token, JWT_SECRET, algorithms=["HS256"])),
+        ("middleware.authenticate_token", in_app(lambda: authenticate_token(auth_header))),
+        ("app_context_overhead", in_app(lambda: None)),
+    ]
+
+def measure(fn, repeat):
+    """
+    Coste por llamada en nanosegundos: mejor de `repeat` rondas, con el
+    número de llamadas por ronda calibrado para durar al menos 0,2 s.
+    """
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='Rondas por caso')
+    parser.add_argument('--output', help='Fichero JSON donde guardar los resultados')
+    parser.add_argument('--baseline', help='Resultados anteriores con los que comparar')
+    parser.add_argument('--max-regression', type=float, default=0.25, help='Empeoramiento máximo admitido (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    # Los logs de los servicios no forman parte de la medida
+    logging.disable(logging.CRITICAL)
+
+    app = Flask('microbench')
+    app.config.update(JWT_SECRET_KEY=JWT_SECRET, JWT_ACCESS_TOKEN_EXPIRES=900)
+    init_token_denylist(app)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)["results"]
+
+    results = {}
+    regressions = []
+    for name, fn in build_cases(app):
+        ns = measure(fn, args.repeat)
+        results[name] = {"ns_per_op": round(ns, 1), "ops_per_s": round(1e9 / ns)}
+
+        line = f"{name:<34} {ns / 1000:>10.2f} us/op"
+        previous = baseline.get(name)
+        if previous:
+            change = ns / previous["ns_per_op"] - 1
+            line += f"  {change:+7.1%}"
+            if change > args.max_regression:
+                regressions.append(name)
+                line += "  REGRESIÓN"
+        print(line)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+
+    if regressions:
+        print(f"\nCasos más lentos que el umbral ({args.max_regression:.0%}): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark del arranque en frío: tiempo de importación del módulo `app`,
+tiempo de `create_app()` y los módulos más caros de importar.
+
+Cada medición se hace en un intérprete nuevo, como al arrancar un contenedor
+o un worker de gunicorn sin preload. create_app crea los índices únicos
+antes de servir; sin --mongo-uri se usa la misma base de datos en memoria
+que benchmarks/loadtest.py (requiere mongomock), así que esas consultas
+no cuentan. Con MONGO_INDEX_BUILD=background (por defecto) el resto de
+índices no se espera.
+
+Uso:
+    python benchmarks/startup.py [--runs 5] [--top 15] [--output startup.json]
+        [--mongo-uri mongodb://localhost:27017]
+"""
+from statistics import median
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Se termina con os._exit para no medir ni esperar a los hilos en segundo plano
+BOOT_SCRIPT = """
+import json, os, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+if os.environ.get('STARTUP_IN_MEMORY_MONGO') == 'True':
+    import core.database
+    from benchmarks.loadtest import InMemoryMongoClient
+    core.database.MongoClient = InMemoryMongoClient
+boot_started = time.perf_counter()
+app.create_app()
+booted = time.perf_counter()
+print(json.dumps({"import_ms": (imported - started) * 1000, "create_app_ms": (booted - boot_started) * 1000}), flush=True)
+os._exit(0)
+"""
+
+
+def measure_boot(env):
+    """
+    Arranca la aplicación en un proceso nuevo.
+
+    Returns:
+        dict: Milisegundos de importación y de create_app, más el total
+            del proceso (incluye el arranque del intérprete).
+    """
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-c', BOOT_SCRIPT],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    elapsed = (time.perf_counter() - started) * 1000
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = elapsed
+    return result
+
+def top_imports(env, top):
+    """
+    Obtiene los módulos de primer nivel con mayor tiempo de importación
+    acumulado (python -X importtime).
+
+    Returns:
+        list: Pares [módulo, milisegundos] ordenados de mayor a menor.
+    """
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stderr
+
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        # Solo imports directos de `app` y de sus módulos del proyecto
+        if name.startswith('  ') and not name.startswith('    '):
+            cumulative[name.strip()] = int(cumulative_us) / 1000
+
+    return sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:top]
+
+def summarize(values):
+    return {"median": round(median(values), 1), "min": round(min(values), 1), "max": round(max(values), 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Arranques a medir')
+    parser.add_argument('--top', type=int, default=15, help='Módulos más lentos a mostrar')
+    parser.add_argument('--output', help='Fichero JSON donde guardar los resultados')
+    parser.add_argument('--mongo-uri', help='MongoDB real; por defecto, en memoria')
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.mongo_uri:
+        env['MONGO_URI'] = args.mongo_uri
+    else:
+        env['STARTUP_IN_MEMORY_MONGO'] = 'True'
+    env.setdefault('MONGO_INDEX_BUILD', 'background')
+    env.setdefault('SCHEDULER_ENABLED', 'False')
+
+    runs = [measure_boot(env) for _ in range(args.runs)]
+    results = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "import_ms": summarize([run["import_ms"] for run in runs]),
+        "create_app_ms": summarize([run["create_app_ms"] for run in runs]),
+        "process_ms": summarize([run["process_ms"] for run in runs]),
+        "top_imports_ms": top_imports(env, args.top)
+    }
+
+    for key in ("import_ms", "create_app_ms", "process_ms"):
+        stats = results[key]
+        print(f"{key:<15} mediana {stats['median']:>8.1f}  mín {stats['min']:>8.1f}  máx {stats['max']:>8.1f}")
+    print("\nImports más lentos (ms acumulados):")
+    for name, elapsed in results["top_imports_ms"]:
+        print(f"  {elapsed:>8.1f}  {name}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
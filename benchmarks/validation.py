@@ -0,0 +1,110 @@
+"""
+Benchmark de la validación de peticiones: coste por carga de los esquemas
+más usados con una instancia nueva por petición (comportamiento anterior de
+validate_schema), con la instancia cacheada y con el validador compilado.
+
+Uso:
+    python benchmarks/validation.py [--number 20000] [--output validation.json]
+"""
+from marshmallow import ValidationError
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schemas.compiler import compile_schema
+from schemas.orders import CreateOrderSchema
+from schemas.notification_schemas import NotificationQuerySchema
+from schemas.auth import LoginSchema, RegisterUserSchema, RegisterCourierSchema, UpdateFCMTokenSchema, RefreshTokenSchema
+
+FCM_TOKEN = 'dQw4w9WgXcQ:APA91bH' + 'x' * 140
+
+# (esquema, caso, datos de entrada)
+CASES = [
+    (CreateOrderSchema, 'valid', {"notes": "Dos pizzas medianas y un refresco", "address": "Av. Central 123"}),
+    (CreateOrderSchema, 'invalid', {"notes": "hey", "extra": 1}),
+    (NotificationQuerySchema, 'valid', {"limit": "20", "skip": "40", "unread_only": "true"}),
+    (NotificationQuerySchema, 'invalid', {"limit": "500", "skip": "-1"}),
+    (LoginSchema, 'valid', {"email": "ana@example.com", "password": "secreto123", "fcm_token": FCM_TOKEN, "platform": "android"}),
+    (LoginSchema, 'invalid', {"email": "ana", "fcm_token": "corto"}),
+    (RegisterUserSchema, 'valid', {
+        "email": "ana@example.com", "name": "Ana María", "phone": "5512345678",
+        "password": "secreto123", "fcm_token": FCM_TOKEN
+    }),
+    (RegisterUserSchema, 'invalid', {"email": "ana@example.com", "name": "A", "phone": "55-12", "password": "1"}),
+    (RegisterCourierSchema, 'valid', {
+        "email": "luis@example.com", "name": "Luis", "phone": "5587654321",
+        "password": "secreto123", "fcm_token": FCM_TOKEN
+    }),
+    (UpdateFCMTokenSchema, 'valid', {"fcm_token": FCM_TOKEN, "platform": "ios"}),
+    (RefreshTokenSchema, 'valid', {"refresh_token": "eyJhbGciOiJIUzI1NiJ9.e30.signature"}),
+]
+
+
+def per_call_us(fn, data, number):
+    """
+    Mide el coste medio de una carga en microsegundos.
+    """
+    def run():
+        try:
+            fn(data)
+        except ValidationError:
+            pass
+
+    # Mejor de 3 repeticiones para reducir el ruido
+    return min(timeit.repeat(run, number=number, repeat=3)) / number * 1e6
+
+def check_equivalent(schema, compiled, data):
+    """
+    Comprueba que el validador compilado devuelve lo mismo que Marshmallow.
+    """
+    def outcome(fn):
+        try:
+            return fn(data), None
+        except ValidationError as err:
+            return None, err.messages
+
+    return outcome(schema.load) == outcome(compiled)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=20000, help='Cargas por medición')
+    parser.add_argument('--output', help='Fichero JSON donde guardar los resultados')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'esquema':<24} {'caso':<8} {'nueva':>9} {'cacheada':>9} {'compilada':>10} {'mejora':>7}")
+    for schema_class, case, data in CASES:
+        schema = schema_class()
+        compiled = compile_schema(schema)
+        if compiled is None:
+            print(f"{schema_class.__name__:<24} no compilable, se omite")
+            continue
+        if not check_equivalent(schema, compiled, data):
+            raise SystemExit(f"El validador compilado de {schema_class.__name__} no coincide con Marshmallow")
+
+        row = {
+            "schema": schema_class.__name__,
+            "case": case,
+            "new_instance_us": per_call_us(lambda d: schema_class().load(d), data, args.number),
+            "cached_instance_us": per_call_us(schema.load, data, args.number),
+            "compiled_us": per_call_us(compiled, data, args.number)
+        }
+        row["speedup"] = row["new_instance_us"] / row["compiled_us"]
+        results.append(row)
+        print(
+            f"{row['schema']:<24} {case:<8} {row['new_instance_us']:>7.1f}us {row['cached_instance_us']:>7.1f}us "
+            f"{row['compiled_us']:>8.1f}us {row['speedup']:>6.1f}x"
+        )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"python": sys.version.split()[0], "number": args.number, "results": results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,20 +9,114 @@ DEBUG = os.getenv('DEBUG', 'False') == 'True'
 SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
 ENV = os.getenv('FLASK_ENV', 'development')
 
+# Background threads (scheduler, presence, health checks, index build) start in
+# create_app. gunicorn with preload_app turns this off and starts them in each
+# worker after the fork, so no lock is inherited held
+BACKGROUND_SERVICES_AUTOSTART = os.getenv('BACKGROUND_SERVICES_AUTOSTART', 'True') == 'True'
+SHUTDOWN_TIMEOUT_SECONDS = int(os.getenv('SHUTDOWN_TIMEOUT_SECONDS', 10))  # max wait for each background thread on worker exit
+
 # MongoDB Settings
 MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/delivery_app')
 MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'delivery_app')
+# Unique indexes are always created at startup; the rest are built in a thread
+# ('background'), at startup ('startup') or by `flask create-indexes` ('off')
+MONGO_INDEX_BUILD = os.getenv('MONGO_INDEX_BUILD', 'background')
 
 # Firebase Settings
 FIREBASE_CREDENTIALS_PATH = os.getenv('FIREBASE_CREDENTIALS_PATH', 'deliversurimbo-firebase-adminsdk-fbsvc-e7d73aeff9.json')
+DEVICE_TOKEN_TTL_SECONDS = int(os.getenv('DEVICE_TOKEN_TTL_SECONDS', 5184000))  # devices unseen for 60 days are dropped
 
 # JWT Setting
 JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', SECRET_KEY)
-JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 86400))  # 24 hours by default
+JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 900))  # 15 minutes by default
+JWT_REFRESH_TOKEN_EXPIRES = int(os.getenv('JWT_REFRESH_TOKEN_EXPIRES', 2592000))  # 30 days by default
+
+# Principal cache used by token_required
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv('PRINCIPAL_CACHE_MAX_SIZE', 10000))  # 0 to disable
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv('PRINCIPAL_CACHE_TTL_SECONDS', 60))
+
+# Password hashing (process pool)
+PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')  # full form, as stored in the hash
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))  # 0 to hash on the request thread
+PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 64))
+PASSWORD_HASH_TIMEOUT = int(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+
+# Scheduled notifications
+SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'True') == 'True'
+SCHEDULER_TICK_MS = int(os.getenv('SCHEDULER_TICK_MS', 100))
+SCHEDULER_LOAD_HORIZON_SECONDS = int(os.getenv('SCHEDULER_LOAD_HORIZON_SECONDS', 60))
+SCHEDULER_LOCK_TIMEOUT_SECONDS = int(os.getenv('SCHEDULER_LOCK_TIMEOUT_SECONDS', 300))
+SCHEDULER_MAX_WORKERS = int(os.getenv('SCHEDULER_MAX_WORKERS', 4))
+PENDING_ORDER_REMINDER_SECONDS = int(os.getenv('PENDING_ORDER_REMINDER_SECONDS', 300))  # 0 to disable
+
+# Courier presence (heartbeats)
+COURIER_PRESENCE_WINDOW_SECONDS = int(os.getenv('COURIER_PRESENCE_WINDOW_SECONDS', 0))  # broadcast only to couriers seen this recently, 0 to disable
+PRESENCE_FLUSH_SECONDS = int(os.getenv('PRESENCE_FLUSH_SECONDS', 15))
+
+# Rate limiting (GCRA). Rules are "<requests>/<second|minute|hour|day>[/<burst>]"
+RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'True') == 'True'
+RATE_LIMIT_STORAGE = os.getenv('RATE_LIMIT_STORAGE', 'memory')  # 'memory' (per process) or 'mongo' (shared)
+RATE_LIMIT_DEFAULT = os.getenv('RATE_LIMIT_DEFAULT', '300/minute')  # per principal and blueprint, empty to disable
+RATE_LIMIT_RULES = os.getenv(
+    'RATE_LIMIT_RULES',
+    'orders.get_pending_orders_controller=60/minute/10;orders.assign_order_controller=20/minute/5'
+)  # "<endpoint or blueprint>=<rule>" separated by ';'
+
+# Reverse proxy: number of proxies/load balancers in front of the app whose
+# X-Forwarded-For and X-Forwarded-Proto headers are trusted. Anonymous rate
+# limits are keyed on the client IP, so set it when deploying behind one
+PROXY_FIX_TRUSTED_HOPS = int(os.getenv('PROXY_FIX_TRUSTED_HOPS', 0))  # 0 = clients connect directly
+
+# Response compression (gzip, and brotli when the package is installed)
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'True') == 'True'
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))  # bytes; smaller responses go out as is
+COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', 6))  # gzip, 1-9
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))  # brotli, 0-11
+COMPRESSION_MIMETYPES = os.getenv('COMPRESSION_MIMETYPES', 'application/json,text/html,text/plain').split(',')
+
+# Prometheus metrics on /metrics (requires prometheus_client). Set
+# PROMETHEUS_MULTIPROC_DIR to aggregate every gunicorn worker
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+METRICS_AUTH_TOKEN = os.getenv('METRICS_AUTH_TOKEN')  # bearer token required to scrape, if set
+
+# Tracing (requires opentelemetry-sdk; the otlp exporter also needs
+# opentelemetry-exporter-otlp-proto-http)
+TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'False') == 'True'
+TRACING_EXPORTER = os.getenv('TRACING_EXPORTER', 'file')  # 'file', 'otlp' or 'console'
+TRACING_FILE_PATH = os.getenv('TRACING_FILE_PATH', 'traces.{pid}.jsonl')  # one JSON span per line
+TRACING_OTLP_ENDPOINT = os.getenv('TRACING_OTLP_ENDPOINT', 'http://localhost:4318/v1/traces')
+TRACING_SAMPLE_RATIO = float(os.getenv('TRACING_SAMPLE_RATIO', 1.0))
+TRACING_SERVICE_NAME = os.getenv('TRACING_SERVICE_NAME', 'delivery-api')
+
+# Request validation: compile Marshmallow schemas into faster loaders (same
+# errors); schemas with hooks the compiler does not support use schema.load
+SCHEMA_COMPILED_VALIDATORS = os.getenv('SCHEMA_COMPILED_VALIDATORS', 'True') == 'True'
+
+# Identical in-flight shared reads (pending orders, broadcast recipients)
+# share one MongoDB execution
+SINGLE_FLIGHT_ENABLED = os.getenv('SINGLE_FLIGHT_ENABLED', 'True') == 'True'
+
+# On-demand request profiling: cProfile runs for a sampled fraction of requests,
+# or when PROFILING_HEADER carries PROFILING_TOKEN, and each profile is saved
+# as <timestamp>_<endpoint>_<latency>ms_<id>.pstats in PROFILING_DIR
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False') == 'True'
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', 0.0))  # 0.001 = one request in a thousand
+PROFILING_HEADER = os.getenv('PROFILING_HEADER', 'X-Profile')
+PROFILING_TOKEN = os.getenv('PROFILING_TOKEN')  # header disabled if unset
+PROFILING_DIR = os.getenv('PROFILING_DIR', 'profiles')
+PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', 200))  # oldest profiles are deleted beyond this
+
+# Health probes (/healthz, /readyz)
+HEALTH_CHECK_INTERVAL_SECONDS = int(os.getenv('HEALTH_CHECK_INTERVAL_SECONDS', 5))  # dependency checks run in a background thread
+HEALTH_MAX_QUEUE_BACKLOG = int(os.getenv('HEALTH_MAX_QUEUE_BACKLOG', 10000))  # not ready above this many queued items
 
 # Setting Logging
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'  # used when LOG_STRUCTURED is off
+LOG_STRUCTURED = os.getenv('LOG_STRUCTURED', 'True') == 'True'  # one JSON object per line
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))  # records beyond this are dropped
+# Fraction of INFO/DEBUG records kept per logger ("logger=ratio;logger=ratio"); warnings are never sampled
+LOG_SAMPLING = os.getenv('LOG_SAMPLING', 'core.firebase_admin=0.1')
 
 # prefix for our api
 API_PREFIX = '/api'
\ No newline at end of file
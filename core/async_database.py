@@ -0,0 +1,114 @@
+from quart import current_app
+from motor.motor_asyncio import AsyncIOMotorClient
+from bson import ObjectId
+from core.identity_map import collection_for_role
+from core.metrics import mongo_event_listeners
+from core.tracing import mongo_trace_listeners
+from core.single_flight import AsyncSingleFlight
+import logging
+
+logger = logging.getLogger(__name__)
+
+def get_async_db():
+    """
+    Get the async (motor) database of the ASGI application.
+    
+    The client is created when the server starts serving, inside its event
+    loop, and shared by every request of the process.
+    """
+    return current_app.extensions['motor_db']
+
+async def open_async_db(app):
+    """
+    Create the motor client of the process and check the connection.
+    """
+    client = AsyncIOMotorClient(
+        app.config['MONGO_URI'],
+        event_listeners=mongo_event_listeners(app.extensions['flask_app']) + mongo_trace_listeners(app.extensions['flask_app'])
+    )
+    await client.admin.command('ping')
+    
+    app.extensions['motor_client'] = client
+    app.extensions['motor_db'] = client[app.config['MONGO_DB_NAME']]
+    logger.info("Conexión asíncrona a MongoDB establecida correctamente")
+
+async def close_async_db(app):
+    """
+    Close the motor client of the process.
+    """
+    client = app.extensions.pop('motor_client', None)
+    app.extensions.pop('motor_db', None)
+    
+    if client is not None:
+        client.close()
+        logger.info("Conexión asíncrona a MongoDB cerrada")
+
+def init_async_db(app):
+    """
+    Registers the motor client lifecycle in the ASGI application.
+    """
+    # Same switch as the WSGI single-flight (SINGLE_FLIGHT_ENABLED)
+    if app.extensions['flask_app'].extensions.get('single_flight') is not None:
+        app.extensions['single_flight'] = AsyncSingleFlight()
+    
+    @app.before_serving
+    async def _open():
+        await open_async_db(app)
+    
+    @app.after_serving
+    async def _close():
+        await close_async_db(app)
+
+async def coalesce_async(name, fn, **params):
+    """
+    Run a shared (non-personalized) read through the ASGI application's
+    single-flight, so identical in-flight reads share one MongoDB round trip.
+    
+    Args:
+        name (str): Nombre de la lectura (ej. 'orders.pending').
+        fn (callable): Corrutina que realiza la lectura.
+        **params: Parámetros de la lectura.
+    
+    Returns:
+        Resultado de la lectura, de solo lectura.
+    """
+    group = current_app.extensions.get('single_flight')
+    if group is None:
+        return await fn(**params)
+    return await group.do(name, fn, **params)
+
+async def load_principal_async(role, user_id):
+    """
+    Get a user or courier document from the principal cache shared with the
+    WSGI application and, if it isn't cached, from MongoDB through motor.
+    
+    Args:
+        role (str): Rol ('user' o 'courier').
+        user_id (str|ObjectId): ID del usuario o repartidor.
+    
+    Returns:
+        dict: Documento del principal o None si no existe.
+    """
+    cache = current_app.extensions['flask_app'].extensions.get('principal_cache')
+    
+    principal = cache.get(role, user_id) if cache is not None else None
+    if principal is not None:
+        return principal
+    
+    principal = await get_async_db()[collection_for_role(role)].find_one({"_id": ObjectId(user_id)})
+    if principal and cache is not None:
+        cache.set(role, user_id, principal)
+    
+    return principal
+
+def invalidate_principal_async(role, user_id):
+    """
+    Discard a principal from the shared cache after modifying its document.
+    
+    Args:
+        role (str): Rol ('user' o 'courier').
+        user_id (str|ObjectId): ID del usuario o repartidor.
+    """
+    cache = current_app.extensions['flask_app'].extensions.get('principal_cache')
+    if cache is not None:
+        cache.invalidate(role, user_id)
@@ -0,0 +1,179 @@
+from quart import request, jsonify, g, current_app
+from quart.wrappers.response import DataBody
+from functools import wraps
+from bson import ObjectId
+from core.middleware import authenticate_token
+from core.rate_limit import request_principal, MongoRateLimitStore
+from core.exceptions import AppError, TooManyRequestsError
+from core.tracing import tracing_available, start_request_span, end_request_span, start_span
+from core.metrics import metrics_enabled, request_started, request_finished, refresh_queue_depths
+from core.compression import available_encodings, compress_body, should_compress, add_vary_accept_encoding
+import asyncio
+import logging
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+def sync_context():
+    """
+    Abre un contexto de la aplicación Flask asociada, para usar desde las
+    vistas asíncronas los componentes compartidos con la API síncrona
+    (configuración, lista de tokens revocados, límites, cachés, presencia).
+    
+    Returns:
+        AppContext: Contexto de la aplicación Flask.
+    """
+    return current_app.extensions['flask_app'].app_context()
+
+def _authenticate_request():
+    # Igual que core.middleware.authenticate_request, sobre el g de Quart
+    if 'auth_result' not in g:
+        with sync_context():
+            g.auth_result = authenticate_token(request.headers.get('Authorization'))
+    return g.auth_result
+
+async def _check_rate_limit():
+    flask_app = current_app.extensions['flask_app']
+    limiter = flask_app.extensions.get('rate_limiter')
+    if limiter is None or request.endpoint is None:
+        return 0
+    
+    claims, _ = _authenticate_request()
+    principal = request_principal(claims, request.remote_addr)
+    
+    # Los endpoints se registran con los mismos nombres que en la API
+    # síncrona, así que ambas comparten los contadores de cada grupo
+    endpoint, blueprint = request.endpoint, request.blueprint
+    
+    def check():
+        with flask_app.app_context():
+            return limiter.check(principal, endpoint, blueprint)
+    
+    try:
+        if isinstance(limiter.store, MongoRateLimitStore):
+            return await asyncio.to_thread(check)
+        return check()
+    except Exception as e:
+        # Un fallo del almacén no debe bloquear el servicio
+        logger.error(f"Error al comprobar el límite de peticiones: {str(e)}")
+        return 0
+
+def configure_async_middleware(app):
+    """
+    Configura en la aplicación ASGI el mismo middleware que
+    configure_middleware aplica a la API síncrona.
+    """
+    @app.before_request
+    async def start_timer():
+        g.start_time = time.time()
+    
+    if tracing_available(app.extensions['flask_app']):
+        @app.before_request
+        async def tracing_request_started():
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            g.request_span = start_request_span(request.method, route, request.headers, {"http.target": request.path})
+        
+        @app.after_request
+        async def tracing_response_status(response):
+            g.request_span_status = response.status_code
+            return response
+        
+        @app.teardown_request
+        async def tracing_request_finished(e=None):
+            end_request_span(g.pop('request_span', None), g.pop('request_span_status', 500), e)
+    
+    if metrics_enabled(app.extensions['flask_app']):
+        @app.before_request
+        async def metrics_request_started():
+            g.metrics_started = time.perf_counter()
+            request_started(request.method)
+        
+        @app.after_request
+        async def metrics_response_status(response):
+            g.metrics_status = response.status_code
+            return response
+        
+        @app.teardown_request
+        async def metrics_request_finished(e=None):
+            started = g.pop('metrics_started', None)
+            if started is None:
+                return
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            request_finished(request.method, route, g.pop('metrics_status', 500), time.perf_counter() - started)
+            refresh_queue_depths(app.extensions['flask_app'])
+    
+    @app.before_request
+    async def rate_limit():
+        retry_after = await _check_rate_limit()
+        if retry_after > 0:
+            logger.warning(f"Límite de peticiones superado en {request.endpoint}")
+            raise TooManyRequestsError(retry_after=math.ceil(retry_after))
+    
+    @app.after_request
+    async def log_request_info(response):
+        # CORS: mismo comportamiento por defecto que flask_cors
+        if 'Origin' in request.headers:
+            response.headers['Access-Control-Allow-Origin'] = '*'
+        
+        if hasattr(g, 'start_time'):
+            elapsed_time = time.time() - g.start_time
+            logger.info(f"{request.method} {request.path} {response.status_code} - {elapsed_time:.4f}s")
+        
+        return response
+    
+    @app.after_request
+    async def compress(response):
+        # Solo cuerpos en memoria: los de streaming o ficheros se envían tal cual
+        if not isinstance(response.response, DataBody) or not should_compress(request.method, response.status_code, response.mimetype,
+                                                       response.content_length, response.headers, app.config):
+            return response
+        
+        add_vary_accept_encoding(response.headers)
+        
+        encoding = request.accept_encodings.best_match(available_encodings())
+        if encoding is None:
+            return response
+        
+        try:
+            response.set_data(compress_body(await response.get_data(), encoding, app.config))
+            response.headers['Content-Encoding'] = encoding
+        except Exception as e:
+            logger.error(f"Error al comprimir la respuesta: {str(e)}")
+        
+        return response
+    
+    @app.errorhandler(500)
+    async def server_error(e):
+        logger.error(f"Error interno del servidor: {str(e)}")
+        return jsonify({"error": "Error interno del servidor", "status": 500}), 500
+    
+    @app.errorhandler(AppError)
+    async def app_error(e):
+        response = jsonify({"error": e.message})
+        if isinstance(e, TooManyRequestsError):
+            response.headers['Retry-After'] = str(e.retry_after)
+        elif e.status_code == 503:
+            response.headers['Retry-After'] = '1'
+        return response, e.status_code
+
+def async_token_required(f):
+    """
+    Decorador para verificar el token JWT en las rutas asíncronas.
+    Aplica exactamente las mismas comprobaciones que token_required.
+    """
+    @wraps(f)
+    async def decorated(*args, **kwargs):
+        with start_span('token_required'):
+            data, error = _authenticate_request()
+        
+        if error:
+            return jsonify({'error': error}), 401
+        
+        g.user_id = ObjectId(data['user_id'])
+        g.role = data['role']
+        g.claims = data
+        
+        return await f(*args, **kwargs)
+    
+    return decorated
@@ -0,0 +1,112 @@
+from flask import current_app, request
+import gzip
+import logging
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - solo se ofrece gzip
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Códigos de respuesta que nunca llevan cuerpo
+NO_BODY_STATUS = (204, 304)
+
+
+def available_encodings():
+    """
+    Devuelve las codificaciones soportadas, por orden de preferencia.
+
+    Returns:
+        list: 'br' (si brotli está instalado) y 'gzip'.
+    """
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+def compress_body(data, encoding, config):
+    """
+    Comprime el cuerpo de una respuesta.
+
+    Args:
+        data (bytes): Cuerpo sin comprimir.
+        encoding (str): 'br' o 'gzip'.
+        config (dict): Configuración de la aplicación.
+
+    Returns:
+        bytes: Cuerpo comprimido.
+    """
+    if encoding == 'br':
+        return brotli.compress(data, quality=config.get('COMPRESSION_BROTLI_QUALITY', 4))
+    # mtime fijo: la misma respuesta produce siempre los mismos bytes
+    return gzip.compress(data, compresslevel=config.get('COMPRESSION_LEVEL', 6), mtime=0)
+
+def should_compress(method, status_code, mimetype, content_length, headers, config):
+    """
+    Indica si una respuesta cumple los umbrales para comprimirse.
+
+    Args:
+        method (str): Método HTTP de la petición.
+        status_code (int): Código de la respuesta.
+        mimetype (str): Tipo de contenido de la respuesta.
+        content_length (int): Tamaño del cuerpo en bytes (None si se desconoce).
+        headers: Cabeceras de la respuesta.
+        config (dict): Configuración de la aplicación.
+
+    Returns:
+        bool: True si conviene comprimir.
+    """
+    if not config.get('COMPRESSION_ENABLED', True) or method == 'HEAD':
+        return False
+    if status_code < 200 or status_code in NO_BODY_STATUS:
+        return False
+    # Ya comprimida (o codificada de otra forma)
+    if 'Content-Encoding' in headers:
+        return False
+    if mimetype not in config.get('COMPRESSION_MIMETYPES', ()):
+        return False
+    return content_length is not None and content_length >= config.get('COMPRESSION_MIN_SIZE', 1024)
+
+def add_vary_accept_encoding(headers):
+    """
+    Añade Accept-Encoding a la cabecera Vary para las cachés intermedias.
+
+    Args:
+        headers: Cabeceras de la respuesta.
+    """
+    vary = headers.get('Vary', '')
+    if 'accept-encoding' not in vary.lower():
+        headers['Vary'] = f"{vary}, Accept-Encoding" if vary else 'Accept-Encoding'
+
+def compress_response(response):
+    """
+    Comprime la respuesta actual con la mejor codificación aceptada por el
+    cliente (Accept-Encoding). Las respuestas en streaming, las ya
+    comprimidas y las menores que COMPRESSION_MIN_SIZE se devuelven intactas.
+
+    Args:
+        response (Response): Respuesta de Flask.
+
+    Returns:
+        Response: Respuesta, comprimida si procede.
+    """
+    config = current_app.config
+
+    if response.direct_passthrough or response.is_streamed:
+        return response
+
+    if not should_compress(request.method, response.status_code, response.mimetype,
+                           response.content_length, response.headers, config):
+        return response
+
+    add_vary_accept_encoding(response.headers)
+
+    encoding = request.accept_encodings.best_match(available_encodings())
+    if encoding is None:
+        return response
+
+    try:
+        response.set_data(compress_body(response.get_data(), encoding, config))
+        response.headers['Content-Encoding'] = encoding
+    except Exception as e:
+        logger.error(f"Error al comprimir la respuesta: {str(e)}")
+
+    return response
@@ -1,59 +1,180 @@
 from flask import current_app, g
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure
+from core.metrics import mongo_event_listeners
+from core.tracing import mongo_trace_listeners
+import threading
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+_client_lock = threading.Lock()
+_client = None
+_client_pid = None
+_index_build_pid = None
+
+def get_client():
+    """
+    Get the MongoClient of the current process, or create it if it doesn't exist.
+    
+    MongoClient keeps its own connection pool and is thread-safe, so a single
+    instance is shared by every request of the process. It is not fork-safe:
+    a client inherited from the parent process is discarded and recreated.
+    """
+    global _client, _client_pid
+    
+    if _client is not None and _client_pid == os.getpid():
+        return _client
+    
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            try:
+                mongo_client = MongoClient(
+                    current_app.config['MONGO_URI'],
+                    event_listeners=mongo_event_listeners() + mongo_trace_listeners(current_app)
+                )
+                mongo_client.admin.command('ismaster')
+                
+                _client = mongo_client
+                _client_pid = os.getpid()
+                
+                logger.info("Conexión a MongoDB establecida correctamente")
+            except ConnectionFailure as e:
+                logger.error(f"No se pudo conectar a MongoDB: {e}")
+                raise
+    
+    return _client
+
 def get_db():
     """
     Get the current connection to the database,
     or create a new one if it doesn't exist.
     """
     if 'db' not in g:
-        try:
-            mongo_client = MongoClient(current_app.config['MONGO_URI'])
-            mongo_client.admin.command('ismaster')
-            
-            #Esto guarda el cliente y base de datos en el contexto de la aplicacion
-            g.mongo_client = mongo_client
-            g.db = mongo_client[current_app.config['MONGO_DB_NAME']]
-            
-            logger.info("Conexión a MongoDB establecida correctamente")
-        except ConnectionFailure as e:
-            logger.error(f"No se pudo conectar a MongoDB: {e}")
-            raise
+        #Esto guarda la base de datos en el contexto de la aplicacion
+        g.db = get_client()[current_app.config['MONGO_DB_NAME']]
     
     return g.db
 
 def close_db(e=None):
     """
-    Close the connection to the database if it is open.
+    Release the database of the current context. The process client stays
+    open for the next requests.
+    """
+    g.pop('db', None)
+
+def close_client():
+    """
+    Close the MongoClient of the current process (worker shutdown).
     """
-    mongo_client = g.pop('mongo_client', None)
+    global _client, _client_pid
+    
+    with _client_lock:
+        mongo_client = _client if _client_pid == os.getpid() else None
+        _client = None
+        _client_pid = None
     
     if mongo_client is not None:
         mongo_client.close()
         logger.info("Conexión a MongoDB cerrada")
 
+def reset_client():
+    """
+    Forget a client inherited through fork without closing it, since its
+    sockets belong to the parent process. The next get_db() creates a new one.
+    """
+    global _client, _client_pid
+    
+    with _client_lock:
+        _client = None
+        _client_pid = None
+
 def init_db(app):
     """
     Initializes the connection to the database and 
     registers the closing function for cleaning.
+    
+    Unique indexes are integrity constraints (duplicate emails, device and
+    refresh tokens are rejected through DuplicateKeyError), so they are
+    always reconciled before serving and a failure aborts startup. The rest
+    follow MONGO_INDEX_BUILD: a background thread ('background'), before
+    serving ('startup') or only through `flask create-indexes` ('off').
     """
     app.teardown_appcontext(close_db)
     
-    # Create necessary indexes for the application
+    @app.cli.command('create-indexes')
+    def create_indexes_command():
+        """Create or update the MongoDB indexes and exit."""
+        ensure_indexes(app)
+    
+    ensure_unique_indexes(app)
+    
+    mode = app.config.get('MONGO_INDEX_BUILD', 'background')
+    if mode == 'startup':
+        ensure_secondary_indexes(app)
+    elif mode == 'background' and app.config.get('BACKGROUND_SERVICES_AUTOSTART', True):
+        start_index_build(app)
+
+def start_index_build(app):
+    """
+    Start the background build of the non-unique indexes, when
+    MONGO_INDEX_BUILD is 'background'.
+    """
+    global _index_build_pid
+    
+    if app.config.get('MONGO_INDEX_BUILD', 'background') != 'background':
+        return
+    # once per process: gunicorn calls it again in each worker
+    with _client_lock:
+        if _index_build_pid == os.getpid():
+            return
+        _index_build_pid = os.getpid()
+    threading.Thread(target=_ensure_indexes_in_background, args=(app,), name="mongo-indexes", daemon=True).start()
+
+def _ensure_indexes_in_background(app):
+    try:
+        ensure_secondary_indexes(app)
+    except Exception as e:
+        logger.error(f"Error al crear los índices de MongoDB: {str(e)}")
+
+def ensure_indexes(app):
+    """
+    Create every index the application needs. create_index is idempotent,
+    so running it on every deploy only touches indexes that changed.
+    """
+    ensure_unique_indexes(app)
+    ensure_secondary_indexes(app)
+
+def ensure_unique_indexes(app):
+    """
+    Create the unique indexes the services rely on to reject duplicates.
+    """
     with app.app_context():
         db = get_db()
         
-        # user indexes
         db.users.create_index("email", unique=True)
+        db.couriers.create_index("email", unique=True)
+        # a device token belongs to a single owner
+        db.device_tokens.create_index("token", unique=True)
+        db.refresh_tokens.create_index("jti", unique=True)
+        
+        logger.info("Índices únicos de MongoDB creados correctamente")
+
+def ensure_secondary_indexes(app):
+    """
+    Create the non-unique and TTL indexes, which only affect performance
+    and cleanup.
+    """
+    with app.app_context():
+        db = get_db()
+        
+        # user indexes
         db.users.create_index("fcm_token")
         
         # deliver indexes
-        db.couriers.create_index("email", unique=True)
         db.couriers.create_index("fcm_token")
+        db.couriers.create_index("last_seen_at")
         
         # order indexes
         db.orders.create_index("user_id")
@@ -61,4 +182,22 @@ def init_db(app):
         db.orders.create_index("status")
         db.orders.create_index("created_at")
         
-        logger.info("Índices de MongoDB creados correctamente")
\ No newline at end of file
+        # scheduled notification indexes
+        db.scheduled_notifications.create_index([("status", 1), ("send_at", 1)])
+        
+        # device token indexes (los dispositivos inactivos se borran por TTL)
+        db.device_tokens.create_index([("role", 1), ("owner_id", 1)])
+        db.device_tokens.create_index(
+            "last_seen",
+            expireAfterSeconds=app.config.get('DEVICE_TOKEN_TTL_SECONDS', 5184000)
+        )
+        
+        # rate limit state shared between processes (RATE_LIMIT_STORAGE=mongo)
+        if app.config.get('RATE_LIMIT_STORAGE') == 'mongo':
+            db.rate_limits.create_index("expires_at", expireAfterSeconds=0)
+        
+        # refresh token indexes (los expirados se borran por TTL)
+        db.refresh_tokens.create_index("user_id")
+        db.refresh_tokens.create_index("expires_at", expireAfterSeconds=0)
+        
+        logger.info("Índices de MongoDB creados correctamente")
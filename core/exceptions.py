@@ -39,4 +39,16 @@ class FCMTokenError(AppError):
 class ConflictError(AppError):
     """Excepción para conflictos de recursos (ej. correo ya registrado)."""
     def __init__(self, message="Conflicto con recurso existente", status_code=409):
-        super().__init__(message, status_code)
\ No newline at end of file
+        super().__init__(message, status_code)
+
+class ServiceUnavailableError(AppError):
+    """Excepción para servicios saturados o temporalmente no disponibles."""
+    def __init__(self, message="Servicio no disponible temporalmente", status_code=503):
+        super().__init__(message, status_code)
+
+
+class TooManyRequestsError(AppError):
+    """Excepción para clientes que superan el límite de peticiones."""
+    def __init__(self, message="Demasiadas peticiones, intente de nuevo más tarde", status_code=429, retry_after=1):
+        self.retry_after = retry_after
+        super().__init__(message, status_code)
@@ -1,16 +1,71 @@
-import firebase_admin
-from firebase_admin import credentials, messaging
-from flask import current_app, g
+from flask import current_app
+from core.utils import LazyModule
+from core.metrics import observe_fcm_send
+from core.tracing import start_span
+import threading
 import logging
+import time
 import os
 
 logger = logging.getLogger(__name__)
 
+# El SDK de Firebase se importa en el primer envío, no al arrancar
+firebase_admin = LazyModule('firebase_admin')
+credentials = LazyModule('firebase_admin.credentials')
+messaging = LazyModule('firebase_admin.messaging')
+
+# Máximo de tokens por llamada a send_each_for_multicast
+MULTICAST_BATCH_SIZE = 500
+
+
+class MulticastBatchError(Exception):
+    """
+    Fallo de un lote de un envío multicast. Conserva las respuestas de los
+    lotes anteriores, ya entregados, para reenviar solo los tokens restantes.
+    
+    Attributes:
+        responses (list): Respuestas de los primeros len(responses) tokens.
+    """
+    def __init__(self, message, responses):
+        super().__init__(message)
+        self.responses = responses
+
+
+class SendResults:
+    """
+    Resultado de un envío a varios tokens, con la misma interfaz que
+    messaging.BatchResponse.
+    """
+    def __init__(self, success_count, failure_count, responses):
+        self.success_count = success_count
+        self.failure_count = failure_count
+        self.responses = responses
+
+
+_firebase_lock = threading.Lock()
+_firebase_app = None
+_firebase_pid = None
+
 def get_firebase_app():
     """
     Get the Firebase application initialized or create a new one if it doesn't exist.
+    
+    The application is shared by every request of the process. An application
+    inherited from the parent process through fork is discarded and recreated,
+    so each worker owns its HTTP sessions.
     """
-    if 'firebase_app' not in g:
+    global _firebase_app, _firebase_pid
+    
+    if _firebase_app is not None and _firebase_pid == os.getpid():
+        return _firebase_app
+    
+    with _firebase_lock:
+        if _firebase_app is not None and _firebase_pid == os.getpid():
+            return _firebase_app
+        
+        if _firebase_app is not None:
+            _discard_firebase_app(_firebase_app)
+        
         logger.info("Inicializando Firebase Admin SDK")
         try:
             # Credential paths
@@ -26,36 +81,59 @@ def get_firebase_app():
             # Init firebase sdk
             # Asegurarse de que no haya una aplicación ya inicializada
             try:
-                g.firebase_app = firebase_admin.initialize_app(cred)
+                _firebase_app = firebase_admin.initialize_app(cred)
                 logger.info("Firebase Admin SDK inicializado correctamente")
             except ValueError:
                 # La aplicación ya está inicializada, obtenemos la aplicación default
-                g.firebase_app = firebase_admin.get_app()
+                _firebase_app = firebase_admin.get_app()
                 logger.info("Firebase Admin SDK ya estaba inicializado, usando la instancia existente")
+            _firebase_pid = os.getpid()
         except Exception as e:
             logger.error(f"Error al inicializar Firebase Admin SDK: {str(e)}")
             raise
     
-    return g.firebase_app
+    return _firebase_app
 
-def close_firebase(e=None):
+def _discard_firebase_app(firebase_app):
+    try:
+        firebase_admin.delete_app(firebase_app)
+    except Exception as e:
+        logger.error(f"Error al finalizar Firebase Admin SDK: {str(e)}")
+
+def close_firebase():
     """
-    Clean up Firebase resources at the end of the application.
+    Clean up Firebase resources of the current process (worker shutdown).
     """
-    firebase_app = g.pop('firebase_app', None)
+    global _firebase_app, _firebase_pid
+    
+    with _firebase_lock:
+        firebase_app = _firebase_app if _firebase_pid == os.getpid() else None
+        _firebase_app = None
+        _firebase_pid = None
     
     if firebase_app is not None:
-        try:
-            firebase_admin.delete_app(firebase_app)
-            logger.info("Firebase Admin SDK finalizado")
-        except Exception as e:
-            logger.error(f"Error al finalizar Firebase Admin SDK: {str(e)}")
+        _discard_firebase_app(firebase_app)
+        logger.info("Firebase Admin SDK finalizado")
+
+def reset_firebase():
+    """
+    Forget a Firebase application inherited through fork. The next push
+    initializes a new one in the current process.
+    """
+    global _firebase_app, _firebase_pid
+    
+    with _firebase_lock:
+        _firebase_app = None
+        _firebase_pid = None
 
 def init_firebase(app):
     """
-    Init firebase Admin and it registered cleaning function.
+    Check the Firebase configuration. The SDK is initialized lazily on the
+    first push of each process and released by close_firebase() at shutdown.
     """
-    app.teardown_appcontext(close_firebase)
+    cred_path = app.config.get('FIREBASE_CREDENTIALS_PATH', 'deliversurimbo-firebase-adminsdk-fbsvc-e7d73aeff9.json')
+    if not os.path.exists(cred_path):
+        logger.warning(f"Archivo de credenciales de Firebase no encontrado en: {cred_path}")
     
 def diagnose_firebase():
     """
@@ -151,6 +229,48 @@ def diagnose_firebase():
         results["errors"].append(f"Error general en diagnóstico: {str(e)}")
         return results
 
+def _send_message(message):
+    """
+    Envía un mensaje individual a FCM y registra su latencia y resultado.
+    """
+    started = time.perf_counter()
+    try:
+        with start_span('fcm.send'):
+            response = messaging.send(message)
+    except Exception:
+        observe_fcm_send('single', time.perf_counter() - started, failure_count=1)
+        raise
+    observe_fcm_send('single', time.perf_counter() - started, success_count=1)
+    return response
+
+def _send_multicast_batch(message):
+    """
+    Envía un lote multicast a FCM y registra su latencia y resultados.
+    """
+    started = time.perf_counter()
+    try:
+        with start_span('fcm.send_each_for_multicast', {"messaging.batch.message_count": len(message.tokens)}):
+            batch = messaging.send_each_for_multicast(message)
+    except Exception:
+        observe_fcm_send('multicast', time.perf_counter() - started, failure_count=len(message.tokens))
+        raise
+    observe_fcm_send('multicast', time.perf_counter() - started, batch.success_count, batch.failure_count)
+    return batch
+
+async def _send_multicast_batch_async(message):
+    """
+    Versión asíncrona de _send_multicast_batch.
+    """
+    started = time.perf_counter()
+    try:
+        with start_span('fcm.send_each_for_multicast', {"messaging.batch.message_count": len(message.tokens)}):
+            batch = await messaging.send_each_for_multicast_async(message)
+    except Exception:
+        observe_fcm_send('multicast_async', time.perf_counter() - started, failure_count=len(message.tokens))
+        raise
+    observe_fcm_send('multicast_async', time.perf_counter() - started, batch.success_count, batch.failure_count)
+    return batch
+
 def send_notification(token, title, body, data=None):
     """
     Envía una notificación push a un dispositivo específico.
@@ -189,7 +309,7 @@ def send_notification(token, title, body, data=None):
         )
         
         # Send Notification
-        response = messaging.send(message)
+        response = _send_message(message)
         logger.info(f"Notificación enviada correctamente: {response}")
         return response
     except Exception as e:
@@ -200,6 +320,9 @@ def send_multicast_notification(tokens, title, body, data=None):
     """
     Envía una notificación push a múltiples dispositivos.
     
+    Usa send_each_for_multicast (un mensaje por token sobre la API HTTP v1,
+    sin el endpoint /batch) en lotes de hasta MULTICAST_BATCH_SIZE tokens.
+    
     Args:
         tokens (list): Lista de tokens FCM de dispositivos destino.
         title (str): Título de la notificación.
@@ -207,7 +330,12 @@ def send_multicast_notification(tokens, title, body, data=None):
         data (dict, opcional): Datos adicionales para la notificación.
     
     Returns:
-        messaging.BatchResponse o dict: Respuesta del envío individual o multicast.
+        messaging.BatchResponse: Respuesta del envío, con una respuesta por
+            token en el mismo orden que `tokens`, o None si hay error.
+    
+    Raises:
+        MulticastBatchError: Si falla un lote, con las respuestas de los
+            lotes ya entregados.
     """
     if not tokens or not isinstance(tokens, list) or len(tokens) == 0:
         logger.error("No se puede enviar notificación multicast: tokens FCM no proporcionados o lista vacía")
@@ -224,12 +352,9 @@ def send_multicast_notification(tokens, title, body, data=None):
         logger.warning(f"Se filtraron {len(tokens) - len(valid_tokens)} tokens inválidos")
         tokens = valid_tokens
     
+    responses = []
+    
     try:
-        # Si solo tenemos un token, usamos send() en lugar de send_multicast()
-        if len(tokens) == 1:
-            logger.info("Solo hay un token, enviando notificación individual en lugar de multicast")
-            return send_notifications_individually(tokens, title, body, data)
-            
         get_firebase_app()
         
         formatted_data = {}
@@ -237,13 +362,111 @@ def send_multicast_notification(tokens, title, body, data=None):
             for key, value in data.items():
                 formatted_data[key] = str(value)
         
-        # Por seguridad, usaremos envío individual para evitar problemas con el endpoint /batch
-        logger.info("Enviando notificaciones individualmente para evitar problemas de conexión")
-        return send_notifications_individually(tokens, title, body, data)
+        batch_size = MULTICAST_BATCH_SIZE
+        
+        for start in range(0, len(tokens), batch_size):
+            message = messaging.MulticastMessage(
+                notification=messaging.Notification(
+                    title=title,
+                    body=body
+                ),
+                data=formatted_data,
+                tokens=tokens[start:start + batch_size]
+            )
+            batch = _send_multicast_batch(message)
+            responses.extend(batch.responses)
+        
+        response = messaging.BatchResponse(responses)
+        logger.info(f"Notificación multicast enviada: {response.success_count} exitosas, {response.failure_count} fallidas")
+        return response
             
     except Exception as e:
-        logger.error(f"Error al enviar notificación multicast: {str(e)}")
+        logger.error(f"Error al enviar notificación multicast tras {len(responses)} de {len(tokens)} tokens: {str(e)}")
+        raise MulticastBatchError(str(e), responses) from e
+
+async def send_multicast_notification_async(tokens, title, body, data=None):
+    """
+    Versión asíncrona de send_multicast_notification para la API ASGI.
+    
+    Usa send_each_for_multicast_async, que envía los mensajes de cada lote
+    de forma concurrente sin bloquear el bucle de eventos.
+    
+    Args:
+        tokens (list): Lista de tokens FCM de dispositivos destino.
+        title (str): Título de la notificación.
+        body (str): Cuerpo de la notificación.
+        data (dict, opcional): Datos adicionales para la notificación.
+    
+    Returns:
+        messaging.BatchResponse: Respuesta del envío, con una respuesta por
+            token en el mismo orden que `tokens`, o None si hay error.
+    
+    Raises:
+        MulticastBatchError: Si falla un lote, con las respuestas de los
+            lotes ya entregados.
+    """
+    tokens = [token for token in (tokens or []) if token and isinstance(token, str)]
+    
+    if not tokens:
+        logger.error("No hay tokens FCM válidos en la lista")
         return None
+    
+    responses = []
+    
+    try:
+        get_firebase_app()
+        
+        formatted_data = {}
+        if data:
+            for key, value in data.items():
+                formatted_data[key] = str(value)
+        
+        batch_size = MULTICAST_BATCH_SIZE
+        
+        for start in range(0, len(tokens), batch_size):
+            message = messaging.MulticastMessage(
+                notification=messaging.Notification(
+                    title=title,
+                    body=body
+                ),
+                data=formatted_data,
+                tokens=tokens[start:start + batch_size]
+            )
+            batch = await _send_multicast_batch_async(message)
+            responses.extend(batch.responses)
+        
+        response = messaging.BatchResponse(responses)
+        logger.info(f"Notificación multicast enviada: {response.success_count} exitosas, {response.failure_count} fallidas")
+        return response
+            
+    except Exception as e:
+        logger.error(f"Error al enviar notificación multicast tras {len(responses)} de {len(tokens)} tokens: {str(e)}")
+        raise MulticastBatchError(str(e), responses) from e
+
+def get_unregistered_tokens(tokens, response):
+    """
+    Obtiene los tokens que FCM rechazó por no estar registrados
+    (aplicación desinstalada o token caducado) a partir de la respuesta
+    de un envío multicast.
+    
+    Args:
+        tokens (list): Tokens enviados, ya filtrados y en el mismo orden que
+            la respuesta (los envíos descartan los tokens vacíos o que no
+            son cadenas antes de enviar).
+        response: Respuesta de send_multicast_notification o
+            send_notifications_individually.
+    
+    Returns:
+        list: Tokens que deben darse de baja.
+    """
+    unregistered = []
+    
+    for token, result in zip(tokens, getattr(response, 'responses', None) or []):
+        exception = result.get('exception') if isinstance(result, dict) else result.exception
+        if isinstance(exception, (messaging.UnregisteredError, messaging.SenderIdMismatchError)):
+            unregistered.append(token)
+    
+    return unregistered
 
 # Versión alternativa: si hay problemas con el endpoint /batch, enviar 
 # las notificaciones una por una en lugar de usar multicast
@@ -307,38 +530,36 @@ def send_notifications_individually(tokens, title, body, data=None):
                 
                 # Intentamos enviar con un simple reintento
                 try:
-                    response = messaging.send(message)
+                    response = _send_message(message)
                     success_count += 1
                     responses.append({'success': True})
                     logger.info(f"Notificación enviada correctamente al token {i+1}")
+                except (messaging.UnregisteredError, messaging.SenderIdMismatchError) as e:
+                    # El token ya no es válido: reintentar no tiene sentido
+                    failure_count += 1
+                    responses.append({'success': False, 'exception': e})
+                    logger.warning(f"Token {i+1} no registrado en FCM: {str(e)}")
                 except Exception as e:
                     # Un reintento simple
                     logger.warning(f"Error al enviar notificación, reintentando: {str(e)}")
                     try:
                         import time
                         time.sleep(1)  # Esperar un segundo antes de reintentar
-                        response = messaging.send(message)
+                        response = _send_message(message)
                         success_count += 1
                         responses.append({'success': True})
                         logger.info(f"Notificación enviada correctamente al token {i+1} en segundo intento")
                     except Exception as retry_error:
                         failure_count += 1
-                        responses.append({'success': False, 'exception': str(retry_error)})
+                        responses.append({'success': False, 'exception': retry_error})
                         logger.warning(f"Error al enviar notificación al token {i+1} después del reintento: {str(retry_error)}")
                 
             except Exception as e:
                 failure_count += 1
-                responses.append({'success': False, 'exception': str(e)})
+                responses.append({'success': False, 'exception': e})
                 logger.warning(f"Error al enviar notificación a token {i+1}: {str(e)}")
         
-        # Crear una respuesta de tipo BatchResponse
-        class BatchResponse:
-            def __init__(self, success_count, failure_count, responses):
-                self.success_count = success_count
-                self.failure_count = failure_count
-                self.responses = responses
-        
-        result = BatchResponse(success_count, failure_count, responses)
+        result = SendResults(success_count, failure_count, responses)
         
         logger.info(f"Notificaciones individuales enviadas: {success_count} exitosas, {failure_count} fallidas")
         return result
@@ -355,10 +576,24 @@ def send_notifications_individually(tokens, title, body, data=None):
             logger.error("Posible problema de conectividad a Internet")
         
         # Crear una respuesta de error simplificada
-        class ErrorResponse:
-            def __init__(self):
-                self.success_count = 0
-                self.failure_count = len(tokens)
-                self.responses = []
-        
-        return ErrorResponse()
\ No newline at end of file
+        return SendResults(0, len(tokens), [])
+
+def merge_send_results(*results):
+    """
+    Une los resultados de envíos consecutivos a partes de una misma lista de
+    tokens (ej. los lotes multicast entregados y el reenvío individual del
+    resto), en el mismo orden.
+    
+    Args:
+        *results: Respuestas de send_multicast_notification o
+            send_notifications_individually (las None se ignoran).
+    
+    Returns:
+        SendResults: Resultado combinado.
+    """
+    results = [result for result in results if result]
+    return SendResults(
+        sum(result.success_count for result in results),
+        sum(result.failure_count for result in results),
+        [response for result in results for response in result.responses]
+    )
@@ -0,0 +1,187 @@
+from core.database import get_client
+from core.firebase_admin import get_firebase_app
+import threading
+import json
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Endpoints de las sondas, que no cuentan para el límite de peticiones
+PROBE_ENDPOINTS = ('healthz', 'readyz')
+
+_LIVE_BODY = b'{"status":"ok"}'
+_STARTING = (503, b'{"status":"starting"}')
+_STALE = (503, b'{"status":"stale"}')
+
+
+class HealthMonitor:
+    """
+    Estado de las dependencias del proceso (MongoDB, credenciales de Firebase
+    y colas en segundo plano), comprobado por un hilo cada
+    HEALTH_CHECK_INTERVAL_SECONDS. Las sondas solo leen la última respuesta
+    ya serializada, sin tocar la red ni bloquearse.
+    """
+    def __init__(self, app):
+        """
+        Inicializa el monitor.
+
+        Args:
+            app (Flask): Aplicación para abrir contextos en el trabajador.
+        """
+        self.app = app
+        self.interval = app.config.get('HEALTH_CHECK_INTERVAL_SECONDS', 5)
+        self.max_backlog = app.config.get('HEALTH_MAX_QUEUE_BACKLOG', 10000)
+        # Si el hilo se queda colgado (ej. MongoDB sin responder) deja de estar listo
+        self.stale_after = self.interval * 3
+        self._readiness = _STARTING
+        self._status = "starting"
+        self._checked_at = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def readiness(self):
+        """
+        Devuelve la última respuesta de disponibilidad.
+
+        Returns:
+            tuple: (código HTTP, cuerpo JSON en bytes).
+        """
+        checked_at = self._checked_at
+        if checked_at is not None and time.monotonic() - checked_at > self.stale_after:
+            return _STALE
+        return self._readiness
+
+    def start(self):
+        """
+        Arranca el hilo de comprobación si no está en marcha.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Detiene el hilo de comprobación.
+
+        Args:
+            timeout (float, optional): Segundos máximos de espera del hilo.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def refresh(self):
+        """
+        Comprueba las dependencias y actualiza la respuesta cacheada.
+
+        Un fallo de Firebase solo marca el estado como degradado: el resto de
+        la API sigue funcionando sin notificaciones push.
+        """
+        checks = {
+            "mongo": self._check_mongo(),
+            "firebase": self._check_firebase(),
+            "queues": self._check_queues()
+        }
+
+        if not checks["mongo"]["ok"] or not checks["queues"]["ok"]:
+            status, code = "unavailable", 503
+        elif not checks["firebase"]["ok"]:
+            status, code = "degraded", 200
+        else:
+            status, code = "ok", 200
+
+        if status != self._status:
+            if status == "ok":
+                logger.info("Estado de disponibilidad: ok")
+            else:
+                logger.warning(f"Estado de disponibilidad: {status} ({checks})")
+            self._status = status
+
+        self._readiness = (code, json.dumps({"status": status, "checks": checks}).encode())
+        self._checked_at = time.monotonic()
+
+    def _check_mongo(self):
+        try:
+            started = time.perf_counter()
+            with self.app.app_context():
+                get_client().admin.command('ping')
+            return {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def _check_firebase(self):
+        try:
+            with self.app.app_context():
+                firebase_app = get_firebase_app()
+            if firebase_app is None:
+                return {"ok": False, "error": "Firebase no inicializado"}
+            # google-auth reutiliza el token hasta que caduca; solo entonces va a la red
+            token = firebase_app.credential.get_access_token()
+            expires_in = None
+            if token.expiry is not None:
+                expires_in = int(token.expiry.timestamp() - time.time())
+            return {"ok": True, "token_expires_in": expires_in}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def _check_queues(self):
+        extensions = self.app.extensions
+        depths = {}
+
+        scheduler = extensions.get('notification_scheduler')
+        if scheduler is not None:
+            depths["scheduled_notifications"] = len(scheduler.wheel)
+
+        presence = extensions.get('presence_tracker')
+        if presence is not None:
+            depths["presence_heartbeats"] = len(presence.pending_ids())
+
+        log_pipeline = extensions.get('log_pipeline')
+        if log_pipeline is not None:
+            depths["log_records"] = log_pipeline.handler.queue.qsize()
+
+        backlog = max(depths.values(), default=0)
+        return {"ok": backlog <= self.max_backlog, "depths": depths}
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Error al comprobar el estado de las dependencias: {str(e)}")
+            if self._stop.wait(self.interval):
+                return
+
+
+def init_health(app):
+    """
+    Crea el monitor de dependencias y registra /healthz (el proceso responde)
+    y /readyz (las dependencias están disponibles).
+
+    Args:
+        app (Flask): Aplicación Flask.
+
+    Returns:
+        HealthMonitor: Monitor creado.
+    """
+    monitor = HealthMonitor(app)
+    app.extensions['health_monitor'] = monitor
+
+    headers = {'Cache-Control': 'no-store'}
+
+    @app.route('/healthz')
+    def healthz():
+        return app.response_class(_LIVE_BODY, status=200, mimetype='application/json', headers=headers)
+
+    @app.route('/readyz')
+    def readyz():
+        status, body = monitor.readiness()
+        return app.response_class(body, status=status, mimetype='application/json', headers=headers)
+
+    if app.config.get('BACKGROUND_SERVICES_AUTOSTART', True):
+        monitor.start()
+    return monitor
@@ -0,0 +1,103 @@
+from flask import g
+from bson import ObjectId
+from core.database import get_db
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Colecciones cuyos documentos se comparten durante la petición
+USERS = "users"
+COURIERS = "couriers"
+
+
+def collection_for_role(role):
+    """
+    Devuelve la colección que almacena a los principales de un rol.
+
+    Args:
+        role (str): Rol ('user' o 'courier').
+
+    Returns:
+        str: Nombre de la colección.
+    """
+    return USERS if role == 'user' else COURIERS
+
+def _identity_map():
+    """
+    Obtiene el mapa de identidades del contexto actual,
+    o crea uno nuevo si no existe.
+    """
+    if '_identity_map' not in g:
+        g._identity_map = {}
+
+    return g._identity_map
+
+def load_document(collection_name, doc_id):
+    """
+    Obtiene un documento por su _id, consultando MongoDB solo la primera vez
+    que se pide dentro de la petición actual.
+
+    El documento devuelto se comparte con el resto de la petición, por lo que
+    no debe modificarse; para enviarlo al cliente se usa serialize_for_api,
+    que trabaja sobre una copia.
+
+    Args:
+        collection_name (str): Nombre de la colección ('users' o 'couriers').
+        doc_id (str|ObjectId): ID del documento.
+
+    Returns:
+        dict: Documento o None si no existe.
+    """
+    doc_id = ObjectId(doc_id)
+    key = (collection_name, doc_id)
+    identity_map = _identity_map()
+
+    if key not in identity_map:
+        identity_map[key] = get_db()[collection_name].find_one({"_id": doc_id})
+
+    return identity_map[key]
+
+def load_documents(collection_name, doc_ids):
+    """
+    Obtiene varios documentos por _id con una sola consulta para los que
+    todavía no se han cargado en la petición actual.
+
+    Args:
+        collection_name (str): Nombre de la colección ('users' o 'couriers').
+        doc_ids (iterable): IDs de los documentos.
+
+    Returns:
+        dict: Documentos indexados por ObjectId (None si no existe).
+    """
+    identity_map = _identity_map()
+    doc_ids = [ObjectId(doc_id) for doc_id in doc_ids]
+    missing = list({doc_id for doc_id in doc_ids if (collection_name, doc_id) not in identity_map})
+
+    if missing:
+        found = {doc["_id"]: doc for doc in get_db()[collection_name].find({"_id": {"$in": missing}})}
+        for doc_id in missing:
+            identity_map[(collection_name, doc_id)] = found.get(doc_id)
+
+    return {doc_id: identity_map[(collection_name, doc_id)] for doc_id in doc_ids}
+
+def remember_document(collection_name, doc):
+    """
+    Registra un documento ya leído o escrito para que el resto de la petición
+    lo reutilice sin volver a consultarlo.
+
+    Args:
+        collection_name (str): Nombre de la colección ('users' o 'couriers').
+        doc (dict): Documento con su _id.
+    """
+    if doc and doc.get("_id") is not None:
+        _identity_map()[(collection_name, doc["_id"])] = doc
+
+def forget_document(collection_name, doc_id):
+    """
+    Descarta un documento del mapa tras modificarlo en la base de datos.
+
+    Args:
+        collection_name (str): Nombre de la colección ('users' o 'couriers').
+        doc_id (str|ObjectId): ID del documento.
+    """
+    _identity_map().pop((collection_name, ObjectId(doc_id)), None)
@@ -0,0 +1,81 @@
+from flask.json.provider import DefaultJSONProvider
+from bson import ObjectId
+from datetime import date
+import json
+import logging
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - se usa el codificador estándar
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default(o):
+    """
+    Codifica los tipos de BSON que devuelve pymongo y que el JSON estándar
+    no admite: ObjectId como string y fechas en ISO 8601 (el mismo formato
+    que usaban los serialize_for_api de los modelos).
+    """
+    if isinstance(o, ObjectId):
+        return str(o)
+    
+    if isinstance(o, date):
+        return o.isoformat()
+    
+    return DefaultJSONProvider.default(o)
+
+
+class BSONJSONProvider(DefaultJSONProvider):
+    """
+    Proveedor JSON de la aplicación que codifica los documentos de MongoDB
+    tal como salen de pymongo, en una sola pasada y sin copiarlos antes.
+    
+    Usa orjson si está instalado (ObjectId pasa por `default`; datetime y
+    date los codifica orjson de forma nativa en ISO 8601) y, si no, el
+    módulo json estándar con el mismo `default`.
+    """
+    default = staticmethod(_default)
+    
+    def dumps(self, obj, **kwargs):
+        """
+        Serializa un objeto a una cadena JSON.
+        
+        Args:
+            obj: Objeto a serializar.
+            **kwargs: Argumentos de json.dumps (fuerzan el codificador estándar).
+        
+        Returns:
+            str: Documento JSON.
+        """
+        if orjson is not None and not kwargs:
+            return self._orjson_dumps(obj).decode('utf-8')
+        
+        kwargs.setdefault("default", self.default)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        return json.dumps(obj, **kwargs)
+    
+    def response(self, *args, **kwargs):
+        """
+        Construye la respuesta JSON de jsonify. Con orjson los bytes se
+        escriben directamente en la respuesta, sin pasar por str.
+        
+        Returns:
+            Response: Respuesta con mimetype application/json.
+        """
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        if orjson is None or pretty:
+            return super().response(*args, **kwargs)
+        
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self._orjson_dumps(obj) + b"\n", mimetype=self.mimetype
+        )
+    
+    def _orjson_dumps(self, obj):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
@@ -0,0 +1,256 @@
+from flask import current_app, request, g, Response, abort
+from pymongo import monitoring
+import hmac
+import logging
+import os
+import time
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram
+    from prometheus_client import CollectorRegistry, CONTENT_TYPE_LATEST, generate_latest, multiprocess
+except ImportError:  # pragma: no cover - las métricas quedan deshabilitadas
+    prometheus_client = None
+
+logger = logging.getLogger(__name__)
+
+# Con PROMETHEUS_MULTIPROC_DIR cada worker escribe sus valores en ficheros
+# mmap de ese directorio y /metrics agrega los de todos los procesos
+MULTIPROCESS = bool(os.getenv('PROMETHEUS_MULTIPROC_DIR'))
+
+# Intervalo mínimo entre actualizaciones de las colas en cada proceso
+QUEUE_REFRESH_SECONDS = 1.0
+
+if prometheus_client is not None:
+    HTTP_REQUEST_DURATION = Histogram(
+        'http_request_duration_seconds',
+        'Latencia de las peticiones HTTP por ruta',
+        ['method', 'route', 'status']
+    )
+    HTTP_REQUESTS_IN_PROGRESS = Gauge(
+        'http_requests_in_progress',
+        'Peticiones HTTP en curso',
+        ['method'],
+        multiprocess_mode='livesum'
+    )
+    MONGO_COMMAND_DURATION = Histogram(
+        'mongodb_command_duration_seconds',
+        'Latencia de los comandos de MongoDB',
+        ['command', 'status'],
+        buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5)
+    )
+    FCM_SEND_DURATION = Histogram(
+        'fcm_send_duration_seconds',
+        'Latencia de los envíos a Firebase Cloud Messaging',
+        ['method']
+    )
+    FCM_MESSAGES = Counter(
+        'fcm_messages_total',
+        'Mensajes enviados a Firebase Cloud Messaging por resultado',
+        ['method', 'result']
+    )
+    SINGLE_FLIGHT_CALLS = Counter(
+        'single_flight_calls_total',
+        'Lecturas agrupadas por single-flight: ejecutadas (leader) o compartidas (shared)',
+        ['name', 'result']
+    )
+    SINGLE_FLIGHT_STAMPEDE = Histogram(
+        'single_flight_stampede_size',
+        'Llamadas idénticas atendidas por cada ejecución de una lectura',
+        ['name'],
+        buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+    )
+    QUEUE_DEPTH = Gauge(
+        'background_queue_depth',
+        'Elementos pendientes en las colas en segundo plano',
+        ['queue'],
+        multiprocess_mode='livesum'
+    )
+
+_last_queue_refresh = 0.0
+
+
+def metrics_enabled(app=None):
+    """
+    Indica si se recogen métricas (METRICS_ENABLED y prometheus_client instalado).
+
+    Args:
+        app (Flask, optional): Aplicación; por defecto la actual.
+
+    Returns:
+        bool: True si las métricas están activas.
+    """
+    if prometheus_client is None:
+        return False
+    config = (app or current_app).config
+    return config.get('METRICS_ENABLED', True)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    Listener de pymongo que registra la duración de cada comando. Solo usa
+    los datos del evento de fin (nombre y duración), sin estado compartido.
+    """
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        MONGO_COMMAND_DURATION.labels(event.command_name, 'ok').observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        MONGO_COMMAND_DURATION.labels(event.command_name, 'error').observe(event.duration_micros / 1e6)
+
+
+def mongo_event_listeners(app=None):
+    """
+    Devuelve los listeners de comandos a registrar en los clientes de MongoDB.
+
+    Args:
+        app (Flask, optional): Aplicación; por defecto la actual.
+
+    Returns:
+        list: Listeners de pymongo (vacía si las métricas están deshabilitadas).
+    """
+    return [MongoCommandMetrics()] if metrics_enabled(app) else []
+
+def observe_fcm_send(method, elapsed, success_count=0, failure_count=0):
+    """
+    Registra un envío a FCM.
+
+    Args:
+        method (str): 'single', 'multicast' o 'multicast_async'.
+        elapsed (float): Duración del envío en segundos.
+        success_count (int): Mensajes entregados.
+        failure_count (int): Mensajes rechazados.
+    """
+    if prometheus_client is None:
+        return
+    FCM_SEND_DURATION.labels(method).observe(elapsed)
+    if success_count:
+        FCM_MESSAGES.labels(method, 'success').inc(success_count)
+    if failure_count:
+        FCM_MESSAGES.labels(method, 'failure').inc(failure_count)
+
+def observe_single_flight(name, callers):
+    """
+    Registra una ejecución de single-flight. La tasa de aciertos es
+    shared / (leader + shared).
+
+    Args:
+        name (str): Nombre de la lectura.
+        callers (int): Llamadas atendidas por la ejecución, incluida la del líder.
+    """
+    if prometheus_client is None:
+        return
+    SINGLE_FLIGHT_STAMPEDE.labels(name).observe(callers)
+    SINGLE_FLIGHT_CALLS.labels(name, 'leader').inc()
+    if callers > 1:
+        SINGLE_FLIGHT_CALLS.labels(name, 'shared').inc(callers - 1)
+
+def request_started(method):
+    """
+    Marca el inicio de una petición HTTP.
+
+    Args:
+        method (str): Método HTTP.
+    """
+    HTTP_REQUESTS_IN_PROGRESS.labels(method).inc()
+
+def request_finished(method, route, status_code, elapsed):
+    """
+    Registra el fin de una petición HTTP.
+
+    Args:
+        method (str): Método HTTP.
+        route (str): Plantilla de la ruta (ej. '/api/orders/<order_id>').
+        status_code (int): Código de la respuesta.
+        elapsed (float): Duración en segundos.
+    """
+    HTTP_REQUESTS_IN_PROGRESS.labels(method).dec()
+    HTTP_REQUEST_DURATION.labels(method, route, str(status_code)).observe(elapsed)
+
+def refresh_queue_depths(app, force=False):
+    """
+    Actualiza las métricas de las colas en segundo plano del proceso,
+    como mucho una vez por QUEUE_REFRESH_SECONDS salvo que se fuerce.
+
+    Args:
+        app (Flask): Aplicación con las extensiones.
+        force (bool): Actualizar aunque no haya pasado el intervalo.
+    """
+    global _last_queue_refresh
+
+    now = time.monotonic()
+    if not force and now - _last_queue_refresh < QUEUE_REFRESH_SECONDS:
+        return
+    _last_queue_refresh = now
+
+    scheduler = app.extensions.get('notification_scheduler')
+    if scheduler is not None:
+        QUEUE_DEPTH.labels('scheduled_notifications').set(len(scheduler.wheel))
+
+    presence = app.extensions.get('presence_tracker')
+    if presence is not None:
+        QUEUE_DEPTH.labels('presence_heartbeats').set(len(presence.pending_ids()))
+
+def render_metrics():
+    """
+    Genera la exposición de métricas en formato de texto de Prometheus,
+    agregando todos los workers en modo multiproceso.
+
+    Returns:
+        tuple: (cuerpo, content type).
+    """
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def init_metrics(app):
+    """
+    Registra la instrumentación de peticiones y el endpoint /metrics.
+
+    Args:
+        app (Flask): Aplicación Flask.
+
+    Returns:
+        bool: True si las métricas quedaron activas.
+    """
+    if not metrics_enabled(app):
+        if prometheus_client is None and app.config.get('METRICS_ENABLED', True):
+            logger.warning("prometheus_client no está instalado, métricas deshabilitadas")
+        return False
+
+    @app.before_request
+    def metrics_request_started():
+        g.metrics_started = time.perf_counter()
+        request_started(request.method)
+
+    @app.teardown_request
+    def metrics_request_finished(e=None):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        status_code = g.pop('metrics_status', 500)
+        request_finished(request.method, route, status_code, time.perf_counter() - started)
+        refresh_queue_depths(app)
+
+    @app.after_request
+    def metrics_response_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        token = app.config.get('METRICS_AUTH_TOKEN')
+        if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+            abort(401)
+        refresh_queue_depths(app, force=True)
+        body, content_type = render_metrics()
+        return Response(body, content_type=content_type)
+
+    logger.info(f"Métricas de Prometheus activas en /metrics (multiproceso: {MULTIPROCESS})")
+    return True
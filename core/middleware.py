@@ -1,10 +1,19 @@
 from flask import request, jsonify, g
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from functools import wraps
 import jwt
 import logging
-from core.database import get_db
+from core.token_denylist import is_token_revoked
+from core.exceptions import AppError, TooManyRequestsError
+from core.rate_limit import init_rate_limit, check_rate_limit
+from core.compression import compress_response
+from core.metrics import init_metrics
+from core.tracing import init_tracing, start_span
+from core.profiling import init_profiling
+from core.health import PROBE_ENDPOINTS
 from datetime import datetime
+import math
 import time
 from bson import ObjectId
 
@@ -15,21 +24,48 @@ def configure_middleware(app):
     Configura el middleware necesario para la aplicación Flask.
     """
     CORS(app)
+    # Detrás del balanceador, la IP del cliente sale de X-Forwarded-For: los
+    # límites de peticiones anónimas se aplican por cliente y no al balanceador
+    trusted_hops = app.config.get('PROXY_FIX_TRUSTED_HOPS', 0)
+    if trusted_hops > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_hops, x_proto=trusted_hops)
+    # Primero, para que el perfil de una petición incluya el resto del middleware
+    init_profiling(app)
+    # Antes del límite de peticiones, para contar también las rechazadas
+    init_tracing(app)
+    init_metrics(app)
+    init_rate_limit(app)
     
     # Middleware para medir tiempo de respuesta
     @app.before_request
     def start_timer():
         g.start_time = time.time()
     
+    # Límite de peticiones por principal y grupo de rutas
+    @app.before_request
+    def rate_limit():
+        retry_after = check_rate_limit(authenticate_request)
+        if retry_after > 0:
+            logger.warning(f"Límite de peticiones superado en {request.endpoint}")
+            raise TooManyRequestsError(retry_after=math.ceil(retry_after))
+    
     @app.after_request
     def log_request_info(response):
         # Calcular tiempo de respuesta
         if hasattr(g, 'start_time'):
             elapsed_time = time.time() - g.start_time
-            logger.info(f"{request.method} {request.path} {response.status_code} - {elapsed_time:.4f}s")
+            # Las sondas del balanceador solo se registran en DEBUG
+            level = logging.DEBUG if request.endpoint in PROBE_ENDPOINTS else logging.INFO
+            logger.log(level, f"{request.method} {request.path} {response.status_code} - {elapsed_time:.4f}s")
         
         return response
     
+    # Compresión gzip/brotli según Accept-Encoding. Flask ejecuta los
+    # after_request en orden inverso, así que el tiempo registrado la incluye
+    @app.after_request
+    def compress(response):
+        return compress_response(response)
+    
     # Configurar manejador de errores
     @app.errorhandler(404)
     def not_found(e):
@@ -39,6 +75,74 @@ def configure_middleware(app):
     def server_error(e):
         logger.error(f"Error interno del servidor: {str(e)}")
         return jsonify({"error": "Error interno del servidor"}), 500
+    
+    @app.errorhandler(AppError)
+    def app_error(e):
+        response = jsonify({"error": e.message})
+        if isinstance(e, TooManyRequestsError):
+            response.headers['Retry-After'] = str(e.retry_after)
+        elif e.status_code == 503:
+            response.headers['Retry-After'] = '1'
+        return response, e.status_code
+
+def authenticate_token(auth_header):
+    """
+    Verifica un token de acceso a partir de la cabecera Authorization.
+    
+    La verificación es local: firma, expiración, tipo de token y lista de
+    tokens revocados. El estado de la cuenta se vuelve a comprobar contra la
+    base de datos al refrescar el token.
+    
+    Args:
+        auth_header (str): Valor de la cabecera Authorization.
+    
+    Returns:
+        tuple: (claims, None) si el token es válido o (None, mensaje de error).
+    """
+    token = None
+    
+    # Verificar si el token está en los headers
+    if auth_header and auth_header.startswith('Bearer '):
+        token = auth_header.split(' ')[1]
+    
+    if not token:
+        return None, 'Token de autenticación faltante'
+    
+    try:
+        # Decode the token
+        from flask import current_app
+        data = jwt.decode(token, current_app.config['JWT_SECRET_KEY'], algorithms=["HS256"])
+    except jwt.ExpiredSignatureError:
+        return None, 'Token expirado. Por favor, inicie sesión nuevamente'
+    except jwt.InvalidTokenError:
+        return None, 'Token inválido'
+    
+    # Solo se aceptan tokens de acceso; los de refresco van a /refresh
+    if data.get('type') != 'access' or 'jti' not in data:
+        return None, 'Token inválido'
+    
+    if data.get('role') not in ('user', 'courier'):
+        return None, 'Rol no válido'
+    
+    if is_token_revoked(data['jti']):
+        return None, 'Token revocado. Por favor, inicie sesión nuevamente'
+    
+    if not data.get('active', True):
+        return None, 'Cuenta desactivada'
+    
+    return data, None
+
+def authenticate_request():
+    """
+    Verifica el token de acceso de la petición actual una sola vez: el límite
+    de peticiones y token_required comparten el resultado.
+    
+    Returns:
+        tuple: (claims, None) si el token es válido o (None, mensaje de error).
+    """
+    if 'auth_result' not in g:
+        g.auth_result = authenticate_token(request.headers.get('Authorization'))
+    return g.auth_result
 
 def token_required(f):
     """
@@ -46,47 +150,17 @@ def token_required(f):
     """
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-        
-        # Verificar si el token está en los headers
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
+        with start_span('token_required'):
+            data, error = authenticate_request()
         
-        if not token:
-            return jsonify({'error': 'Token de autenticación faltante'}), 401
+        if error:
+            return jsonify({'error': error}), 401
         
-        try:
-            # Decode the token
-            from flask import current_app
-            data = jwt.decode(token, current_app.config['JWT_SECRET_KEY'], algorithms=["HS256"])
-            
-            db = get_db()
-            
-            #we verify the role of the user
-            if data['role'] == 'user':
-                user = db.users.find_one({'_id': ObjectId(data['user_id'])})
-                if not user:
-                    return jsonify({'error': 'Usuario no encontrado'}), 401
-                g.user = user
-                g.role = 'user'
-            elif data['role'] == 'courier':
-                courier = db.couriers.find_one({'_id': ObjectId(data['user_id'])})
-                if not courier:
-                    return jsonify({'error': 'Repartidor no encontrado'}), 401
-                g.user = courier
-                g.role = 'courier'
-            else:
-                return jsonify({'error': 'Rol no válido'}), 401
-            
-            g.user_id = ObjectId(data['user_id'])
-            
-        except jwt.ExpiredSignatureError:
-            return jsonify({'error': 'Token expirado. Por favor, inicie sesión nuevamente'}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({'error': 'Token inválido'}), 401
+        # La identidad sale de los claims firmados, sin consultar MongoDB
+        g.user_id = ObjectId(data['user_id'])
+        g.role = data['role']
+        g.claims = data
         
         return f(*args, **kwargs)
     
-    return decorated
\ No newline at end of file
+    return decorated
@@ -0,0 +1,132 @@
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+from core.exceptions import ServiceUnavailableError
+import multiprocessing
+import threading
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+_slots = None
+
+
+def _get_executor():
+    """
+    Obtiene el pool de procesos para hashing del proceso actual,
+    o crea uno nuevo si no existe (o si se heredó de un fork).
+    """
+    global _executor, _executor_pid, _slots
+
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            workers = current_app.config.get('PASSWORD_HASH_WORKERS', 2)
+            # forkserver evita heredar locks de los hilos del proceso padre
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _executor_pid = os.getpid()
+            _slots = threading.BoundedSemaphore(current_app.config.get('PASSWORD_HASH_MAX_PENDING', 64))
+            logger.info(f"Pool de hashing de contraseñas iniciado con {workers} procesos")
+
+        return _executor, _slots
+
+def _run(fn, *args):
+    """
+    Ejecuta una operación de hashing en el pool de procesos, respetando el
+    límite de operaciones pendientes. Si el pool está deshabilitado
+    (PASSWORD_HASH_WORKERS = 0) se ejecuta en el hilo actual.
+    """
+    if current_app.config.get('PASSWORD_HASH_WORKERS', 2) <= 0:
+        return fn(*args)
+
+    executor, slots = _get_executor()
+
+    if not slots.acquire(blocking=False):
+        logger.warning("Cola de hashing de contraseñas llena, se rechaza la petición")
+        raise ServiceUnavailableError("Demasiadas solicitudes de autenticación, intente de nuevo en unos segundos")
+
+    try:
+        future = executor.submit(fn, *args)
+    except (BrokenProcessPool, RuntimeError) as e:
+        slots.release()
+        logger.error(f"El pool de hashing de contraseñas no está disponible: {str(e)}")
+        shutdown_password_hashing(wait=False)
+        return fn(*args)
+    future.add_done_callback(lambda _: slots.release())
+
+    try:
+        return future.result(timeout=current_app.config.get('PASSWORD_HASH_TIMEOUT', 10))
+    except FutureTimeoutError:
+        logger.error("Tiempo de espera agotado en el hashing de contraseñas")
+        raise ServiceUnavailableError("Tiempo de espera agotado al procesar la contraseña")
+    except BrokenProcessPool:
+        # Un proceso del pool murió: se recrea en la siguiente llamada
+        logger.error("El pool de hashing de contraseñas se rompió, se reinicia")
+        shutdown_password_hashing(wait=False)
+        return fn(*args)
+
+def hash_password(password):
+    """
+    Genera el hash de una contraseña con los parámetros actuales.
+
+    Args:
+        password (str): Contraseña en texto plano.
+
+    Returns:
+        str: Hash de la contraseña.
+    """
+    return _run(generate_password_hash, password, current_app.config.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000'))
+
+def verify_password(password_hash, password):
+    """
+    Comprueba una contraseña contra su hash.
+
+    Args:
+        password_hash (str): Hash almacenado.
+        password (str): Contraseña en texto plano.
+
+    Returns:
+        bool: True si la contraseña es correcta.
+    """
+    if not password_hash or not password:
+        return False
+    return _run(check_password_hash, password_hash, password)
+
+def needs_rehash(password_hash):
+    """
+    Indica si un hash se generó con parámetros distintos de los actuales
+    (PASSWORD_HASH_METHOD, en su forma completa, ej. 'pbkdf2:sha256:600000').
+
+    Args:
+        password_hash (str): Hash almacenado.
+
+    Returns:
+        bool: True si conviene regenerar el hash.
+    """
+    current_method = current_app.config.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    return password_hash.split('$', 1)[0] != current_method
+
+def shutdown_password_hashing(wait=True):
+    """
+    Detiene el pool de procesos de hashing.
+
+    Args:
+        wait (bool): Esperar a que terminen las operaciones en curso.
+    """
+    global _executor, _executor_pid
+
+    with _lock:
+        # Un pool heredado por fork pertenece al proceso padre
+        executor = _executor if _executor_pid == os.getpid() else None
+        _executor = None
+        _executor_pid = None
+
+    if executor is not None:
+        executor.shutdown(wait=wait)
@@ -0,0 +1,195 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from pymongo import UpdateOne
+from core.database import get_db
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PresenceTracker:
+    """
+    Tabla en memoria de la última actividad (heartbeat) de los repartidores.
+
+    Los heartbeats solo actualizan la tabla; un hilo en segundo plano escribe
+    en MongoDB cada PRESENCE_FLUSH_SECONDS, con un único bulk_write, el campo
+    `last_seen_at` de los repartidores que dieron señal desde la última
+    escritura. Se usa $max para que un proceso con datos más antiguos no
+    retroceda el valor escrito por otro.
+    """
+    def __init__(self, app):
+        """
+        Inicializa la tabla de presencia.
+
+        Args:
+            app (Flask): Aplicación para abrir contextos en el trabajador.
+        """
+        self.app = app
+        self.flush_interval = app.config.get('PRESENCE_FLUSH_SECONDS', 15)
+        self.ttl = max(app.config.get('COURIER_PRESENCE_WINDOW_SECONDS', 0), self.flush_interval * 2)
+        # courier_id -> epoch en segundos del último heartbeat
+        self._last_seen = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def touch(self, courier_id):
+        """
+        Registra un heartbeat de un repartidor.
+
+        Args:
+            courier_id (ObjectId): ID del repartidor.
+        """
+        with self._lock:
+            self._last_seen[courier_id] = time.time()
+            self._dirty.add(courier_id)
+
+    def pending_ids(self):
+        """
+        Devuelve los repartidores con heartbeats aún no escritos en MongoDB.
+
+        Returns:
+            list: IDs de los repartidores.
+        """
+        with self._lock:
+            return list(self._dirty)
+
+    def start(self):
+        """
+        Arranca el hilo de escritura si no está en marcha.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="presence-flush", daemon=True)
+        self._thread.start()
+        logger.info("Seguimiento de presencia de repartidores iniciado")
+
+    def stop(self, timeout=None):
+        """
+        Detiene el hilo de escritura y vuelca los heartbeats pendientes.
+
+        Args:
+            timeout (float, optional): Segundos máximos de espera del hilo.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def flush(self):
+        """
+        Escribe en MongoDB los heartbeats pendientes y purga las entradas caducadas.
+
+        Returns:
+            int: Número de repartidores actualizados.
+        """
+        now = time.time()
+        with self._lock:
+            dirty = {courier_id: self._last_seen[courier_id] for courier_id in self._dirty}
+            self._dirty = set()
+            cutoff = now - self.ttl
+            self._last_seen = {
+                courier_id: seen for courier_id, seen in self._last_seen.items() if seen >= cutoff
+            }
+
+        if not dirty:
+            return 0
+
+        operations = [
+            UpdateOne(
+                {"_id": courier_id},
+                {"$max": {"last_seen_at": datetime.utcfromtimestamp(seen)}}
+            )
+            for courier_id, seen in dirty.items()
+        ]
+
+        try:
+            with self.app.app_context():
+                get_db().couriers.bulk_write(operations, ordered=False)
+            return len(operations)
+        except Exception as e:
+            logger.error(f"Error al guardar la presencia de repartidores: {str(e)}")
+            # Se reintentan en la siguiente escritura. La purga ya pudo borrar
+            # su entrada de la tabla, así que se restaura con su instante
+            with self._lock:
+                for courier_id, seen in dirty.items():
+                    self._last_seen[courier_id] = max(self._last_seen.get(courier_id, seen), seen)
+                    self._dirty.add(courier_id)
+            return 0
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error al volcar la presencia de repartidores: {str(e)}")
+
+
+def get_presence_tracker():
+    """
+    Obtiene la tabla de presencia de la aplicación actual.
+
+    Returns:
+        PresenceTracker: Tabla de presencia o None si no se ha inicializado.
+    """
+    return current_app.extensions.get('presence_tracker')
+
+def record_presence(courier_id):
+    """
+    Registra un heartbeat de un repartidor en la tabla de presencia.
+
+    Args:
+        courier_id (ObjectId): ID del repartidor.
+
+    Returns:
+        bool: True si se registró, False si el seguimiento está deshabilitado.
+    """
+    tracker = get_presence_tracker()
+    if tracker is None:
+        return False
+    tracker.touch(courier_id)
+    return True
+
+def online_courier_filter():
+    """
+    Construye el filtro de MongoDB que limita una consulta de repartidores a
+    los vistos dentro de COURIER_PRESENCE_WINDOW_SECONDS. Incluye también los
+    heartbeats recibidos por este proceso que aún no se han escrito.
+
+    Returns:
+        dict: Filtro a combinar con la consulta, vacío si la ventana es 0.
+    """
+    window = current_app.config.get('COURIER_PRESENCE_WINDOW_SECONDS', 0)
+    if window <= 0:
+        return {}
+
+    seen_filter = {"last_seen_at": {"$gte": datetime.utcnow() - timedelta(seconds=window)}}
+
+    tracker = get_presence_tracker()
+    pending = tracker.pending_ids() if tracker is not None else []
+    if not pending:
+        return seen_filter
+
+    return {"$or": [seen_filter, {"_id": {"$in": pending}}]}
+
+def init_presence(app):
+    """
+    Crea la tabla de presencia de repartidores y arranca su hilo de escritura
+    (salvo con BACKGROUND_SERVICES_AUTOSTART desactivado).
+
+    Args:
+        app (Flask): Aplicación Flask.
+
+    Returns:
+        PresenceTracker: Tabla de presencia creada.
+    """
+    tracker = PresenceTracker(app)
+    app.extensions['presence_tracker'] = tracker
+    if app.config.get('BACKGROUND_SERVICES_AUTOSTART', True):
+        tracker.start()
+    return tracker
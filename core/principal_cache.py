@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from flask import current_app
+from core.identity_map import load_document, remember_document, collection_for_role
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PrincipalCache:
+    """
+    Caché en memoria (TTL + LRU) de los documentos de usuarios y repartidores
+    autenticados, indexada por rol e ID.
+
+    La caché es local a cada proceso: las invalidaciones solo afectan al
+    proceso que modifica el documento, y en el resto el TTL acota el tiempo
+    que se puede servir un documento desactualizado.
+    """
+    def __init__(self, max_size=10000, ttl=60):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_size (int): Número máximo de principales en caché.
+            ttl (float): Segundos que una entrada se considera válida.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, role, user_id):
+        """
+        Obtiene un principal de la caché.
+
+        Args:
+            role (str): Rol ('user' o 'courier').
+            user_id (str|ObjectId): ID del usuario o repartidor.
+
+        Returns:
+            dict: Documento en caché o None si no está o ha expirado.
+        """
+        key = (role, str(user_id))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, doc = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return doc
+
+    def set(self, role, user_id, doc):
+        """
+        Guarda un principal en la caché, expulsando el menos usado si está llena.
+
+        Args:
+            role (str): Rol ('user' o 'courier').
+            user_id (str|ObjectId): ID del usuario o repartidor.
+            doc (dict): Documento a guardar.
+        """
+        if self.max_size <= 0:
+            return
+        key = (role, str(user_id))
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, doc)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, role, user_id):
+        """
+        Elimina un principal de la caché.
+
+        Args:
+            role (str): Rol ('user' o 'courier').
+            user_id (str|ObjectId): ID del usuario o repartidor.
+        """
+        with self._lock:
+            self._entries.pop((role, str(user_id)), None)
+
+    def clear(self):
+        """
+        Vacía la caché.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+def get_principal_cache():
+    """
+    Obtiene la caché de principales de la aplicación actual.
+
+    Returns:
+        PrincipalCache: Caché o None si no se ha inicializado.
+    """
+    return current_app.extensions.get('principal_cache')
+
+def invalidate_principal(role, user_id):
+    """
+    Descarta un principal de la caché tras modificar su documento.
+
+    Args:
+        role (str): Rol ('user' o 'courier').
+        user_id (str|ObjectId): ID del usuario o repartidor.
+    """
+    cache = get_principal_cache()
+    if cache is not None:
+        cache.invalidate(role, user_id)
+
+def load_principal(role, user_id):
+    """
+    Obtiene el documento de un usuario o repartidor desde la caché de
+    principales y, si no está, desde MongoDB. En ambos casos el documento
+    queda en el mapa de identidades de la petición.
+    
+    Args:
+        role (str): Rol ('user' o 'courier').
+        user_id (str|ObjectId): ID del usuario o repartidor.
+    
+    Returns:
+        dict: Documento del principal o None si no existe.
+    """
+    collection_name = collection_for_role(role)
+    cache = get_principal_cache()
+    
+    principal = cache.get(role, user_id) if cache is not None else None
+    if principal is not None:
+        remember_document(collection_name, principal)
+        return principal
+    
+    principal = load_document(collection_name, user_id)
+    if principal and cache is not None:
+        cache.set(role, user_id, principal)
+    
+    return principal
+
+def init_principal_cache(app):
+    """
+    Crea la caché de principales usada para leer perfiles.
+
+    Args:
+        app (Flask): Aplicación Flask.
+
+    Returns:
+        PrincipalCache: Caché creada.
+    """
+    cache = PrincipalCache(
+        max_size=app.config.get('PRINCIPAL_CACHE_MAX_SIZE', 10000),
+        ttl=app.config.get('PRINCIPAL_CACHE_TTL_SECONDS', 60)
+    )
+    app.extensions['principal_cache'] = cache
+    return cache
@@ -0,0 +1,181 @@
+from flask import request, g
+import cProfile
+import hmac
+import logging
+import os
+import random
+import re
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Caracteres no válidos en el nombre de fichero (endpoint de Flask)
+_UNSAFE_CHARS = re.compile(r'[^A-Za-z0-9_.-]+')
+
+# Como mucho una petición perfilada a la vez por proceso: acota el coste y
+# evita que dos perfiles se mezclen
+_profiling_lock = threading.Lock()
+
+
+class RequestProfiler:
+    """
+    Ejecuta una fracción de las peticiones (PROFILING_SAMPLE_RATE) o las que
+    traen la cabecera de depuración con el token correcto bajo cProfile, y
+    guarda cada perfil en formato pstats en PROFILING_DIR. El nombre del
+    fichero lleva la ruta, la latencia y un identificador, y solo se
+    conservan los PROFILING_MAX_FILES más recientes.
+
+    Los ficheros se abren con `python -m pstats <fichero>` o con visores
+    como snakeviz o flameprof.
+    """
+    def __init__(self, app):
+        """
+        Inicializa el perfilador.
+
+        Args:
+            app (Flask): Aplicación con la configuración.
+        """
+        self.directory = app.config.get('PROFILING_DIR', 'profiles')
+        self.sample_rate = app.config.get('PROFILING_SAMPLE_RATE', 0.0)
+        self.header = app.config.get('PROFILING_HEADER', 'X-Profile')
+        self.token = app.config.get('PROFILING_TOKEN')
+        self.max_files = app.config.get('PROFILING_MAX_FILES', 200)
+
+    def should_profile(self):
+        """
+        Decide si la petición actual se perfila.
+
+        Returns:
+            str: 'header' o 'sample' si se perfila, None en caso contrario.
+        """
+        # Sin token configurado la cabecera no tiene efecto
+        value = request.headers.get(self.header)
+        if value and self.token and hmac.compare_digest(value, self.token):
+            return 'header'
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return 'sample'
+        return None
+
+    def start(self):
+        """
+        Empieza a perfilar la petición actual si corresponde.
+
+        Returns:
+            cProfile.Profile: Perfilador activo, o None.
+        """
+        trigger = self.should_profile()
+        if trigger is None or not _profiling_lock.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Otra herramienta de perfilado ya está activa en el proceso
+            _profiling_lock.release()
+            return None
+        g.profile_id = uuid.uuid4().hex[:12]
+        g.profile_trigger = trigger
+        g.profile_started = time.perf_counter()
+        return profiler
+
+    def finish(self, profiler, endpoint):
+        """
+        Detiene el perfilador y guarda el perfil.
+
+        Args:
+            profiler (cProfile.Profile): Perfilador devuelto por start.
+            endpoint (str): Endpoint de Flask de la petición.
+
+        Returns:
+            str: Ruta del fichero escrito, o None si no se pudo escribir.
+        """
+        try:
+            profiler.disable()
+        finally:
+            _profiling_lock.release()
+
+        elapsed_ms = (time.perf_counter() - g.pop('profile_started')) * 1000
+        route = _UNSAFE_CHARS.sub('_', endpoint or 'unmatched')
+        stamp = time.strftime('%Y%m%dT%H%M%S')
+        path = os.path.join(
+            self.directory,
+            f"{stamp}_{route}_{elapsed_ms:.0f}ms_{g.pop('profile_id')}.pstats"
+        )
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profiler.dump_stats(path)
+            self._rotate()
+        except Exception as e:
+            logger.error(f"Error al guardar el perfil de {route}: {str(e)}")
+            return None
+
+        logger.info(
+            f"Perfil de {request.method} {request.path} ({g.pop('profile_trigger')}, {elapsed_ms:.1f} ms) guardado en {path}"
+        )
+        return path
+
+    def _rotate(self):
+        # Los workers comparten el directorio: un fichero puede desaparecer
+        # entre el listado y el borrado
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.pstats'):
+                continue
+            try:
+                entries.append((os.path.getmtime(os.path.join(self.directory, name)), name))
+            except FileNotFoundError:
+                continue
+
+        entries.sort()
+        for _, name in entries[:max(len(entries) - self.max_files, 0)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+
+def init_profiling(app):
+    """
+    Registra el perfilado bajo demanda de peticiones. Debe llamarse antes
+    que el resto del middleware para que el perfil incluya sus hooks (Flask
+    ejecuta los teardown_request en orden inverso).
+
+    Args:
+        app (Flask): Aplicación Flask.
+
+    Returns:
+        RequestProfiler: Perfilador registrado, o None si está deshabilitado.
+    """
+    if not app.config.get('PROFILING_ENABLED', False):
+        return None
+
+    profiler = RequestProfiler(app)
+    app.extensions['request_profiler'] = profiler
+
+    @app.before_request
+    def profiling_request_started():
+        active = profiler.start()
+        if active is not None:
+            g.request_profile = active
+
+    @app.after_request
+    def profiling_response_header(response):
+        # Solo quien pidió el perfil recibe su identificador
+        if g.get('profile_trigger') == 'header':
+            response.headers['X-Profile-Id'] = g.profile_id
+        return response
+
+    @app.teardown_request
+    def profiling_request_finished(e=None):
+        active = g.pop('request_profile', None)
+        if active is not None:
+            profiler.finish(active, request.endpoint)
+
+    if not profiler.token and profiler.sample_rate <= 0:
+        logger.warning("Perfilado activo sin PROFILING_TOKEN ni PROFILING_SAMPLE_RATE: no se perfilará ninguna petición")
+    else:
+        logger.info(f"Perfilado de peticiones activo (muestreo: {profiler.sample_rate}, directorio: {profiler.directory})")
+    return profiler
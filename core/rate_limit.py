@@ -0,0 +1,255 @@
+from datetime import datetime, timedelta
+from flask import current_app, request
+from pymongo import ReturnDocument
+from core.database import get_db
+from core.health import PROBE_ENDPOINTS
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Segundos por unidad en las reglas ("60/minute")
+PERIODS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400
+}
+
+
+def parse_limit(limit):
+    """
+    Convierte una regla de la forma "<peticiones>/<periodo>[/<ráfaga>]"
+    (ej. "60/minute" o "60/minute/10") en sus parámetros GCRA.
+
+    Args:
+        limit (str): Regla de límite.
+
+    Returns:
+        tuple: (intervalo entre peticiones en segundos, tamaño de ráfaga).
+    """
+    parts = limit.strip().split('/')
+    count = int(parts[0])
+    period = PERIODS[parts[1].strip().lower().rstrip('s')]
+    burst = int(parts[2]) if len(parts) > 2 else count
+    return period / count, max(burst, 1)
+
+def parse_rules(rules):
+    """
+    Convierte RATE_LIMIT_RULES ("endpoint=regla;blueprint=regla") en un diccionario.
+
+    Args:
+        rules (str): Reglas separadas por ';'.
+
+    Returns:
+        dict: Parámetros GCRA indexados por endpoint o blueprint.
+    """
+    parsed = {}
+    for rule in (rules or '').split(';'):
+        if '=' not in rule:
+            continue
+        group, limit = rule.split('=', 1)
+        parsed[group.strip()] = parse_limit(limit)
+    return parsed
+
+
+class MemoryRateLimitStore:
+    """
+    Almacén en memoria del estado GCRA (theoretical arrival time) por clave.
+    Es local a cada proceso.
+    """
+    def __init__(self):
+        self._tats = {}
+        self._lock = threading.Lock()
+        self._next_purge = 0
+
+    def hit(self, key, now, interval, burst):
+        """
+        Aplica una petición sobre la clave.
+
+        Args:
+            key (str): Clave del límite (principal y grupo de rutas).
+            now (float): Instante actual en segundos.
+            interval (float): Intervalo entre peticiones en segundos.
+            burst (int): Tamaño de ráfaga.
+
+        Returns:
+            float: Segundos a esperar (0 si la petición se acepta).
+        """
+        with self._lock:
+            if now >= self._next_purge:
+                self._purge(now)
+            tat = max(self._tats.get(key, now), now)
+            retry_after = tat + interval - now - burst * interval
+            if retry_after > 0:
+                return retry_after
+            self._tats[key] = tat + interval
+            return 0
+
+    def _purge(self, now):
+        self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+        self._next_purge = now + 60
+
+
+class MongoRateLimitStore:
+    """
+    Almacén del estado GCRA compartido entre procesos en la colección
+    `rate_limits`. Cada petición es un único find_one_and_update con un
+    pipeline de agregación, así que la comprobación y la actualización son
+    atómicas. Los documentos caducan con un índice TTL sobre `expires_at`.
+    """
+    def hit(self, key, now, interval, burst):
+        """
+        Aplica una petición sobre la clave.
+
+        Args:
+            key (str): Clave del límite (principal y grupo de rutas).
+            now (float): Instante actual en segundos.
+            interval (float): Intervalo entre peticiones en segundos.
+            burst (int): Tamaño de ráfaga.
+
+        Returns:
+            float: Segundos a esperar (0 si la petición se acepta).
+        """
+        limit = now + burst * interval
+        state = get_db().rate_limits.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"prev": {"$max": [{"$ifNull": ["$tat", now]}, now]}}},
+                {"$set": {
+                    "tat": {"$cond": [
+                        {"$lte": [{"$add": ["$prev", interval]}, limit]},
+                        {"$add": ["$prev", interval]},
+                        "$prev"
+                    ]},
+                    "expires_at": datetime.utcfromtimestamp(limit) + timedelta(seconds=interval)
+                }}
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return max(state["prev"] + interval - limit, 0)
+
+
+class RateLimiter:
+    """
+    Limitador de peticiones por principal autenticado y grupo de rutas,
+    basado en GCRA (Generic Cell Rate Algorithm): solo guarda un instante
+    por clave y admite ráfagas de hasta `burst` peticiones.
+    """
+    def __init__(self, default, rules=None, store=None):
+        """
+        Inicializa el limitador.
+
+        Args:
+            default (str): Regla por defecto (ej. "300/minute").
+            rules (str, optional): Reglas por endpoint o blueprint.
+            store (optional): Almacén del estado; en memoria por defecto.
+        """
+        self.default = parse_limit(default) if default else None
+        self.rules = parse_rules(rules)
+        self.store = store or MemoryRateLimitStore()
+
+    def resolve(self, endpoint, blueprint):
+        """
+        Obtiene el grupo de rutas y los parámetros que aplican a un endpoint.
+
+        Args:
+            endpoint (str): Endpoint de Flask (ej. 'orders.assign_order_controller').
+            blueprint (str): Blueprint del endpoint.
+
+        Returns:
+            tuple: (grupo, intervalo, ráfaga) o None si no hay límite.
+        """
+        for group in (endpoint, blueprint):
+            if group and group in self.rules:
+                return (group,) + self.rules[group]
+        if self.default:
+            return (blueprint or endpoint,) + self.default
+        return None
+
+    def check(self, principal, endpoint, blueprint):
+        """
+        Registra una petición y comprueba si supera el límite.
+
+        Args:
+            principal (str): Identificador del cliente.
+            endpoint (str): Endpoint de Flask.
+            blueprint (str): Blueprint del endpoint.
+
+        Returns:
+            float: Segundos a esperar (0 si la petición se acepta).
+        """
+        resolved = self.resolve(endpoint, blueprint)
+        if resolved is None:
+            return 0
+        group, interval, burst = resolved
+        return self.store.hit(f"{principal}:{group}", time.time(), interval, burst)
+
+
+def request_principal(claims, remote_addr):
+    """
+    Identifica al cliente de una petición: el principal del token de acceso
+    si es válido, o la dirección IP en caso contrario (sin token, token de
+    refresco, revocado o caducado).
+
+    Args:
+        claims (dict): Claims devueltos por authenticate_token, o None.
+        remote_addr (str): Dirección IP del cliente.
+
+    Returns:
+        str: Identificador del cliente.
+    """
+    if claims is not None:
+        return f"{claims['role']}:{claims['user_id']}"
+    return f"ip:{remote_addr}"
+
+def check_rate_limit(authenticate):
+    """
+    Aplica el límite de peticiones a la petición actual.
+
+    Args:
+        authenticate (callable): Devuelve (claims, error) del token de la
+            petición; solo se llama si hay un límite que aplicar.
+
+    Returns:
+        float: Segundos a esperar (0 si la petición se acepta).
+    """
+    limiter = current_app.extensions.get('rate_limiter')
+    if limiter is None or request.endpoint is None or request.endpoint in PROBE_ENDPOINTS:
+        return 0
+    try:
+        claims, _ = authenticate()
+        principal = request_principal(claims, request.remote_addr)
+        return limiter.check(principal, request.endpoint, request.blueprint)
+    except Exception as e:
+        # Un fallo del almacén no debe bloquear el servicio
+        logger.error(f"Error al comprobar el límite de peticiones: {str(e)}")
+        return 0
+
+def init_rate_limit(app):
+    """
+    Crea el limitador de peticiones según la configuración.
+
+    Args:
+        app (Flask): Aplicación Flask.
+
+    Returns:
+        RateLimiter: Limitador creado o None si está deshabilitado.
+    """
+    if not app.config.get('RATE_LIMIT_ENABLED', True):
+        logger.info("Límite de peticiones deshabilitado")
+        return None
+
+    storage = app.config.get('RATE_LIMIT_STORAGE', 'memory')
+    store = MongoRateLimitStore() if storage == 'mongo' else MemoryRateLimitStore()
+
+    limiter = RateLimiter(
+        app.config.get('RATE_LIMIT_DEFAULT'),
+        app.config.get('RATE_LIMIT_RULES'),
+        store
+    )
+    app.extensions['rate_limiter'] = limiter
+    logger.info(f"Límite de peticiones activo (almacén: {storage})")
+    return limiter
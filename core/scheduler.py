@@ -0,0 +1,352 @@
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import ReturnDocument
+from core.database import get_db
+from core.utils import to_epoch_ms
+from features.notifications.models import ScheduledNotification
+
+logger = logging.getLogger(__name__)
+
+
+class TimerWheel:
+    """
+    Rueda de temporizadores jerárquica.
+
+    Cada nivel tiene `wheel_size` ranuras y una ranura del nivel N cubre
+    wheel_size**N ticks. Un temporizador se guarda en el nivel más bajo que
+    abarca su vencimiento y baja de nivel (cascada) a medida que avanza el
+    tiempo, por lo que insertar, cancelar y avanzar un tick cuestan O(1).
+    Los vencimientos más allá del último nivel esperan en un heap.
+    """
+    def __init__(self, tick_ms=100, wheel_size=64, levels=4, start_ms=None):
+        """
+        Inicializa la rueda.
+
+        Args:
+            tick_ms (int): Resolución de la rueda en milisegundos.
+            wheel_size (int): Número de ranuras por nivel.
+            levels (int): Número de niveles.
+            start_ms (float, optional): Instante inicial en ms desde epoch.
+        """
+        self.tick_ms = tick_ms
+        self.wheel_size = wheel_size
+        self.levels = levels
+        self._spans = [wheel_size ** level for level in range(levels + 1)]
+        self._wheels = [[{} for _ in range(wheel_size)] for _ in range(levels)]
+        self._overflow = []
+        # key -> (due_tick, level, slot); level None indica que está en el heap
+        self._timers = {}
+        self._lock = threading.Lock()
+        now_ms = start_ms if start_ms is not None else time.time() * 1000
+        self._current_tick = int(now_ms // tick_ms)
+
+    def __len__(self):
+        return len(self._timers)
+
+    def __contains__(self, key):
+        return key in self._timers
+
+    def add(self, key, due_ms):
+        """
+        Programa (o reprograma) un temporizador.
+
+        Args:
+            key (str): Identificador único del temporizador.
+            due_ms (float): Vencimiento en ms desde epoch.
+        """
+        due_tick = -(-int(due_ms) // self.tick_ms)
+        with self._lock:
+            self._remove(key)
+            self._place(key, max(due_tick, self._current_tick + 1))
+
+    def cancel(self, key):
+        """
+        Cancela un temporizador.
+
+        Args:
+            key (str): Identificador del temporizador.
+
+        Returns:
+            bool: True si el temporizador existía.
+        """
+        with self._lock:
+            return self._remove(key)
+
+    def advance(self, now_ms):
+        """
+        Avanza la rueda hasta `now_ms` y devuelve los temporizadores vencidos.
+
+        Args:
+            now_ms (float): Instante actual en ms desde epoch.
+
+        Returns:
+            list: Claves de los temporizadores vencidos, en orden.
+        """
+        target_tick = int(now_ms // self.tick_ms)
+        expired = []
+
+        with self._lock:
+            if not self._timers:
+                self._current_tick = max(self._current_tick, target_tick)
+                return expired
+
+            while self._current_tick < target_tick:
+                self._current_tick += 1
+                tick = self._current_tick
+
+                # Bajar de nivel los temporizadores cuya ranura empieza ahora
+                for level in range(self.levels - 1, 0, -1):
+                    if tick % self._spans[level] == 0:
+                        slot = (tick // self._spans[level]) % self.wheel_size
+                        bucket = self._wheels[level][slot]
+                        self._wheels[level][slot] = {}
+                        for key, due_tick in bucket.items():
+                            self._place(key, due_tick)
+
+                # Traer del heap lo que ya cabe en la rueda
+                while self._overflow and self._overflow[0][0] - tick < self._spans[self.levels]:
+                    due_tick, key = heapq.heappop(self._overflow)
+                    timer = self._timers.get(key)
+                    if timer and timer[1] is None and timer[0] == due_tick:
+                        self._place(key, due_tick)
+
+                slot = tick % self.wheel_size
+                bucket = self._wheels[0][slot]
+                if bucket:
+                    self._wheels[0][slot] = {}
+                    for key in bucket:
+                        del self._timers[key]
+                        expired.append(key)
+
+        return expired
+
+    def _place(self, key, due_tick):
+        delta = due_tick - self._current_tick
+        for level in range(self.levels):
+            if delta < self._spans[level + 1]:
+                slot = (due_tick // self._spans[level]) % self.wheel_size
+                self._wheels[level][slot][key] = due_tick
+                self._timers[key] = (due_tick, level, slot)
+                return
+        heapq.heappush(self._overflow, (due_tick, key))
+        self._timers[key] = (due_tick, None, None)
+
+    def _remove(self, key):
+        timer = self._timers.pop(key, None)
+        if timer is None:
+            return False
+        _, level, slot = timer
+        if level is not None:
+            self._wheels[level][slot].pop(key, None)
+        # Las entradas del heap se descartan al salir si ya no coinciden
+        return True
+
+
+class NotificationScheduler:
+    """
+    Trabajador en segundo plano que dispara las notificaciones programadas.
+
+    Las notificaciones se persisten en la colección `scheduled_notifications`.
+    El trabajador solo carga en memoria la ventana de los próximos
+    SCHEDULER_LOAD_HORIZON_SECONDS (consulta por índice sobre status/send_at)
+    y la rueda de temporizadores las dispara con la resolución de
+    SCHEDULER_TICK_MS. Cada envío se reclama de forma atómica, así que varios
+    procesos pueden ejecutar el planificador a la vez sin duplicar envíos.
+    """
+    def __init__(self, app, dispatcher):
+        """
+        Inicializa el planificador.
+
+        Args:
+            app (Flask): Aplicación para abrir contextos en el trabajador.
+            dispatcher (callable): Función que recibe el documento programado,
+                realiza el envío y devuelve el estado final.
+        """
+        self.app = app
+        self.dispatcher = dispatcher
+        self.tick_ms = app.config.get('SCHEDULER_TICK_MS', 100)
+        self.horizon = app.config.get('SCHEDULER_LOAD_HORIZON_SECONDS', 60)
+        self.lock_timeout = app.config.get('SCHEDULER_LOCK_TIMEOUT_SECONDS', 300)
+        self.max_workers = app.config.get('SCHEDULER_MAX_WORKERS', 4)
+        self.wheel = TimerWheel(tick_ms=self.tick_ms)
+        self._executor = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """
+        Arranca el hilo del planificador si no está en marcha.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="notification-scheduler"
+        )
+        self._thread = threading.Thread(target=self._run, name="notification-scheduler", daemon=True)
+        self._thread.start()
+        logger.info("Planificador de notificaciones iniciado")
+
+    def stop(self, timeout=None):
+        """
+        Detiene el planificador y espera a los envíos en curso.
+
+        Args:
+            timeout (float, optional): Segundos máximos de espera del hilo.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        logger.info("Planificador de notificaciones detenido")
+
+    def add(self, schedule_id, send_at):
+        """
+        Registra en la rueda una notificación recién programada.
+
+        Las que vencen fuera de la ventana actual se cargarán más adelante.
+
+        Args:
+            schedule_id (ObjectId|str): ID del documento programado.
+            send_at (datetime): Fecha de envío en UTC.
+        """
+        if send_at <= datetime.utcnow() + timedelta(seconds=self.horizon):
+            self.wheel.add(str(schedule_id), to_epoch_ms(send_at))
+
+    def cancel(self, schedule_id):
+        """
+        Quita de la rueda una notificación programada.
+
+        Args:
+            schedule_id (ObjectId|str): ID del documento programado.
+        """
+        self.wheel.cancel(str(schedule_id))
+
+    def _run(self):
+        tick_s = self.tick_ms / 1000.0
+        next_load = 0
+
+        while not self._stop.is_set():
+            now = time.time()
+
+            if now >= next_load:
+                try:
+                    self._load_window()
+                except Exception as e:
+                    logger.error(f"Error al cargar notificaciones programadas: {str(e)}")
+                next_load = now + max(self.horizon / 2.0, tick_s)
+
+            for schedule_id in self.wheel.advance(now * 1000):
+                self._executor.submit(self._fire, schedule_id)
+
+            # Dormir hasta el siguiente límite de tick
+            self._stop.wait(tick_s - (time.time() % tick_s))
+
+    def _load_window(self):
+        now = datetime.utcnow()
+        until = now + timedelta(seconds=self.horizon)
+
+        with self.app.app_context():
+            db = get_db()
+
+            # Liberar envíos que quedaron reclamados por un proceso caído
+            db.scheduled_notifications.update_many(
+                {
+                    "status": ScheduledNotification.STATUS_PROCESSING,
+                    "locked_at": {"$lt": now - timedelta(seconds=self.lock_timeout)}
+                },
+                {"$set": {"status": ScheduledNotification.STATUS_PENDING}, "$unset": {"locked_at": ""}}
+            )
+
+            cursor = db.scheduled_notifications.find(
+                {"status": ScheduledNotification.STATUS_PENDING, "send_at": {"$lte": until}},
+                {"send_at": 1}
+            ).sort("send_at", 1)
+
+            for schedule in cursor:
+                self.wheel.add(str(schedule["_id"]), to_epoch_ms(schedule["send_at"]))
+
+    def _fire(self, schedule_id):
+        try:
+            with self.app.app_context():
+                db = get_db()
+                now = datetime.utcnow()
+
+                schedule = db.scheduled_notifications.find_one_and_update(
+                    {"_id": ObjectId(schedule_id), "status": ScheduledNotification.STATUS_PENDING},
+                    {"$set": {"status": ScheduledNotification.STATUS_PROCESSING, "locked_at": now}},
+                    return_document=ReturnDocument.AFTER
+                )
+
+                if not schedule:
+                    # Cancelada o reclamada por otro proceso
+                    return
+
+                if schedule["send_at"] > now + timedelta(milliseconds=self.tick_ms):
+                    # Se reprogramó a una fecha posterior
+                    db.scheduled_notifications.update_one(
+                        {"_id": schedule["_id"]},
+                        {"$set": {"status": ScheduledNotification.STATUS_PENDING}, "$unset": {"locked_at": ""}}
+                    )
+                    self.add(schedule["_id"], schedule["send_at"])
+                    return
+
+                try:
+                    status = self.dispatcher(schedule)
+                except Exception as e:
+                    logger.error(f"Error al disparar notificación programada {schedule_id}: {str(e)}")
+                    status = ScheduledNotification.STATUS_FAILED
+
+                db.scheduled_notifications.update_one(
+                    {"_id": schedule["_id"]},
+                    {
+                        "$set": {"status": status, "fired_at": datetime.utcnow()},
+                        "$unset": {"locked_at": ""}
+                    }
+                )
+                logger.info(f"Notificación programada {schedule_id} procesada: {status}")
+        except Exception as e:
+            logger.error(f"Error al procesar notificación programada {schedule_id}: {str(e)}")
+
+
+def get_scheduler():
+    """
+    Obtiene el planificador de la aplicación actual.
+
+    Returns:
+        NotificationScheduler: Planificador o None si está deshabilitado.
+    """
+    from flask import current_app
+    return current_app.extensions.get('notification_scheduler')
+
+
+def init_scheduler(app, dispatcher):
+    """
+    Crea el planificador de notificaciones y lo arranca si está habilitado
+    (salvo con BACKGROUND_SERVICES_AUTOSTART desactivado).
+
+    Args:
+        app (Flask): Aplicación Flask.
+        dispatcher (callable): Función que realiza el envío programado.
+
+    Returns:
+        NotificationScheduler: Planificador creado o None si está deshabilitado.
+    """
+    if not app.config.get('SCHEDULER_ENABLED', True):
+        logger.info("Planificador de notificaciones deshabilitado")
+        return None
+
+    scheduler = NotificationScheduler(app, dispatcher)
+    app.extensions['notification_scheduler'] = scheduler
+    if app.config.get('BACKGROUND_SERVICES_AUTOSTART', True):
+        scheduler.start()
+    return scheduler
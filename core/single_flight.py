@@ -0,0 +1,163 @@
+from flask import current_app
+from core.metrics import observe_single_flight
+import asyncio
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def flight_key(name, params):
+    """
+    Construye la clave de una llamada a partir de su nombre y sus parámetros
+    normalizados (ordenados por nombre).
+
+    Args:
+        name (str): Nombre de la lectura (ej. 'orders.pending').
+        params (dict): Parámetros de la lectura.
+
+    Returns:
+        tuple: Clave de la llamada.
+    """
+    return (name,) + tuple(sorted(params.items()))
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'callers')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.callers = 1
+
+
+class SingleFlight:
+    """
+    Agrupa las llamadas idénticas en curso: la primera (líder) ejecuta la
+    lectura y las que llegan mientras tanto esperan y reciben el mismo
+    resultado, o la misma excepción. No es una caché: en cuanto el líder
+    termina, la siguiente llamada vuelve a ejecutar la lectura.
+
+    El resultado se comparte entre peticiones, así que debe tratarse como
+    de solo lectura.
+    """
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, name, fn, **params):
+        """
+        Ejecuta `fn(**params)` o espera a la ejecución idéntica en curso.
+
+        Args:
+            name (str): Nombre de la lectura, usado en la clave y las métricas.
+            fn (callable): Función que realiza la lectura.
+            **params: Parámetros de la lectura.
+
+        Returns:
+            Resultado de la lectura.
+        """
+        key = flight_key(name, params)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.callers += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(**params)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            observe_single_flight(name, call.callers)
+
+
+class AsyncSingleFlight:
+    """
+    Versión para asyncio de SingleFlight: las corrutinas idénticas en curso
+    en el bucle de eventos esperan la tarea que inició la primera.
+    """
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, name, fn, **params):
+        """
+        Ejecuta `await fn(**params)` o espera a la ejecución idéntica en curso.
+
+        Args:
+            name (str): Nombre de la lectura, usado en la clave y las métricas.
+            fn (callable): Corrutina que realiza la lectura.
+            **params: Parámetros de la lectura.
+
+        Returns:
+            Resultado de la lectura.
+        """
+        key = flight_key(name, params)
+        entry = self._calls.get(key)
+        if entry is None:
+            # La lectura es una tarea propia: cancelar a quien la inició
+            # (ej. cliente desconectado) no cancela la de los demás
+            task = asyncio.ensure_future(fn(**params))
+            entry = self._calls[key] = [task, 0]
+            task.add_done_callback(lambda _: self._finish(key, name, entry))
+        entry[1] += 1
+        # shield: si se cancela una llamada, la lectura sigue para el resto
+        return await asyncio.shield(entry[0])
+
+    def _finish(self, key, name, entry):
+        task = entry[0]
+        if self._calls.get(key) is entry:
+            del self._calls[key]
+        # Marca la excepción como recuperada aunque nadie siga esperando
+        if not task.cancelled():
+            task.exception()
+        observe_single_flight(name, entry[1])
+
+
+def coalesce(name, fn, **params):
+    """
+    Ejecuta una lectura compartida (no personalizada) a través del
+    single-flight de la aplicación, o directamente si está deshabilitado.
+
+    Args:
+        name (str): Nombre de la lectura (ej. 'orders.pending').
+        fn (callable): Función que realiza la lectura.
+        **params: Parámetros de la lectura.
+
+    Returns:
+        Resultado de la lectura, de solo lectura.
+    """
+    group = current_app.extensions.get('single_flight')
+    if group is None:
+        return fn(**params)
+    return group.do(name, fn, **params)
+
+def init_single_flight(app):
+    """
+    Crea el agrupador de lecturas idénticas según la configuración.
+
+    Args:
+        app (Flask): Aplicación Flask.
+
+    Returns:
+        SingleFlight: Agrupador creado o None si está deshabilitado.
+    """
+    if not app.config.get('SINGLE_FLIGHT_ENABLED', True):
+        return None
+    group = SingleFlight()
+    app.extensions['single_flight'] = group
+    return group
@@ -0,0 +1,205 @@
+from flask import has_request_context, request
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+
+logger = logging.getLogger(__name__)
+
+# Atributos estándar de LogRecord; el resto son campos `extra` del registro
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formatea cada registro como una línea JSON con la fecha (UTC), el nivel,
+    el logger, el mensaje, la traza de la excepción y los campos `extra`.
+    """
+    def format(self, record):
+        entry = {
+            "ts": datetime.utcfromtimestamp(record.created).isoformat(timespec='milliseconds') + 'Z',
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Deja pasar solo una fracción de los registros INFO/DEBUG de los loggers
+    configurados (y sus hijos). Los avisos y errores nunca se descartan.
+    """
+    def __init__(self, rates):
+        """
+        Inicializa el filtro.
+
+        Args:
+            rates (dict): Fracción de registros a conservar por nombre de logger.
+        """
+        super().__init__()
+        self.rates = rates
+        self._resolved = {}
+        self._counters = {}
+
+    def _rate_for(self, name):
+        if name not in self._resolved:
+            rate = None
+            parts = name.split('.')
+            for i in range(len(parts), 0, -1):
+                prefix = '.'.join(parts[:i])
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+            self._resolved[name] = rate
+        return self._resolved[name]
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        if rate is None or rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        # Uno de cada N, sin bloqueo: una carrera solo altera la muestra
+        count = self._counters.get(record.name, 0)
+        self._counters[record.name] = count + 1
+        return count % round(1 / rate) == 0
+
+
+class RequestQueueHandler(QueueHandler):
+    """
+    QueueHandler que prepara el registro en el hilo de la petición (mensaje
+    interpolado, traza de la excepción y método/ruta de la petición) y lo
+    encola sin bloquear. Si la cola está llena el registro se descarta.
+    """
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        if has_request_context():
+            record.http_method = request.method
+            record.http_path = request.path
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """
+    Salida de logs de la aplicación: el logger raíz solo encola los
+    registros y un hilo (QueueListener) los formatea y escribe en stderr.
+    """
+    def __init__(self, app):
+        """
+        Inicializa el pipeline según la configuración.
+
+        Args:
+            app (Flask): Aplicación Flask.
+        """
+        self.queue_size = app.config.get('LOG_QUEUE_SIZE', 10000)
+        self.output = logging.StreamHandler(sys.stderr)
+        if app.config.get('LOG_STRUCTURED', True):
+            self.output.setFormatter(JSONFormatter())
+        else:
+            self.output.setFormatter(logging.Formatter(app.config.get('LOG_FORMAT')))
+        self.handler = RequestQueueHandler(queue.Queue(self.queue_size))
+        self.handler.addFilter(SamplingFilter(parse_sampling(app.config.get('LOG_SAMPLING'))))
+        self._listener = None
+        self._pid = None
+
+    def start(self):
+        """
+        Arranca el hilo de escritura del proceso actual. Tras un fork la cola
+        y el hilo heredados se sustituyen por unos nuevos.
+        """
+        if self._listener is not None and self._pid == os.getpid():
+            return
+        if self._pid is not None and self._pid != os.getpid():
+            self.handler.queue = queue.Queue(self.queue_size)
+        self._listener = QueueListener(self.handler.queue, self.output, respect_handler_level=True)
+        self._listener.start()
+        self._pid = os.getpid()
+
+    def stop(self):
+        """
+        Escribe los registros pendientes y detiene el hilo de escritura.
+        """
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+        self._listener = None
+        if self.handler.dropped:
+            sys.stderr.write(f"Registros de log descartados por cola llena: {self.handler.dropped}\n")
+
+
+def parse_sampling(rules):
+    """
+    Convierte LOG_SAMPLING ("logger=fracción;logger=fracción") en un diccionario.
+
+    Args:
+        rules (str): Reglas separadas por ';'.
+
+    Returns:
+        dict: Fracción de registros a conservar por logger.
+    """
+    rates = {}
+    for rule in (rules or '').split(';'):
+        if '=' not in rule:
+            continue
+        name, rate = rule.split('=', 1)
+        rates[name.strip()] = float(rate)
+    return rates
+
+def init_logging(app):
+    """
+    Instala el pipeline de logs en el logger raíz, sustituyendo sus handlers.
+
+    Args:
+        app (Flask): Aplicación Flask.
+
+    Returns:
+        LogPipeline: Pipeline instalado.
+    """
+    root = logging.getLogger()
+    previous = app.extensions.get('log_pipeline')
+
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    if previous is not None:
+        previous.stop()
+
+    pipeline = LogPipeline(app)
+    root.addHandler(pipeline.handler)
+    root.setLevel(getattr(logging, app.config.get('LOG_LEVEL', 'INFO')))
+    pipeline.start()
+
+    app.extensions['log_pipeline'] = pipeline
+    return pipeline
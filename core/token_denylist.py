@@ -0,0 +1,88 @@
+from flask import current_app
+import heapq
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TokenDenylist:
+    """
+    Lista en memoria de tokens de acceso revocados (por jti).
+
+    Cada entrada se guarda solo hasta que el token expira por sí mismo, así
+    que la lista se mantiene pequeña mientras los tokens de acceso sean de
+    corta duración. Es local a cada proceso.
+    """
+    def __init__(self):
+        self._entries = {}
+        self._expirations = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, jti):
+        expires_at = self._entries.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def add(self, jti, expires_at):
+        """
+        Revoca un token hasta su expiración.
+
+        Args:
+            jti (str): Identificador único del token.
+            expires_at (float): Expiración del token (epoch en segundos).
+        """
+        now = time.time()
+        with self._lock:
+            self._purge(now)
+            if expires_at > now:
+                self._entries[jti] = expires_at
+                heapq.heappush(self._expirations, (expires_at, jti))
+
+    def _purge(self, now):
+        while self._expirations and self._expirations[0][0] <= now:
+            _, jti = heapq.heappop(self._expirations)
+            self._entries.pop(jti, None)
+
+
+def is_token_revoked(jti):
+    """
+    Indica si un token de acceso ha sido revocado.
+
+    Args:
+        jti (str): Identificador único del token.
+
+    Returns:
+        bool: True si el token está en la lista de revocados.
+    """
+    denylist = current_app.extensions.get('token_denylist')
+    return bool(jti) and denylist is not None and jti in denylist
+
+def revoke_token(jti, expires_at):
+    """
+    Añade un token de acceso a la lista de revocados.
+
+    Args:
+        jti (str): Identificador único del token.
+        expires_at (float): Expiración del token (epoch en segundos).
+    """
+    denylist = current_app.extensions.get('token_denylist')
+    if denylist is not None and jti:
+        denylist.add(jti, expires_at)
+
+def init_token_denylist(app):
+    """
+    Crea la lista de tokens revocados de la aplicación.
+
+    Args:
+        app (Flask): Aplicación Flask.
+
+    Returns:
+        TokenDenylist: Lista creada.
+    """
+    denylist = TokenDenylist()
+    app.extensions['token_denylist'] = denylist
+    return denylist
@@ -0,0 +1,283 @@
+from contextlib import nullcontext
+from functools import wraps
+from flask import request, g
+from pymongo import monitoring
+import inspect
+import threading
+import logging
+import os
+
+try:
+    from opentelemetry import trace, context
+    from opentelemetry.propagate import extract
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+    # El SDK solo se importa al activar las trazas (_set_up_provider)
+except ImportError:  # pragma: no cover - las trazas quedan deshabilitadas
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+# Tracer del proceso; None mientras las trazas estén deshabilitadas
+_tracer = None
+_provider = None
+
+
+def tracing_available(app):
+    """
+    Indica si las trazas están configuradas (TRACING_ENABLED y OpenTelemetry instalado).
+
+    Args:
+        app (Flask): Aplicación Flask.
+
+    Returns:
+        bool: True si se pueden registrar trazas.
+    """
+    return trace is not None and app.config.get('TRACING_ENABLED', False)
+
+def start_span(name, attributes=None):
+    """
+    Abre un span hijo del span actual, para usar con `with`.
+
+    Args:
+        name (str): Nombre del span.
+        attributes (dict, optional): Atributos del span.
+
+    Returns:
+        ContextManager: Span actual o un contexto vacío si no hay trazas.
+    """
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+def traced(fn=None, *, name=None):
+    """
+    Decorador que registra cada llamada a la función en un span propio.
+    Admite funciones síncronas y corrutinas; sin trazas activas solo añade
+    una comprobación por llamada.
+
+    Args:
+        fn (callable): Función a decorar.
+        name (str, optional): Nombre del span; por defecto el de la función.
+    """
+    def decorator(fn):
+        span_name = name or fn.__name__
+        attributes = {"code.namespace": fn.__module__, "code.function": fn.__name__}
+
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if _tracer is None:
+                    return await fn(*args, **kwargs)
+                with _tracer.start_as_current_span(span_name, attributes=attributes):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return fn(*args, **kwargs)
+            with _tracer.start_as_current_span(span_name, attributes=attributes):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator(fn) if fn is not None else decorator
+
+
+class FileSpanExporter:
+    """
+    Exportador (interfaz SpanExporter) que escribe cada span como una línea
+    JSON en un fichero local. La ruta admite {pid} para separar los procesos
+    del servidor.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        from opentelemetry.sdk.trace.export import SpanExportResult
+
+        try:
+            path = self.path.format(pid=os.getpid())
+            with self._lock, open(path, 'a', encoding='utf-8') as f:
+                for span in spans:
+                    f.write(span.to_json(indent=None) + '\n')
+            return SpanExportResult.SUCCESS
+        except Exception as e:
+            logger.error(f"Error al exportar trazas: {str(e)}")
+            return SpanExportResult.FAILURE
+
+    def force_flush(self, timeout_millis=30000):
+        return True
+
+    def shutdown(self):
+        pass
+
+
+class MongoCommandTracer(monitoring.CommandListener):
+    """
+    Listener de pymongo que abre un span por comando, hijo del span activo
+    en el hilo que ejecuta la operación (el de la petición o el servicio).
+    """
+    def __init__(self):
+        self._spans = {}
+
+    def started(self, event):
+        if _tracer is None:
+            return
+        collection = event.command.get(event.command_name)
+        attributes = {
+            "db.system": "mongodb",
+            "db.name": event.database_name,
+            "db.operation": event.command_name
+        }
+        if isinstance(collection, str):
+            attributes["db.mongodb.collection"] = collection
+        self._spans[(event.request_id, event.connection_id)] = _tracer.start_span(
+            f"mongodb.{event.command_name}", kind=SpanKind.CLIENT, attributes=attributes
+        )
+
+    def succeeded(self, event):
+        span = self._spans.pop((event.request_id, event.connection_id), None)
+        if span is not None:
+            span.end()
+
+    def failed(self, event):
+        span = self._spans.pop((event.request_id, event.connection_id), None)
+        if span is not None:
+            span.set_status(Status(StatusCode.ERROR, str(event.failure.get('errmsg', ''))))
+            span.end()
+
+
+def mongo_trace_listeners(app):
+    """
+    Devuelve los listeners de comandos a registrar en los clientes de MongoDB.
+
+    Args:
+        app (Flask): Aplicación Flask.
+
+    Returns:
+        list: Listeners de pymongo (vacía si las trazas están deshabilitadas).
+    """
+    return [MongoCommandTracer()] if tracing_available(app) else []
+
+def _create_exporter(app):
+    exporter = app.config.get('TRACING_EXPORTER', 'file')
+    if exporter == 'otlp':
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=app.config.get('TRACING_OTLP_ENDPOINT'))
+    if exporter == 'console':
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return ConsoleSpanExporter()
+    return FileSpanExporter(app.config.get('TRACING_FILE_PATH', 'traces.{pid}.jsonl'))
+
+def _set_up_provider(app):
+    global _tracer, _provider
+
+    if _provider is not None:
+        return
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": app.config.get('TRACING_SERVICE_NAME', 'delivery-api')}),
+        sampler=ParentBased(TraceIdRatioBased(app.config.get('TRACING_SAMPLE_RATIO', 1.0)))
+    )
+    provider.add_span_processor(BatchSpanProcessor(_create_exporter(app)))
+    _provider = provider
+    _tracer = provider.get_tracer(__name__)
+
+def start_request_span(method, route, headers, attributes=None):
+    """
+    Abre el span raíz de una petición HTTP y lo activa en el contexto actual.
+    Respeta la cabecera traceparent del cliente si la envía.
+
+    Args:
+        method (str): Método HTTP.
+        route (str): Plantilla de la ruta.
+        headers: Cabeceras de la petición.
+        attributes (dict, optional): Atributos adicionales.
+
+    Returns:
+        tuple: (span, token del contexto) o None si no hay trazas.
+    """
+    if _tracer is None:
+        return None
+    span = _tracer.start_span(
+        f"{method} {route}",
+        context=extract(headers),
+        kind=SpanKind.SERVER,
+        attributes={"http.method": method, "http.route": route, **(attributes or {})}
+    )
+    return span, context.attach(trace.set_span_in_context(span))
+
+def end_request_span(request_span, status_code, error=None):
+    """
+    Cierra el span raíz de una petición HTTP.
+
+    Args:
+        request_span (tuple): Valor devuelto por start_request_span.
+        status_code (int): Código de la respuesta.
+        error (Exception, optional): Excepción no controlada de la petición.
+    """
+    if request_span is None:
+        return
+    span, token = request_span
+    span.set_attribute("http.status_code", status_code)
+    if error is not None:
+        span.record_exception(error)
+    if error is not None or status_code >= 500:
+        span.set_status(Status(StatusCode.ERROR))
+    span.end()
+    context.detach(token)
+
+def shutdown_tracing():
+    """
+    Exporta los spans pendientes y detiene el exportador del proceso. El
+    procesador por lotes se reinicia tras un fork, así que cada worker
+    cierra su propia copia.
+    """
+    global _tracer, _provider
+
+    provider = _provider
+    _tracer = None
+    _provider = None
+
+    if provider is not None:
+        provider.shutdown()
+
+def init_tracing(app):
+    """
+    Configura el exportador de trazas y registra el span raíz de cada petición.
+
+    Args:
+        app (Flask): Aplicación Flask.
+
+    Returns:
+        bool: True si las trazas quedaron activas.
+    """
+    if not app.config.get('TRACING_ENABLED', False):
+        return False
+    if trace is None:
+        logger.warning("OpenTelemetry no está instalado, trazas deshabilitadas")
+        return False
+
+    _set_up_provider(app)
+
+    @app.before_request
+    def tracing_request_started():
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        g.request_span = start_request_span(request.method, route, request.headers, {"http.target": request.path})
+
+    @app.after_request
+    def tracing_response_status(response):
+        g.request_span_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def tracing_request_finished(e=None):
+        end_request_span(g.pop('request_span', None), g.pop('request_span_status', 500), e)
+
+    logger.info(f"Trazas activas (exportador: {app.config.get('TRACING_EXPORTER', 'file')})")
+    return True
@@ -1,11 +1,33 @@
 import re
+import importlib
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from bson import ObjectId
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
+
+class LazyModule:
+    """
+    Referencia a un módulo que se importa en el primer acceso a uno de sus
+    atributos, para no pagar el coste de SDKs pesados al arrancar.
+    """
+    def __init__(self, name):
+        """
+        Args:
+            name (str): Nombre absoluto del módulo (ej. 'firebase_admin.messaging').
+        """
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            # El import es seguro entre hilos gracias al lock de importlib
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
 def validate_email(email):
     """
     Valida el formato de un correo electrónico.
@@ -104,4 +126,34 @@ def validate_fcm_token(token):
         return False
     
     # Verificar que solo contenga caracteres válidos
-    return bool(re.match(r'^[a-zA-Z0-9:_\-]+$', token))
\ No newline at end of file
+    return bool(re.match(r'^[a-zA-Z0-9:_\-]+$', token))
+
+def to_utc_naive(date):
+    """
+    Normaliza una fecha a UTC sin zona horaria, como se guarda en MongoDB.
+    
+    Args:
+        date (datetime|str): Fecha a normalizar (ISO 8601 si es string).
+    
+    Returns:
+        datetime: Fecha en UTC sin tzinfo.
+    """
+    if isinstance(date, str):
+        date = datetime.fromisoformat(date.replace('Z', '+00:00'))
+    
+    if date.tzinfo is not None:
+        date = date.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    return date
+
+def to_epoch_ms(date):
+    """
+    Convierte una fecha UTC sin zona horaria a milisegundos desde epoch.
+    
+    Args:
+        date (datetime): Fecha en UTC.
+    
+    Returns:
+        float: Milisegundos desde epoch.
+    """
+    return date.replace(tzinfo=timezone.utc).timestamp() * 1000
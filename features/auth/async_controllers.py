@@ -0,0 +1,55 @@
+from quart import jsonify, g
+import logging
+from core.async_middleware import async_token_required, sync_context
+from features.auth.services import record_courier_heartbeat
+from features.auth.services_async import get_courier_info, get_user_info
+
+logger = logging.getLogger(__name__)
+
+# Versiones asíncronas de los controladores de lectura de
+# features.auth.controllers.
+
+@async_token_required
+async def courier_heartbeat_controller():
+    """
+    Registra el heartbeat de la aplicación del repartidor autenticado.
+    
+    Returns:
+        Response: Respuesta JSON con el resultado.
+    """
+    if g.role != 'courier':
+        return jsonify({
+            "error": "Solo los repartidores pueden enviar heartbeats"
+        }), 403
+    
+    # El heartbeat solo toca la tabla de presencia en memoria
+    with sync_context():
+        recorded = record_courier_heartbeat(g.user_id)
+    
+    if recorded:
+        return jsonify({
+            "message": "Heartbeat registrado"
+        }), 200
+    else:
+        return jsonify({
+            "error": "No se pudo registrar el heartbeat"
+        }), 503
+
+@async_token_required
+async def get_profile():
+    """
+    Obtiene el perfil del usuario o repartidor autenticado.
+    
+    Returns:
+        Response: Respuesta JSON con los datos del perfil.
+    """
+    if g.role == 'user':
+        user_data = await get_user_info(str(g.user_id))
+        return jsonify({
+            "user": user_data
+        }), 200
+    else:  # courier
+        courier_data = await get_courier_info(str(g.user_id))
+        return jsonify({
+            "courier": courier_data
+        }), 200
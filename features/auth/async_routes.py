@@ -0,0 +1,11 @@
+from quart import Blueprint
+from features.auth.async_controllers import (
+    courier_heartbeat_controller,
+    get_profile
+)
+
+# Mismo nombre que el blueprint síncrono, para compartir endpoints y límites
+auth_async_bp = Blueprint('auth', __name__)
+
+auth_async_bp.route('/couriers/heartbeat', methods=['POST'])(courier_heartbeat_controller)
+auth_async_bp.route('/profile', methods=['GET'])(get_profile)
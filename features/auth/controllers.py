@@ -1,15 +1,14 @@
 from flask import jsonify, request
-from features.auth.services import register_user,register_courier,login_courier,login_user,update_fcm_token,get_courier_info,get_user_info
+from features.auth.services import register_user,register_courier,login_courier,login_user,update_fcm_token,get_courier_info,get_user_info,refresh_auth_tokens,revoke_auth_tokens,record_courier_heartbeat
 import logging
 from schemas import validate_schema
-from schemas.auth import LoginSchema,RegisterCourierSchema,UpdateFCMTokenSchema,RegisterUserSchema
+from schemas.auth import LoginSchema,RegisterCourierSchema,UpdateFCMTokenSchema,RegisterUserSchema,RefreshTokenSchema,LogoutSchema
 from core.middleware import token_required
 
 logger = logging.getLogger(__name__)
 
 @validate_schema(RegisterUserSchema)
 def register_user_controller(validated_data):
-    print("entro")
     """
     Registra un nuevo usuario.
     
@@ -24,7 +23,8 @@ def register_user_controller(validated_data):
         validated_data['name'],
         validated_data['phone'],
         validated_data['password'],
-        validated_data['fcm_token']
+        validated_data['fcm_token'],
+        validated_data.get('platform')
     )
     
     if result:
@@ -52,7 +52,8 @@ def register_courier_controller(validated_data):
         validated_data['name'],
         validated_data['phone'],
         validated_data['password'],
-        validated_data['fcm_token']
+        validated_data['fcm_token'],
+        validated_data.get('platform')
     )
     
     if result:
@@ -76,15 +77,18 @@ def login_user_controller(validated_data):
     Returns:
         Response: Respuesta JSON con el token y datos del usuario.
     """
-    token, user_data = login_user(
+    tokens, user_data = login_user(
         validated_data['email'],
         validated_data['password'],
-        validated_data['fcm_token']
+        validated_data['fcm_token'],
+        validated_data.get('platform')
     )
     
-    if token and user_data:
+    if tokens and user_data:
         return jsonify({
-            "access_token": token,
+            "access_token": tokens['access_token'],
+            "refresh_token": tokens['refresh_token'],
+            "expires_in": tokens['expires_in']
         }), 200
     else:
         return jsonify({
@@ -102,17 +106,19 @@ def login_courier_controller(validated_data):
     Returns:
         Response: Respuesta JSON con el token y datos del repartidor.
     """
-    token, courier_data = login_courier(
+    tokens, courier_data = login_courier(
         validated_data['email'],
         validated_data['password'],
-        validated_data['fcm_token']
+        validated_data['fcm_token'],
+        validated_data.get('platform')
     )
-    print("entrooo")
-    print(token)
-    if token and courier_data:
+    
+    if tokens and courier_data:
         return jsonify({
             "message": "Inicio de sesión exitoso",
-            "token": token,
+            "token": tokens['access_token'],
+            "refresh_token": tokens['refresh_token'],
+            "expires_in": tokens['expires_in'],
             "courier": courier_data
         }), 200
     else:
@@ -120,6 +126,52 @@ def login_courier_controller(validated_data):
             "error": "Credenciales inválidas o token FCM no válido"
         }), 401
 
+@validate_schema(RefreshTokenSchema)
+def refresh_token_controller(validated_data):
+    """
+    Canjea un token de refresco por un nuevo par de tokens.
+    
+    Args:
+        validated_data (dict): Datos validados del esquema.
+        
+    Returns:
+        Response: Respuesta JSON con los nuevos tokens.
+    """
+    tokens = refresh_auth_tokens(validated_data['refresh_token'])
+    
+    if tokens:
+        return jsonify(tokens), 200
+    else:
+        return jsonify({
+            "error": "Token de refresco inválido o expirado. Por favor, inicie sesión nuevamente"
+        }), 401
+
+@token_required
+@validate_schema(LogoutSchema)
+def logout_controller(validated_data):
+    """
+    Cierra la sesión revocando el token de acceso actual y,
+    si se envía, el token de refresco.
+    
+    Args:
+        validated_data (dict): Datos validados del esquema.
+        
+    Returns:
+        Response: Respuesta JSON con el resultado.
+    """
+    from flask import g
+    
+    result = revoke_auth_tokens(g.claims, validated_data.get('refresh_token'))
+    
+    if result:
+        return jsonify({
+            "message": "Sesión cerrada correctamente"
+        }), 200
+    else:
+        return jsonify({
+            "error": "No se pudo revocar el token de refresco"
+        }), 400
+
 @token_required
 @validate_schema(UpdateFCMTokenSchema)
 def update_fcm_token_controller(validated_data):
@@ -137,7 +189,8 @@ def update_fcm_token_controller(validated_data):
     result = update_fcm_token(
         g.user_id,
         g.role,
-        validated_data['fcm_token']
+        validated_data['fcm_token'],
+        validated_data.get('platform')
     )
     
     if result:
@@ -149,6 +202,30 @@ def update_fcm_token_controller(validated_data):
             "error": "No se pudo actualizar el token FCM"
         }), 400
 
+@token_required
+def courier_heartbeat_controller():
+    """
+    Registra el heartbeat de la aplicación del repartidor autenticado.
+    
+    Returns:
+        Response: Respuesta JSON con el resultado.
+    """
+    from flask import g
+    
+    if g.role != 'courier':
+        return jsonify({
+            "error": "Solo los repartidores pueden enviar heartbeats"
+        }), 403
+    
+    if record_courier_heartbeat(g.user_id):
+        return jsonify({
+            "message": "Heartbeat registrado"
+        }), 200
+    else:
+        return jsonify({
+            "error": "No se pudo registrar el heartbeat"
+        }), 503
+
 @token_required
 def get_profile():
     """
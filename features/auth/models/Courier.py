@@ -15,6 +15,12 @@ class Courier:
         created_at (datetime): Fecha y hora de creación del repartidor.
         updated_at (datetime): Fecha y hora de la última actualización.
     """
+    # Sin __dict__ por instancia: se cargan miles de repartidores a la vez
+    __slots__ = (
+        "email", "name", "phone", "password_hash", "fcm_token", "available", "created_at",
+        "updated_at", "last_login", "active", "current_orders_count", "total_orders_completed"
+    )
+    
     def __init__(self, email, name, phone, password_hash, fcm_token):
         """
         Inicializa un nuevo repartidor.
@@ -66,6 +72,10 @@ class Courier:
         """
         Crea una instancia de Courier a partir de un diccionario.
         
+        Cada atributo se asigna una sola vez, sin pasar por __init__. Admite
+        documentos leídos con proyección: los campos ausentes toman su valor
+        por defecto.
+        
         Args:
             data (dict): Diccionario con datos del repartidor.
             
@@ -74,23 +84,24 @@ class Courier:
         """
         if not data:
             return None
-            
-        courier = cls(
-            email=data.get("email"),
-            name=data.get("name"),
-            phone=data.get("phone"),
-            password_hash=data.get("password_hash"),
-            fcm_token=data.get("fcm_token")
-        )
+        
+        get = data.get
+        now = datetime.utcnow()
+        courier = cls.__new__(cls)
+        courier.email = get("email")
+        courier.name = get("name")
+        courier.phone = get("phone")
+        courier.password_hash = get("password_hash")
+        courier.fcm_token = get("fcm_token")
         
         # Atributos opcionales
-        courier.available = data.get("available", True)
-        courier.created_at = data.get("created_at", datetime.utcnow())
-        courier.updated_at = data.get("updated_at", datetime.utcnow())
-        courier.last_login = data.get("last_login")
-        courier.active = data.get("active", True)
-        courier.current_orders_count = data.get("current_orders_count", 0)
-        courier.total_orders_completed = data.get("total_orders_completed", 0)
+        courier.available = get("available", True)
+        courier.created_at = get("created_at", now)
+        courier.updated_at = get("updated_at", now)
+        courier.last_login = get("last_login")
+        courier.active = get("active", True)
+        courier.current_orders_count = get("current_orders_count", 0)
+        courier.total_orders_completed = get("total_orders_completed", 0)
         
         return courier
     
@@ -275,20 +286,22 @@ class Courier:
             return None
     
     @classmethod
-    def get_available_couriers(cls, db, limit=None):
+    def get_available_couriers(cls, db, limit=None, projection=None):
         """
         Obtiene los repartidores disponibles.
         
         Args:
             db: Conexión a la base de datos.
             limit (int, optional): Límite de resultados.
+            projection (dict, optional): Campos a leer (ej. {"fcm_token": 1}
+                para un envío); los demás toman su valor por defecto.
             
         Returns:
             list: Lista de instancias de Courier disponibles.
         """
         try:
             query = {"available": True, "active": True}
-            cursor = db.couriers.find(query).sort("current_orders_count", 1)
+            cursor = db.couriers.find(query, projection).sort("current_orders_count", 1)
             
             if limit:
                 cursor = cursor.limit(limit)
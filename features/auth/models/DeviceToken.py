@@ -0,0 +1,55 @@
+from datetime import datetime
+
+class DeviceToken:
+    """
+    Modelo para representar un dispositivo registrado para notificaciones push.
+    
+    Un usuario o repartidor puede tener varios dispositivos; cada token FCM
+    pertenece a un único propietario (índice único sobre `token`).
+    
+    Attributes:
+        owner_id (ObjectId): ID del usuario o repartidor propietario.
+        role (str): Rol del propietario ('user' o 'courier').
+        token (str): Token de Firebase Cloud Messaging del dispositivo.
+        platform (str): Plataforma del dispositivo ('android', 'ios' o 'web').
+        created_at (datetime): Fecha del primer registro del dispositivo.
+        last_seen (datetime): Última vez que el dispositivo se registró o inició sesión.
+    """
+    # Constantes para las plataformas
+    PLATFORM_ANDROID = "android"
+    PLATFORM_IOS = "ios"
+    PLATFORM_WEB = "web"
+    PLATFORMS = (PLATFORM_ANDROID, PLATFORM_IOS, PLATFORM_WEB)
+    
+    def __init__(self, owner_id, role, token, platform=None):
+        """
+        Inicializa un nuevo dispositivo.
+        
+        Args:
+            owner_id (ObjectId): ID del usuario o repartidor.
+            role (str): Rol del propietario ('user' o 'courier').
+            token (str): Token FCM del dispositivo.
+            platform (str, optional): Plataforma del dispositivo.
+        """
+        self.owner_id = owner_id
+        self.role = role
+        self.token = token
+        self.platform = platform
+        self.created_at = datetime.utcnow()
+        self.last_seen = self.created_at
+    
+    def to_dict(self):
+        """
+        Convierte el objeto a un diccionario para almacenamiento en MongoDB.
+        
+        Returns:
+            dict: Representación del dispositivo como diccionario.
+        """
+        return {
+            "owner_id": self.owner_id,
+            "role": self.role,
+            "token": self.token,
+            "platform": self.platform,
+            "created_at": self.created_at,
+            "last_seen": self.last_seen
+        }
@@ -14,6 +14,11 @@ class User:
         created_at (datetime): Fecha y hora de creación del usuario.
         updated_at (datetime): Fecha y hora de la última actualización.
     """
+    __slots__ = (
+        "email", "name", "phone", "password_hash", "fcm_token",
+        "created_at", "updated_at", "last_login", "active"
+    )
+    
     def __init__(self, email, name, phone, password_hash, fcm_token):
         """
         Inicializa un nuevo usuario.
@@ -59,6 +64,10 @@ class User:
         """
         Crea una instancia de User a partir de un diccionario.
         
+        Cada atributo se asigna una sola vez, sin pasar por __init__. Admite
+        documentos leídos con proyección: los campos ausentes toman su valor
+        por defecto.
+        
         Args:
             data (dict): Diccionario con datos del usuario.
             
@@ -67,20 +76,21 @@ class User:
         """
         if not data:
             return None
-            
-        user = cls(
-            email=data.get("email"),
-            name=data.get("name"),
-            phone=data.get("phone"),
-            password_hash=data.get("password_hash"),
-            fcm_token=data.get("fcm_token")
-        )
+        
+        get = data.get
+        now = datetime.utcnow()
+        user = cls.__new__(cls)
+        user.email = get("email")
+        user.name = get("name")
+        user.phone = get("phone")
+        user.password_hash = get("password_hash")
+        user.fcm_token = get("fcm_token")
         
         # Atributos opcionales
-        user.created_at = data.get("created_at", datetime.utcnow())
-        user.updated_at = data.get("updated_at", datetime.utcnow())
-        user.last_login = data.get("last_login")
-        user.active = data.get("active", True)
+        user.created_at = get("created_at", now)
+        user.updated_at = get("updated_at", now)
+        user.last_login = get("last_login")
+        user.active = get("active", True)
         
         return user
     
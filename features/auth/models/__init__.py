@@ -1,2 +1,3 @@
 from features.auth.models.User import User
 from features.auth.models.Courier import Courier
+from features.auth.models.DeviceToken import DeviceToken
@@ -5,6 +5,9 @@ from features.auth.controllers import (
     login_user_controller,
     login_courier_controller,
     update_fcm_token_controller,
+    refresh_token_controller,
+    logout_controller,
+    courier_heartbeat_controller,
     get_profile
 )
 
@@ -18,7 +21,12 @@ auth_bp.route('/users/login', methods=['POST'])(login_user_controller)
 # Rutas para repartidores
 auth_bp.route('/couriers/register', methods=['POST'])(register_courier_controller)
 auth_bp.route('/couriers/login', methods=['POST'])(login_courier_controller)
+auth_bp.route('/couriers/heartbeat', methods=['POST'])(courier_heartbeat_controller)
+
+# Renovación de tokens
+auth_bp.route('/refresh', methods=['POST'])(refresh_token_controller)
 
 # Rutas comunes que requieren autenticación
+auth_bp.route('/logout', methods=['POST'])(logout_controller)
 auth_bp.route('/profile', methods=['GET'])(get_profile)
 auth_bp.route('/update-fcm-token', methods=['POST'])(update_fcm_token_controller)
\ No newline at end of file
@@ -1,9 +1,17 @@
 from features.auth.services.generate_jwt_token import generate_jwt_token
+from features.auth.services.generate_refresh_token import generate_refresh_token
+from features.auth.services.issue_auth_tokens import issue_auth_tokens
 from features.auth.services.get_courier_info import get_courier_info
+from features.auth.services.get_device_tokens import get_device_tokens
 from features.auth.services.get_user_info import get_user_info
 from features.auth.services.login_courier import login_courier
 from features.auth.services.login_user import login_user
+from features.auth.services.record_courier_heartbeat import record_courier_heartbeat
+from features.auth.services.refresh_auth_tokens import refresh_auth_tokens
+from features.auth.services.register_device_token import register_device_token
 from features.auth.services.register_courier import register_courier
 from features.auth.services.register_user import register_user
+from features.auth.services.remove_device_tokens import remove_device_tokens
+from features.auth.services.revoke_auth_tokens import revoke_auth_tokens
 from features.auth.services.update_courier_availability import update_courier_availability
 from features.auth.services.update_fcm_token import update_fcm_token
@@ -1,26 +1,39 @@
 import jwt
+import uuid
 from datetime import datetime, timedelta
 from flask import current_app
+from core.tracing import traced
 
-def generate_jwt_token(user_id, role):
+@traced
+def generate_jwt_token(user_id, role, name=None, active=True):
     """
-    Genera un token JWT para autenticación.
+    Genera un token JWT de acceso de corta duración.
+    
+    El token incluye todos los datos que necesitan los controladores
+    (rol, estado y nombre), de modo que se verifica sin consultar la base de datos.
     
     Args:
         user_id (str): ID del usuario o repartidor.
         role (str): Rol ('user' o 'courier').
+        name (str, optional): Nombre a mostrar.
+        active (bool, optional): Si la cuenta está activa.
     
     Returns:
         str: Token JWT generado.
     """
     # Establecer tiempo de expiración
-    expiration = datetime.utcnow() + timedelta(seconds=current_app.config['JWT_ACCESS_TOKEN_EXPIRES'])
+    now = datetime.utcnow()
+    expiration = now + timedelta(seconds=current_app.config['JWT_ACCESS_TOKEN_EXPIRES'])
   
     payload = {
         'exp': expiration,
-        'iat': datetime.utcnow(),
+        'iat': now,
+        'jti': uuid.uuid4().hex,
+        'type': 'access',
         'user_id': user_id,
-        'role': role
+        'role': role,
+        'name': name,
+        'active': active
     }
     
 
@@ -30,4 +43,4 @@ def generate_jwt_token(user_id, role):
         algorithm="HS256"
     )
     
-    return token
\ No newline at end of file
+    return token
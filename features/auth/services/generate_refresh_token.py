@@ -0,0 +1,53 @@
+import jwt
+import uuid
+import logging
+from datetime import datetime, timedelta
+from bson import ObjectId
+from flask import current_app
+from core.database import get_db
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+@traced
+def generate_refresh_token(user_id, role):
+    """
+    Genera un token de refresco y lo registra en la base de datos.
+    
+    Args:
+        user_id (str): ID del usuario o repartidor.
+        role (str): Rol ('user' o 'courier').
+    
+    Returns:
+        str: Token de refresco generado.
+    """
+    db = get_db()
+    
+    now = datetime.utcnow()
+    expiration = now + timedelta(seconds=current_app.config['JWT_REFRESH_TOKEN_EXPIRES'])
+    jti = uuid.uuid4().hex
+    
+    # El registro permite revocar el token (rotación, cierre de sesión)
+    db.refresh_tokens.insert_one({
+        "jti": jti,
+        "user_id": ObjectId(user_id),
+        "role": role,
+        "revoked": False,
+        "created_at": now,
+        "expires_at": expiration
+    })
+    
+    payload = {
+        'exp': expiration,
+        'iat': now,
+        'jti': jti,
+        'type': 'refresh',
+        'user_id': user_id,
+        'role': role
+    }
+    
+    return jwt.encode(
+        payload,
+        current_app.config['JWT_SECRET_KEY'],
+        algorithm="HS256"
+    )
@@ -1,10 +1,11 @@
-from core.database import get_db
-from bson import ObjectId
+from core.principal_cache import load_principal
 from features.auth.models import Courier
 import logging
+from core.tracing import traced
 
 logger = logger = logging.getLogger(__name__)
 
+@traced
 def get_courier_info(courier_id):
     """
     Obtiene la información de un repartidor por su ID.
@@ -16,8 +17,8 @@ def get_courier_info(courier_id):
         dict: Datos del repartidor o None si no se encuentra.
     """
     try:
-        db = get_db()
-        courier = db.couriers.find_one({"_id": ObjectId(courier_id)})
+        # Caché de principales y mapa de identidades de la petición
+        courier = load_principal('courier', courier_id)
 
         if courier:
             return Courier.serialize_for_api(courier)
@@ -0,0 +1,43 @@
+import logging
+from bson import ObjectId
+from core.database import get_db
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+@traced
+def get_device_tokens(role, owner_ids):
+    """
+    Obtiene los tokens FCM de todos los dispositivos de varios usuarios o
+    repartidores con una sola consulta.
+    
+    Args:
+        role (str): Rol ('user' o 'courier').
+        owner_ids (iterable): IDs de los propietarios.
+    
+    Returns:
+        dict: Listas de tokens indexadas por ObjectId del propietario
+            (lista vacía si no tiene dispositivos registrados).
+    """
+    owner_ids = [ObjectId(owner_id) for owner_id in owner_ids]
+    tokens = {owner_id: [] for owner_id in owner_ids}
+    
+    if not owner_ids:
+        return tokens
+    
+    try:
+        db = get_db()
+        
+        cursor = db.device_tokens.find(
+            {"role": role, "owner_id": {"$in": owner_ids}},
+            {"owner_id": 1, "token": 1, "_id": 0}
+        )
+        
+        for device in cursor:
+            tokens[device["owner_id"]].append(device["token"])
+        
+        return tokens
+    
+    except Exception as e:
+        logger.error(f"Error al obtener dispositivos de {role}: {str(e)}")
+        return tokens
@@ -1,8 +1,9 @@
-from core.database import get_db
+from core.principal_cache import load_principal
 from features.auth.models import User
 import logging
-from bson import ObjectId
+from core.tracing import traced
 logger = logger = logging.getLogger(__name__)
+@traced
 def get_user_info(user_id):
     """
     Obtiene la información de un usuario por su ID.
@@ -14,10 +15,8 @@ def get_user_info(user_id):
         dict: Datos del usuario o None si no se encuentra.
     """
     try:
-        db = get_db()
-        
-        # Buscar usuario por ID
-        user = db.users.find_one({"_id": ObjectId(user_id)})
+        # Buscar usuario por ID (caché de principales y mapa de identidades)
+        user = load_principal('user', user_id)
         
         if user:
             return User.serialize_for_api(user)
@@ -0,0 +1,30 @@
+from flask import current_app
+from features.auth.services.generate_jwt_token import generate_jwt_token
+from features.auth.services.generate_refresh_token import generate_refresh_token
+from core.tracing import traced
+
+@traced
+def issue_auth_tokens(principal, role):
+    """
+    Emite un par de tokens (acceso y refresco) para un usuario o repartidor.
+    
+    Args:
+        principal (dict): Documento del usuario o repartidor.
+        role (str): Rol ('user' o 'courier').
+    
+    Returns:
+        dict: Tokens emitidos y duración del token de acceso en segundos.
+    """
+    user_id = str(principal['_id'])
+    
+    return {
+        "access_token": generate_jwt_token(
+            user_id,
+            role,
+            name=principal.get('name'),
+            active=principal.get('active', True)
+        ),
+        "refresh_token": generate_refresh_token(user_id, role),
+        "token_type": "Bearer",
+        "expires_in": current_app.config['JWT_ACCESS_TOKEN_EXPIRES']
+    }
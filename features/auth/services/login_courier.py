@@ -1,23 +1,32 @@
 from core.database import get_db
+from features.auth.services.register_device_token import register_device_token
+from pymongo import ReturnDocument
+from core.identity_map import remember_document, COURIERS
+from core.principal_cache import invalidate_principal
+from core.presence import record_presence
 import logging
-from werkzeug.security import check_password_hash
+from core.password_hashing import verify_password, needs_rehash, hash_password
+from core.exceptions import ServiceUnavailableError
 from datetime import datetime
-from features.auth.services.generate_jwt_token import generate_jwt_token
+from features.auth.services.issue_auth_tokens import issue_auth_tokens
 from features.auth.models import Courier  
+from core.tracing import traced
 
 logger = logging.getLogger(__name__)
 
-def login_courier(email, password, fcm_token):
+@traced
+def login_courier(email, password, fcm_token, platform=None):
     """
-    Autentica a un repartidor y devuelve un token JWT.
+    Autentica a un repartidor y emite sus tokens de acceso y refresco.
     
     Args:
         email (str): Correo electrónico del repartidor.
         password (str): Contraseña.
         fcm_token (str): Token FCM para actualizar (obligatorio).
+        platform (str, optional): Plataforma del dispositivo.
     
     Returns:
-        tuple: (token, courier_data) o (None, None) si la autenticación falla.
+        tuple: (tokens, courier_data) o (None, None) si la autenticación falla.
     """
     # Verificar que el token FCM no sea nulo o vacío
     if not fcm_token:
@@ -27,38 +36,51 @@ def login_courier(email, password, fcm_token):
     try:
         db = get_db()
         
-        # Buscar repartidor
-        courier = db.couriers.find_one({"email": email})
+        # Buscar solo el hash para verificar la contraseña
+        credentials = db.couriers.find_one({"email": email}, {"password_hash": 1})
         
-        if not courier or not check_password_hash(courier['password_hash'], password):
+        if not credentials or not verify_password(credentials['password_hash'], password):
             logger.warning(f"Intento de login fallido para repartidor: {email}")
             return None, None
         
         # Actualizar token FCM y fecha de último login
-        db.couriers.update_one(
-            {"_id": courier['_id']},
-            {
-                "$set": {
-                    "fcm_token": fcm_token,
-                    "updated_at": datetime.utcnow(),
-                    "last_login": datetime.utcnow()
-                }
-            }
+        now = datetime.utcnow()
+        updates = {
+            "fcm_token": fcm_token,
+            "updated_at": now,
+            "last_login": now
+        }
+        
+        # Regenerar el hash si se creó con parámetros anteriores
+        if needs_rehash(credentials['password_hash']):
+            updates["password_hash"] = hash_password(password)
+        
+        # Actualizar y leer el documento en una sola operación; el filtro por
+        # hash descarta el login si la contraseña cambió mientras se verificaba
+        courier = db.couriers.find_one_and_update(
+            {"_id": credentials['_id'], "password_hash": credentials['password_hash']},
+            {"$set": updates},
+            return_document=ReturnDocument.AFTER
         )
+        if not courier:
+            logger.warning(f"Las credenciales cambiaron durante el login del repartidor: {email}")
+            return None, None
         
-        # Actualizar datos en el objeto courier antes de serializarlo
-        courier['fcm_token'] = fcm_token
-        courier['last_login'] = datetime.utcnow()
-        courier['updated_at'] = datetime.utcnow()
+        remember_document(COURIERS, courier)
+        invalidate_principal('courier', courier['_id'])
+        register_device_token(courier['_id'], 'courier', fcm_token, platform)
+        record_presence(courier['_id'])
         
-        # Generar token JWT
-        token = generate_jwt_token(str(courier['_id']), 'courier')
+        # Generar tokens de acceso y refresco
+        tokens = issue_auth_tokens(courier, 'courier')
         
         # Serializar datos del courier para la API
         courier_data = Courier.serialize_for_api(courier)
         
         logger.info(f"Repartidor autenticado: {email}")
-        return token, courier_data
+        return tokens, courier_data
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         logger.error(f"Error en login_courier: {str(e)}")
         return None, None
\ No newline at end of file
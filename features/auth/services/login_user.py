@@ -1,21 +1,29 @@
 import logging
 from core.database import get_db
-from features.auth.services.generate_jwt_token import generate_jwt_token
-from werkzeug.security import check_password_hash
+from features.auth.services.register_device_token import register_device_token
+from pymongo import ReturnDocument
+from core.identity_map import remember_document, USERS
+from core.principal_cache import invalidate_principal
+from features.auth.services.issue_auth_tokens import issue_auth_tokens
+from core.password_hashing import verify_password, needs_rehash, hash_password
+from core.exceptions import ServiceUnavailableError
 from features.auth.models import User
 from datetime import datetime
+from core.tracing import traced
 logger = logging.getLogger(__name__)
-def login_user(email, password, fcm_token):
+@traced
+def login_user(email, password, fcm_token, platform=None):
     """
-    Autentica a un usuario y devuelve un token JWT.
+    Autentica a un usuario y emite sus tokens de acceso y refresco.
     
     Args:
         email (str): Correo electrónico del usuario.
         password (str): Contraseña.
         fcm_token (str): Token FCM para actualizar (obligatorio).
+        platform (str, optional): Plataforma del dispositivo.
     
     Returns:
-        tuple: (token, user_data) o (None, None) si la autenticación falla.
+        tuple: (tokens, user_data) o (None, None) si la autenticación falla.
     """
     # Verify that the FCM token exists
     if not fcm_token:
@@ -25,25 +33,41 @@ def login_user(email, password, fcm_token):
     try:
         db = get_db()
         
-        # Buscar usuario
-        user = db.users.find_one({"email": email})
-        if not user or not check_password_hash(user['password_hash'], password):
+        # Buscar solo el hash para verificar la contraseña
+        credentials = db.users.find_one({"email": email}, {"password_hash": 1})
+        if not credentials or not verify_password(credentials['password_hash'], password):
             logger.warning(f"Intento de login fallido para email: {email}")
             return None, None
         
-
-        db.users.update_one(
-            {"_id": user['_id']},
-            {"$set": {"fcm_token": fcm_token, "updated_at": datetime.utcnow()}}
+        updates = {"fcm_token": fcm_token, "updated_at": datetime.utcnow()}
+        
+        # Regenerar el hash si se creó con parámetros anteriores
+        if needs_rehash(credentials['password_hash']):
+            updates["password_hash"] = hash_password(password)
+        
+        # Actualizar y leer el documento en una sola operación; el filtro por
+        # hash descarta el login si la contraseña cambió mientras se verificaba
+        user = db.users.find_one_and_update(
+            {"_id": credentials['_id'], "password_hash": credentials['password_hash']},
+            {"$set": updates},
+            return_document=ReturnDocument.AFTER
         )
-        user['fcm_token'] = fcm_token
+        if not user:
+            logger.warning(f"Las credenciales cambiaron durante el login de: {email}")
+            return None, None
+        
+        remember_document(USERS, user)
+        invalidate_principal('user', user['_id'])
+        register_device_token(user['_id'], 'user', fcm_token, platform)
         
-        # Generar token JWT
-        token = generate_jwt_token(str(user['_id']), 'user')
+        # Generar tokens de acceso y refresco
+        tokens = issue_auth_tokens(user, 'user')
         
         logger.info(f"Usuario autenticado: {email}")
-        return token, User.serialize_for_api(user)
+        return tokens, User.serialize_for_api(user)
     
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         logger.error(f"Error en login de usuario: {str(e)}")
         return None, None
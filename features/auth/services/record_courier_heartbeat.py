@@ -0,0 +1,26 @@
+import logging
+from bson import ObjectId
+from core.presence import record_presence
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+@traced
+def record_courier_heartbeat(courier_id):
+    """
+    Registra que la aplicación de un repartidor sigue activa.
+    
+    El heartbeat se guarda en memoria y se escribe en MongoDB por lotes,
+    por lo que esta operación no accede a la base de datos.
+    
+    Args:
+        courier_id (str|ObjectId): ID del repartidor.
+    
+    Returns:
+        bool: True si se registró correctamente, False en caso contrario.
+    """
+    try:
+        return record_presence(ObjectId(courier_id))
+    except Exception as e:
+        logger.error(f"Error al registrar heartbeat del repartidor {courier_id}: {str(e)}")
+        return False
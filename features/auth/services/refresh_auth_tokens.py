@@ -0,0 +1,71 @@
+import jwt
+import logging
+from datetime import datetime
+from bson import ObjectId
+from flask import current_app
+from core.database import get_db
+from core.identity_map import collection_for_role
+from features.auth.services.issue_auth_tokens import issue_auth_tokens
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+@traced
+def refresh_auth_tokens(refresh_token):
+    """
+    Canjea un token de refresco por un nuevo par de tokens.
+    
+    Cada token de refresco solo se puede usar una vez (rotación). Si se
+    presenta uno ya usado o revocado, se revocan todas las sesiones del
+    usuario o repartidor. Aquí es donde se comprueba contra la base de datos
+    que la cuenta sigue existiendo y activa.
+    
+    Args:
+        refresh_token (str): Token de refresco.
+    
+    Returns:
+        dict: Nuevos tokens o None si el token no es válido.
+    """
+    try:
+        data = jwt.decode(refresh_token, current_app.config['JWT_SECRET_KEY'], algorithms=["HS256"])
+    except jwt.InvalidTokenError as e:
+        logger.warning(f"Token de refresco inválido: {str(e)}")
+        return None
+    
+    if data.get('type') != 'refresh':
+        logger.warning("Se intentó refrescar con un token que no es de refresco")
+        return None
+    
+    try:
+        db = get_db()
+        now = datetime.utcnow()
+        user_id_obj = ObjectId(data['user_id'])
+        
+        # Marcar el token como usado de forma atómica
+        stored = db.refresh_tokens.find_one_and_update(
+            {"jti": data['jti'], "revoked": False},
+            {"$set": {"revoked": True, "revoked_at": now}}
+        )
+        
+        if not stored:
+            logger.warning(f"Reutilización de token de refresco para {data['role']} {data['user_id']}, se revocan sus sesiones")
+            db.refresh_tokens.update_many(
+                {"user_id": user_id_obj, "role": data['role'], "revoked": False},
+                {"$set": {"revoked": True, "revoked_at": now}}
+            )
+            return None
+        
+        principal = db[collection_for_role(data['role'])].find_one(
+            {"_id": user_id_obj},
+            {"name": 1, "active": 1}
+        )
+        
+        if not principal or not principal.get('active', True):
+            logger.warning(f"Refresco denegado para {data['role']} {data['user_id']}: cuenta inexistente o inactiva")
+            return None
+        
+        return issue_auth_tokens(principal, data['role'])
+    
+    except Exception as e:
+        logger.error(f"Error al refrescar tokens: {str(e)}")
+        return None
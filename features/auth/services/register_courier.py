@@ -1,10 +1,16 @@
 import logging
 from core.database import get_db
-from werkzeug.security import generate_password_hash
+from features.auth.services.register_device_token import register_device_token
+from core.identity_map import remember_document, COURIERS
+from core.password_hashing import hash_password
+from core.exceptions import ServiceUnavailableError, ConflictError
 from features.auth.models import Courier
+from pymongo.errors import DuplicateKeyError
+from core.tracing import traced
 logger = logging.getLogger(__name__)
 
-def register_courier(email, name, phone, password, fcm_token):
+@traced
+def register_courier(email, name, phone, password, fcm_token, platform=None):
     """
     Registra un nuevo repartidor en el sistema.
     
@@ -14,9 +20,13 @@ def register_courier(email, name, phone, password, fcm_token):
         phone (str): Teléfono del repartidor.
         password (str): Contraseña (sin encriptar).
         fcm_token (str): Token de Firebase Cloud Messaging (obligatorio).
+        platform (str, optional): Plataforma del dispositivo.
     
     Returns:
         dict: Datos del repartidor creado o None si hay error.
+    
+    Raises:
+        ConflictError: Si el correo ya está registrado.
     """
     # Verificamos que exista el token
     if not fcm_token:
@@ -26,25 +36,27 @@ def register_courier(email, name, phone, password, fcm_token):
     try:
         db = get_db()
         
-        # Check if the email is already registered
-        if db.couriers.find_one({"email": email}):
-            logger.warning(f"Intento de registro con email existente: {email}")
-            return None
-        
         # Encriptar contraseña
-        password_hash = generate_password_hash(password)
+        password_hash = hash_password(password)
         
         # Crear nuevo repartidor
         courier = Courier(email, name, phone, password_hash, fcm_token)
         courier_dict = courier.to_dict()
         
-        # Insertar en la base de datos
+        # Insertar en la base de datos (el índice único sobre email rechaza duplicados)
         result = db.couriers.insert_one(courier_dict)
         courier_dict['_id'] = result.inserted_id
+        remember_document(COURIERS, courier_dict)
+        register_device_token(courier_dict['_id'], 'courier', fcm_token, platform)
         
         logger.info(f"Repartidor registrado: {email}")
         return Courier.serialize_for_api(courier_dict)
     
+    except DuplicateKeyError:
+        logger.warning(f"Intento de registro con email existente: {email}")
+        raise ConflictError("El correo ya está registrado")
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         logger.error(f"Error al registrar repartidor: {str(e)}")
         return None
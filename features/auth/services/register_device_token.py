@@ -0,0 +1,70 @@
+import logging
+from bson import ObjectId
+from pymongo import ReturnDocument
+from core.database import get_db
+from core.identity_map import USERS, COURIERS, collection_for_role, forget_document
+from core.principal_cache import invalidate_principal
+from features.auth.models import DeviceToken
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+@traced
+def register_device_token(owner_id, role, token, platform=None):
+    """
+    Registra (o renueva) un dispositivo de un usuario o repartidor.
+    
+    La operación es un upsert sobre el token: si el dispositivo ya estaba
+    registrado, se actualiza su propietario y la fecha de última actividad,
+    que es la que usa el índice TTL para dar de baja dispositivos inactivos.
+    
+    El token queda reclamado en exclusiva: el índice único garantiza un solo
+    propietario en el registro, y el token heredado (`fcm_token`) se retira
+    de cualquier otro usuario o repartidor que lo tuviera.
+    
+    Args:
+        owner_id (str|ObjectId): ID del usuario o repartidor.
+        role (str): Rol ('user' o 'courier').
+        token (str): Token FCM del dispositivo.
+        platform (str, optional): Plataforma del dispositivo.
+    
+    Returns:
+        bool: True si se registró correctamente, False en caso contrario.
+    """
+    if not token:
+        return False
+    
+    try:
+        db = get_db()
+        
+        device = DeviceToken(ObjectId(owner_id), role, token, platform).to_dict()
+        created_at = device.pop("created_at")
+        if platform is None:
+            # No sobrescribir la plataforma conocida si el cliente no la envía
+            device.pop("platform")
+        
+        previous = db.device_tokens.find_one_and_update(
+            {"token": token},
+            {"$set": device, "$setOnInsert": {"created_at": created_at}},
+            projection={"owner_id": 1, "role": 1},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+        
+        if previous and (previous["owner_id"], previous["role"]) != (device["owner_id"], role):
+            logger.info(f"Dispositivo reasignado de {previous['role']} {previous['owner_id']} a {role} {owner_id}")
+            forget_document(collection_for_role(previous["role"]), previous["owner_id"])
+            invalidate_principal(previous["role"], previous["owner_id"])
+        
+        # Retirar el token heredado del resto de cuentas
+        for collection_name in (USERS, COURIERS):
+            db[collection_name].update_many(
+                {"fcm_token": token, "_id": {"$ne": device["owner_id"]}},
+                {"$set": {"fcm_token": None}}
+            )
+        
+        return True
+    
+    except Exception as e:
+        logger.error(f"Error al registrar dispositivo para {role} {owner_id}: {str(e)}")
+        return False
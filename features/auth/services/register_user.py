@@ -1,12 +1,18 @@
 from core.database import get_db
-from werkzeug.security import generate_password_hash
+from features.auth.services.register_device_token import register_device_token
+from core.identity_map import remember_document, USERS
+from core.password_hashing import hash_password
+from core.exceptions import ServiceUnavailableError, ConflictError
 from features.auth.models import User
+from pymongo.errors import DuplicateKeyError
 import logging
+from core.tracing import traced
 
 
 logger = logging.getLogger(__name__)
 
-def register_user(email, name, phone, password, fcm_token):
+@traced
+def register_user(email, name, phone, password, fcm_token, platform=None):
     """
     Registra un nuevo usuario en el sistema.
     
@@ -16,9 +22,13 @@ def register_user(email, name, phone, password, fcm_token):
         phone (str): Teléfono del usuario.
         password (str): Contraseña (sin encriptar).
         fcm_token (str): Token de Firebase Cloud Messaging (obligatorio).
+        platform (str, optional): Plataforma del dispositivo.
     
     Returns:
         dict: Datos del usuario creado o None si hay error.
+    
+    Raises:
+        ConflictError: Si el correo ya está registrado.
     """
     # Verificar que el token FCM no sea nulo o vacío
     if not fcm_token:
@@ -28,24 +38,26 @@ def register_user(email, name, phone, password, fcm_token):
     try:
         db = get_db()
         
-        # Verificamos si el correo ya esta registrado
-        if db.users.find_one({"email": email}):
-            logger.warning(f"Intento de registro con email existente: {email}")
-            return None
-        
         # Encriptamos la contraseña
-        password_hash = generate_password_hash(password)
+        password_hash = hash_password(password)
         
         # -->Creamos un usuario
         user = User(email, name, phone, password_hash, fcm_token)
         user_dict = user.to_dict()
-        #Insert one nos permite insertar solo una entidad a nuesta BD
+        # El índice único sobre email rechaza los correos ya registrados
         result = db.users.insert_one(user_dict)
         user_dict['_id'] = result.inserted_id
+        remember_document(USERS, user_dict)
+        register_device_token(user_dict['_id'], 'user', fcm_token, platform)
         
         logger.info(f"Usuario registrado: {email}")
         return User.serialize_for_api(user_dict)
     
+    except DuplicateKeyError:
+        logger.warning(f"Intento de registro con email existente: {email}")
+        raise ConflictError("El correo ya está registrado")
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         logger.error(f"Error al registrar usuario: {str(e)}")
         return None
\ No newline at end of file
@@ -0,0 +1,42 @@
+import logging
+from core.database import get_db
+from core.identity_map import USERS, COURIERS
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+@traced
+def remove_device_tokens(tokens):
+    """
+    Da de baja dispositivos cuyos tokens FCM ya no son válidos
+    (aplicación desinstalada o token caducado).
+    
+    Args:
+        tokens (list): Tokens FCM a eliminar.
+    
+    Returns:
+        int: Número de dispositivos eliminados.
+    """
+    if not tokens:
+        return 0
+    
+    try:
+        db = get_db()
+        
+        tokens = list(tokens)
+        result = db.device_tokens.delete_many({"token": {"$in": tokens}})
+        
+        # Limpiar también el token heredado del documento del propietario
+        for collection_name in (USERS, COURIERS):
+            db[collection_name].update_many(
+                {"fcm_token": {"$in": tokens}},
+                {"$set": {"fcm_token": None}}
+            )
+        
+        if result.deleted_count:
+            logger.info(f"Dispositivos dados de baja por token no registrado: {result.deleted_count}")
+        return result.deleted_count
+    
+    except Exception as e:
+        logger.error(f"Error al eliminar dispositivos: {str(e)}")
+        return 0
@@ -0,0 +1,56 @@
+import jwt
+import logging
+from datetime import datetime
+from bson import ObjectId
+from flask import current_app
+from core.database import get_db
+from core.token_denylist import revoke_token
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+@traced
+def revoke_auth_tokens(claims, refresh_token=None):
+    """
+    Cierra la sesión: revoca el token de acceso actual y, si se indica,
+    el token de refresco asociado.
+    
+    Args:
+        claims (dict): Datos del token de acceso ya verificado.
+        refresh_token (str, optional): Token de refresco a revocar.
+    
+    Returns:
+        bool: True si se revocaron los tokens, False en caso contrario.
+    """
+    revoke_token(claims.get('jti'), claims.get('exp', 0))
+    
+    if not refresh_token:
+        return True
+    
+    try:
+        data = jwt.decode(
+            refresh_token,
+            current_app.config['JWT_SECRET_KEY'],
+            algorithms=["HS256"],
+            options={"verify_exp": False}
+        )
+        
+        if data.get('type') != 'refresh' or data.get('user_id') != claims.get('user_id'):
+            logger.warning(f"Token de refresco no corresponde al {claims.get('role')} {claims.get('user_id')}")
+            return False
+        
+        db = get_db()
+        db.refresh_tokens.update_one(
+            {"jti": data['jti'], "user_id": ObjectId(data['user_id'])},
+            {"$set": {"revoked": True, "revoked_at": datetime.utcnow()}}
+        )
+        
+        logger.info(f"Sesión cerrada para {claims.get('role')} {claims.get('user_id')}")
+        return True
+    
+    except jwt.InvalidTokenError as e:
+        logger.warning(f"Token de refresco inválido al cerrar sesión: {str(e)}")
+        return False
+    except Exception as e:
+        logger.error(f"Error al revocar tokens: {str(e)}")
+        return False
@@ -1,9 +1,13 @@
 from core.database import get_db
+from core.identity_map import forget_document, COURIERS
+from core.principal_cache import invalidate_principal
 import logging
 from bson import ObjectId
 from datetime import datetime
+from core.tracing import traced
 
 logger = logger = logging.getLogger(__name__)
+@traced
 def update_courier_availability(courier_id, available):
     """
     Actualiza la disponibilidad de un repartidor.
@@ -23,6 +27,8 @@ def update_courier_availability(courier_id, available):
             {"_id": ObjectId(courier_id)},
             {"$set": {"available": available, "updated_at": datetime.utcnow()}}
         )
+        forget_document(COURIERS, courier_id)
+        invalidate_principal('courier', courier_id)
         
         if result.modified_count > 0:
             logger.info(f"Disponibilidad actualizada para repartidor {courier_id}: {available}")
@@ -1,17 +1,24 @@
 from core.database import get_db
+from features.auth.services.register_device_token import register_device_token
+from core.identity_map import collection_for_role, forget_document
+from core.principal_cache import invalidate_principal
 import logging
 from datetime import datetime
+from core.tracing import traced
 
 logger = logging.getLogger(__name__)
 
-def update_fcm_token(user_id, role, fcm_token):
+@traced
+def update_fcm_token(user_id, role, fcm_token, platform=None):
     """
-    Actualiza el token FCM de un usuario o repartidor.
+    Actualiza el token FCM de un usuario o repartidor y registra el
+    dispositivo para que reciba sus notificaciones.
     
     Args:
         user_id (str): ID del usuario o repartidor.
         role (str): Rol ('user' o 'courier').
         fcm_token (str): Nuevo token FCM.
+        platform (str, optional): Plataforma del dispositivo.
     
     Returns:
         bool: True si se actualizó correctamente, False en caso contrario.
@@ -25,15 +32,18 @@ def update_fcm_token(user_id, role, fcm_token):
         db = get_db()
         
         # Determinar la colección según el rol
-        collection = db.users if role == 'user' else db.couriers
+        collection_name = collection_for_role(role)
         
         # Actualizar token
-        result = collection.update_one(
+        result = db[collection_name].update_one(
             {"_id": user_id},
             {"$set": {"fcm_token": fcm_token, "updated_at": datetime.utcnow()}}
         )
+        forget_document(collection_name, user_id)
+        invalidate_principal(role, user_id)
+        registered = register_device_token(user_id, role, fcm_token, platform)
         
-        if result.modified_count > 0:
+        if result.modified_count > 0 or registered:
             logger.info(f"Token FCM actualizado para {role} {user_id}")
             return True
         else:
@@ -0,0 +1,7 @@
+# Versiones asíncronas (motor) de los servicios usados por la API ASGI
+
+from features.auth.services_async.get_courier_info import get_courier_info
+from features.auth.services_async.get_device_tokens import get_device_tokens
+from features.auth.services_async.get_user_info import get_user_info
+from features.auth.services_async.remove_device_tokens import remove_device_tokens
+from features.auth.services_async.update_courier_availability import update_courier_availability
@@ -0,0 +1,30 @@
+from core.async_database import load_principal_async
+from features.auth.models import Courier
+import logging
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+@traced
+async def get_courier_info(courier_id):
+    """
+    Obtiene la información de un repartidor por su ID.
+    Versión asíncrona de features.auth.services.get_courier_info.
+    
+    Args:
+        courier_id (str): ID del repartidor.
+    
+    Returns:
+        dict: Datos del repartidor o None si no se encuentra.
+    """
+    try:
+        # Buscar repartidor por ID (caché de principales compartida con la API síncrona)
+        courier = await load_principal_async('courier', courier_id)
+        
+        if courier:
+            return Courier.serialize_for_api(courier)
+        return None
+    
+    except Exception as e:
+        logger.error(f"Error al obtener información del repartidor: {str(e)}")
+        return None
@@ -0,0 +1,30 @@
+from core.async_database import load_principal_async
+from features.auth.models import User
+import logging
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+@traced
+async def get_user_info(user_id):
+    """
+    Obtiene la información de un usuario por su ID.
+    Versión asíncrona de features.auth.services.get_user_info.
+    
+    Args:
+        user_id (str): ID del usuario.
+    
+    Returns:
+        dict: Datos del usuario o None si no se encuentra.
+    """
+    try:
+        # Buscar usuario por ID (caché de principales compartida con la API síncrona)
+        user = await load_principal_async('user', user_id)
+        
+        if user:
+            return User.serialize_for_api(user)
+        return None
+    
+    except Exception as e:
+        logger.error(f"Error al obtener información del usuario: {str(e)}")
+        return None
@@ -0,0 +1,48 @@
+import asyncio
+import logging
+from core.async_database import get_async_db
+from core.identity_map import USERS, COURIERS
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+@traced
+async def remove_device_tokens(tokens):
+    """
+    Da de baja dispositivos cuyos tokens FCM ya no son válidos
+    (aplicación desinstalada o token caducado).
+    Versión asíncrona de features.auth.services.remove_device_tokens.
+    
+    Args:
+        tokens (list): Tokens FCM a eliminar.
+    
+    Returns:
+        int: Número de dispositivos eliminados.
+    """
+    if not tokens:
+        return 0
+    
+    try:
+        db = get_async_db()
+        
+        tokens = list(tokens)
+        
+        # Limpiar también el token heredado del documento del propietario
+        result, *_ = await asyncio.gather(
+            db.device_tokens.delete_many({"token": {"$in": tokens}}),
+            *[
+                db[collection_name].update_many(
+                    {"fcm_token": {"$in": tokens}},
+                    {"$set": {"fcm_token": None}}
+                )
+                for collection_name in (USERS, COURIERS)
+            ]
+        )
+        
+        if result.deleted_count:
+            logger.info(f"Dispositivos dados de baja por token no registrado: {result.deleted_count}")
+        return result.deleted_count
+    
+    except Exception as e:
+        logger.error(f"Error al eliminar dispositivos: {str(e)}")
+        return 0
@@ -0,0 +1,41 @@
+from core.async_database import get_async_db, invalidate_principal_async
+import logging
+from bson import ObjectId
+from datetime import datetime
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+@traced
+async def update_courier_availability(courier_id, available):
+    """
+    Actualiza la disponibilidad de un repartidor.
+    Versión asíncrona de features.auth.services.update_courier_availability.
+    
+    Args:
+        courier_id (str): ID del repartidor.
+        available (bool): Estado de disponibilidad.
+    
+    Returns:
+        bool: True si se actualizó correctamente, False en caso contrario.
+    """
+    try:
+        db = get_async_db()
+        
+        # Actualizar disponibilidad
+        result = await db.couriers.update_one(
+            {"_id": ObjectId(courier_id)},
+            {"$set": {"available": available, "updated_at": datetime.utcnow()}}
+        )
+        invalidate_principal_async('courier', courier_id)
+        
+        if result.modified_count > 0:
+            logger.info(f"Disponibilidad actualizada para repartidor {courier_id}: {available}")
+            return True
+        else:
+            logger.warning(f"No se actualizó la disponibilidad para repartidor {courier_id}")
+            return False
+    
+    except Exception as e:
+        logger.error(f"Error al actualizar disponibilidad del repartidor: {str(e)}")
+        return False
@@ -3,10 +3,12 @@ from bson import ObjectId
 from datetime import datetime, timedelta
 from core.database import get_db
 from features.orders.models import Order
+from core.tracing import traced
 
 
 logger = logging.getLogger(__name__)
 
+@traced
 def get_courier_history(courier_id, start_date=None, end_date=None, limit=20, skip=0):
     """
     Obtiene el historial de pedidos de un repartidor en un período de tiempo.
@@ -100,22 +102,9 @@ def get_courier_history(courier_id, start_date=None, end_date=None, limit=20, sk
         
         orders = list(db.orders.aggregate(pipeline))
         
-        # Serializar resultados
+        # ObjectId y fechas los codifica el proveedor JSON de la aplicación
         result = []
         for order in orders:
-            # Convertir ObjectId a string
-            if '_id' in order:
-                order['_id'] = str(order['_id'])
-            if 'user_id' in order and isinstance(order['user_id'], ObjectId):
-                order['user_id'] = str(order['user_id'])
-            if 'courier_id' in order and isinstance(order['courier_id'], ObjectId):
-                order['courier_id'] = str(order['courier_id'])
-            
-            # Formatear fechas
-            for date_field in ['created_at', 'updated_at', 'assigned_at', 'completed_at']:
-                if date_field in order and isinstance(order[date_field], datetime):
-                    order[date_field] = order[date_field].isoformat()
-            
             # Redondear las duraciones a 2 decimales
             for duration_field in ['assignment_duration_minutes', 'delivery_duration_minutes', 'total_duration_minutes']:
                 if duration_field in order:
@@ -1,11 +1,12 @@
 import logging
 from bson import ObjectId
-from datetime import datetime
 from core.database import get_db
 from features.orders.models import Order
+from core.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+@traced
 def get_order_details(order_id, user_id=None, role=None):
     """
     Obtiene los detalles de un pedido específico del historial, con métricas.
@@ -109,19 +110,6 @@ def get_order_details(order_id, user_id=None, role=None):
         # Obtener el pedido (debería ser solo uno)
         order = orders[0]
         
-        # Convertir ObjectId a string
-        if '_id' in order:
-            order['_id'] = str(order['_id'])
-        if 'user_id' in order and isinstance(order['user_id'], ObjectId):
-            order['user_id'] = str(order['user_id'])
-        if 'courier_id' in order and isinstance(order['courier_id'], ObjectId):
-            order['courier_id'] = str(order['courier_id'])
-        
-        # Formatear fechas
-        for date_field in ['created_at', 'updated_at', 'assigned_at', 'completed_at']:
-            if date_field in order and isinstance(order[date_field], datetime):
-                order[date_field] = order[date_field].isoformat()
-        
         # Redondear las métricas de tiempo a 2 decimales
         for time_field in ['wait_time_minutes', 'delivery_time_minutes', 'total_time_minutes']:
             if time_field in order and order[time_field] is not None:
@@ -135,13 +123,13 @@ def get_order_details(order_id, user_id=None, role=None):
         # Serializar notificaciones
         notification_history = []
         for notification in notifications:
-            # Eliminar campos innecesarios y formatear fechas
+            # Eliminar campos innecesarios
             notification_entry = {
                 "title": notification.get("title"),
                 "body": notification.get("body"),
                 "type": notification.get("type"),
                 "role": notification.get("role"),
-                "created_at": notification.get("created_at").isoformat() if isinstance(notification.get("created_at"), datetime) else None
+                "created_at": notification.get("created_at")
             }
             notification_history.append(notification_entry)
         
@@ -0,0 +1,62 @@
+from quart import jsonify, g, request, current_app
+from marshmallow import ValidationError
+import logging
+from core.async_middleware import async_token_required
+from schemas import get_schema_loader
+from schemas.notification_schemas import NotificationQuerySchema
+from features.notifications.services_async import (
+    get_user_notifications,
+    get_courier_notifications
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Versiones asíncronas de los controladores de lectura de
+# features.notifications.controllers.
+
+@async_token_required
+async def get_notifications_controller():
+    """
+    Obtiene las notificaciones del usuario o repartidor autenticado.
+        
+    Returns:
+        Response: Respuesta JSON con la lista de notificaciones.
+    """
+    try:
+        load = get_schema_loader(NotificationQuerySchema, current_app.config.get('SCHEMA_COMPILED_VALIDATORS', True))
+        validated_data = load(request.args.to_dict())
+    except ValidationError as err:
+        return jsonify({
+            "error": "Error de validación",
+            "details": err.messages
+        }), 400
+    
+    # Obtener parámetros validados
+    limit = validated_data.get('limit', 20)
+    skip = validated_data.get('skip', 0)
+    unread_only = validated_data.get('unread_only', False)
+    
+    if g.role == 'user':
+        result = await get_user_notifications(str(g.user_id), limit, skip, unread_only)
+    else:  # courier
+        result = await get_courier_notifications(str(g.user_id), limit, skip, unread_only)
+    
+    return jsonify(result), 200
+
+@async_token_required
+async def get_unread_count_controller():
+    """
+    Obtiene el número de notificaciones no leídas.
+    
+    Returns:
+        Response: Respuesta JSON con el conteo de notificaciones no leídas.
+    """
+    if g.role == 'user':
+        result = await get_user_notifications(str(g.user_id), limit=1, skip=0, unread_only=True)
+    else:  
+        result = await get_courier_notifications(str(g.user_id), limit=1, skip=0, unread_only=True)
+    
+    return jsonify({
+        "unread_count": result["metadata"]["unread"]
+    }), 200
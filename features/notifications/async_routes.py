@@ -0,0 +1,12 @@
+from quart import Blueprint
+from features.notifications.async_controllers import (
+    get_notifications_controller,
+    get_unread_count_controller
+)
+
+# Mismo nombre que el blueprint síncrono, para compartir endpoints y límites
+notifications_async_bp = Blueprint('notifications', __name__)
+
+# Rutas para obtener notificaciones
+notifications_async_bp.route('', methods=['GET'])(get_notifications_controller)
+notifications_async_bp.route('/unread-count', methods=['GET'])(get_unread_count_controller)
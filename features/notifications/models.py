@@ -20,12 +20,15 @@ class Notification:
     TYPE_NEW_ORDER = "new_order"
     TYPE_ORDER_ASSIGNED = "order_assigned"
     TYPE_ORDER_COMPLETED = "order_completed"
+    TYPE_ORDER_PENDING_REMINDER = "order_pending_reminder"
     TYPE_GENERAL = "general"
     
     # Constantes para los roles
     ROLE_USER = "user"
     ROLE_COURIER = "courier"
     
+    __slots__ = ("user_id", "role", "title", "body", "data", "type", "related_id", "read", "created_at")
+    
     def __init__(self, user_id, role, title, body, data=None, notification_type=TYPE_GENERAL, related_id=None):
         """
         Inicializa una nueva notificación.
@@ -73,6 +76,10 @@ class Notification:
         """
         Crea una instancia de Notification a partir de un diccionario.
         
+        Cada atributo se asigna una sola vez, sin pasar por __init__. Admite
+        documentos leídos con proyección: los campos ausentes toman su valor
+        por defecto.
+        
         Args:
             data (dict): Diccionario con datos de la notificación.
             
@@ -82,17 +89,17 @@ class Notification:
         if not data:
             return None
         
-        notification = cls(
-            user_id=data.get("user_id"),
-            role=data.get("role"),
-            title=data.get("title"),
-            body=data.get("body"),
-            data=data.get("data", {}),
-            notification_type=data.get("type", cls.TYPE_GENERAL),
-            related_id=data.get("related_id")
-        )
-        notification.read = data.get("read", False)
-        notification.created_at = data.get("created_at", datetime.utcnow())
+        get = data.get
+        notification = cls.__new__(cls)
+        notification.user_id = get("user_id")
+        notification.role = get("role")
+        notification.title = get("title")
+        notification.body = get("body")
+        notification.data = get("data") or {}
+        notification.type = get("type", cls.TYPE_GENERAL)
+        notification.related_id = get("related_id")
+        notification.read = get("read", False)
+        notification.created_at = get("created_at", datetime.utcnow())
         return notification
     
     @staticmethod
@@ -161,4 +168,114 @@ class Notification:
                 return cls.from_dict(notification_data)
             return None
         except Exception:
-            return None
\ No newline at end of file
+            return None
+
+
+class ScheduledNotification:
+    """
+    Modelo para representar una notificación programada para un envío futuro.
+    
+    Attributes:
+        target (str): Destino ('user', 'courier' o 'all_couriers').
+        target_id (ObjectId): ID del usuario o repartidor (None para difusión).
+        title (str): Título de la notificación.
+        body (str): Contenido/mensaje de la notificación.
+        data (dict): Datos adicionales para la notificación.
+        type (str): Tipo de notificación.
+        related_id (str): ID relacionado (ej. ID de pedido).
+        send_at (datetime): Fecha y hora (UTC) en que debe enviarse.
+        required_order_status (str): Si se indica, solo se envía si el pedido
+            `related_id` sigue en ese estado al vencer.
+        status (str): Estado de la programación.
+        created_at (datetime): Fecha y hora de creación.
+        fired_at (datetime): Fecha y hora en que se procesó.
+    """
+    # Constantes para los destinos
+    TARGET_USER = "user"
+    TARGET_COURIER = "courier"
+    TARGET_ALL_COURIERS = "all_couriers"
+    
+    # Constantes para los estados
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_SKIPPED = "skipped"
+    STATUS_CANCELLED = "cancelled"
+    
+    def __init__(self, target, title, body, send_at, target_id=None, data=None,
+                 notification_type=Notification.TYPE_GENERAL, related_id=None, required_order_status=None):
+        """
+        Inicializa una nueva notificación programada.
+        
+        Args:
+            target (str): Destino ('user', 'courier' o 'all_couriers').
+            title (str): Título de la notificación.
+            body (str): Contenido/mensaje de la notificación.
+            send_at (datetime): Fecha y hora (UTC) de envío.
+            target_id (ObjectId, optional): ID del destinatario.
+            data (dict, optional): Datos adicionales para la notificación.
+            notification_type (str, optional): Tipo de notificación.
+            related_id (str, optional): ID relacionado (ej. ID de pedido).
+            required_order_status (str, optional): Estado que debe tener el pedido relacionado.
+        """
+        self.target = target
+        self.target_id = target_id
+        self.title = title
+        self.body = body
+        self.data = data or {}
+        self.type = notification_type
+        self.related_id = related_id
+        self.send_at = send_at
+        self.required_order_status = required_order_status
+        self.status = self.STATUS_PENDING
+        self.created_at = datetime.utcnow()
+        self.fired_at = None
+    
+    def to_dict(self):
+        """
+        Convierte el objeto a un diccionario para almacenamiento en MongoDB.
+        
+        Returns:
+            dict: Representación de la notificación programada como diccionario.
+        """
+        return {
+            "target": self.target,
+            "target_id": self.target_id,
+            "title": self.title,
+            "body": self.body,
+            "data": self.data,
+            "type": self.type,
+            "related_id": self.related_id,
+            "send_at": self.send_at,
+            "required_order_status": self.required_order_status,
+            "status": self.status,
+            "created_at": self.created_at,
+            "fired_at": self.fired_at
+        }
+    
+    @staticmethod
+    def serialize_for_api(schedule_data):
+        """
+        Serializa los datos de la notificación programada para enviar al cliente.
+        
+        Args:
+            schedule_data (dict): Datos de la notificación programada desde MongoDB.
+            
+        Returns:
+            dict: Datos serializados para la API.
+        """
+        if not schedule_data:
+            return None
+        
+        serialized = schedule_data.copy()
+        
+        for id_field in ['_id', 'target_id']:
+            if isinstance(serialized.get(id_field), ObjectId):
+                serialized[id_field] = str(serialized[id_field])
+        
+        for date_field in ['send_at', 'created_at', 'fired_at', 'locked_at']:
+            if isinstance(serialized.get(date_field), datetime):
+                serialized[date_field] = serialized[date_field].isoformat()
+        
+        return serialized
@@ -1,9 +1,13 @@
 
 
+from features.notifications.services.schedule_notification import schedule_notification
+from features.notifications.services.cancel_scheduled_notification import cancel_scheduled_notification
+from features.notifications.services.push_to_devices import push_to_devices
 from features.notifications.services.send_user_notification import send_user_notification
 from features.notifications.services.send_courier_notification import send_courier_notification
 from features.notifications.services.send_notification_to_all_couriers import send_notification_to_all_couriers
 from features.notifications.services.get_user_notifications import get_user_notifications
 from features.notifications.services.get_courier_notifications import get_courier_notifications
 from features.notifications.services.mark_notification_as_read import mark_notification_as_read
-from features.notifications.services.mark_all_notifications_as_read import mark_all_notifications_as_read
\ No newline at end of file
+from features.notifications.services.mark_all_notifications_as_read import mark_all_notifications_as_read
+from features.notifications.services.dispatch_scheduled_notification import dispatch_scheduled_notification
\ No newline at end of file
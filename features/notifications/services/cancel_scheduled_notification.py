@@ -0,0 +1,44 @@
+import logging
+from bson import ObjectId
+from datetime import datetime
+from core.database import get_db
+from core.scheduler import get_scheduler
+from features.notifications.models import ScheduledNotification
+from core.tracing import traced
+
+
+logger = logging.getLogger(__name__)
+
+@traced
+def cancel_scheduled_notification(schedule_id):
+    """
+    Cancela una notificación programada que aún no se ha enviado.
+    
+    Args:
+        schedule_id (str): ID de la notificación programada.
+    
+    Returns:
+        bool: True si se canceló, False en caso contrario.
+    """
+    try:
+        db = get_db()
+        
+        result = db.scheduled_notifications.update_one(
+            {"_id": ObjectId(schedule_id), "status": ScheduledNotification.STATUS_PENDING},
+            {"$set": {"status": ScheduledNotification.STATUS_CANCELLED, "fired_at": datetime.utcnow()}}
+        )
+        
+        if result.modified_count == 0:
+            logger.warning(f"Notificación programada {schedule_id} no encontrada o ya procesada")
+            return False
+        
+        scheduler = get_scheduler()
+        if scheduler is not None:
+            scheduler.cancel(schedule_id)
+        
+        logger.info(f"Notificación programada {schedule_id} cancelada")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Error al cancelar notificación programada: {str(e)}")
+        return False
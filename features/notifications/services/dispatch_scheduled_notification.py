@@ -0,0 +1,58 @@
+import logging
+from bson import ObjectId
+from core.database import get_db
+from features.notifications.models import ScheduledNotification
+from features.notifications.services.send_user_notification import send_user_notification
+from features.notifications.services.send_courier_notification import send_courier_notification
+from features.notifications.services.send_notification_to_all_couriers import send_notification_to_all_couriers
+from core.tracing import traced
+
+
+logger = logging.getLogger(__name__)
+
+@traced
+def dispatch_scheduled_notification(schedule):
+    """
+    Envía una notificación programada que ya ha vencido.
+    
+    Lo invoca el planificador de notificaciones después de reclamar el documento.
+    
+    Args:
+        schedule (dict): Documento de la notificación programada.
+    
+    Returns:
+        str: Estado final ('sent', 'failed' o 'skipped').
+    """
+    related_id = schedule.get("related_id")
+    required_status = schedule.get("required_order_status")
+    
+    # Comprobar que el pedido relacionado sigue en el estado esperado
+    if required_status and related_id:
+        db = get_db()
+        order = db.orders.find_one({"_id": ObjectId(related_id)}, {"status": 1})
+        if not order or order.get("status") != required_status:
+            logger.info(f"Notificación programada {schedule['_id']} omitida: el pedido {related_id} ya no está {required_status}")
+            return ScheduledNotification.STATUS_SKIPPED
+    
+    target = schedule.get("target")
+    args = (
+        schedule.get("title"),
+        schedule.get("body"),
+        dict(schedule.get("data") or {}),
+    )
+    kwargs = {
+        "notification_type": schedule.get("type"),
+        "related_id": related_id
+    }
+    
+    if target == ScheduledNotification.TARGET_USER:
+        result = send_user_notification(str(schedule["target_id"]), *args, **kwargs)
+    elif target == ScheduledNotification.TARGET_COURIER:
+        result = send_courier_notification(str(schedule["target_id"]), *args, **kwargs)
+    elif target == ScheduledNotification.TARGET_ALL_COURIERS:
+        result = send_notification_to_all_couriers(*args, **kwargs)
+    else:
+        logger.error(f"Destino de notificación programada no válido: {target}")
+        return ScheduledNotification.STATUS_FAILED
+    
+    return ScheduledNotification.STATUS_SENT if result else ScheduledNotification.STATUS_FAILED
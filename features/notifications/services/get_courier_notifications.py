@@ -2,9 +2,11 @@ import logging
 from bson import ObjectId
 from core.database import get_db
 from features.notifications.models import Notification
+from core.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+@traced
 def get_courier_notifications(courier_id, limit=20, skip=0, unread_only=False):
     """
     Obtiene las notificaciones de un repartidor.
@@ -35,8 +37,9 @@ def get_courier_notifications(courier_id, limit=20, skip=0, unread_only=False):
         
         notifications = db.notifications.find(query).sort("created_at", -1).skip(skip).limit(limit)
         
-   
-        result = [Notification.serialize_for_api(notification) for notification in notifications]
+        # Sin copiar ni convertir cada documento: el proveedor JSON de la
+        # aplicación codifica ObjectId y fechas al responder
+        result = list(notifications)
         
     
         total_count = db.notifications.count_documents(query)
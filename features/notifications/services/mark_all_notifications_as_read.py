@@ -2,10 +2,12 @@ import logging
 from bson import ObjectId
 from core.database import get_db
 from datetime import datetime
+from core.tracing import traced
 
 
 logger = logging.getLogger(__name__)
 
+@traced
 def mark_all_notifications_as_read(user_id, role):
     """
     Marca todas las notificaciones de un usuario o repartidor como leídas.
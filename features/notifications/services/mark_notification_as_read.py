@@ -1,10 +1,12 @@
 import logging
 from bson import ObjectId
 from core.database import get_db
+from core.tracing import traced
 
 
 logger = logging.getLogger(__name__)
 
+@traced
 def mark_notification_as_read(notification_id, user_id, role):
     """
     Marca una notificación como leída.
@@ -0,0 +1,43 @@
+import logging
+from core.firebase_admin import send_multicast_notification, send_notifications_individually, get_unregistered_tokens, merge_send_results, messaging
+from features.auth.services.remove_device_tokens import remove_device_tokens
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+@traced
+def push_to_devices(tokens, title, body, data=None):
+    """
+    Envía una notificación push a un conjunto de dispositivos en un solo
+    envío multicast y da de baja los tokens que FCM ya no reconoce.
+    
+    Args:
+        tokens (list): Tokens FCM de los dispositivos destino (sin duplicados).
+        title (str): Título de la notificación.
+        body (str): Cuerpo de la notificación.
+        data (dict, optional): Datos adicionales.
+    
+    Returns:
+        messaging.BatchResponse: Respuesta del envío o None si no se pudo enviar.
+    """
+    # Se filtran aquí y no en el envío, para que la respuesta quede
+    # alineada con la lista que se usa al dar de baja los tokens
+    tokens = [token for token in (tokens or []) if token and isinstance(token, str)]
+    if not tokens:
+        return None
+    
+    try:
+        response = send_multicast_notification(tokens, title, body, data)
+    except Exception as e:
+        # Los lotes ya entregados no se reenvían
+        delivered = getattr(e, 'responses', [])
+        logger.warning(f"Error al enviar notificación multicast: {str(e)}")
+        logger.info(f"Intentando enviar individualmente los {len(tokens) - len(delivered)} tokens restantes...")
+        response = send_notifications_individually(tokens[len(delivered):], title, body, data)
+        if delivered:
+            response = merge_send_results(messaging.BatchResponse(delivered), response)
+    
+    if response:
+        remove_device_tokens(get_unregistered_tokens(tokens, response))
+    
+    return response
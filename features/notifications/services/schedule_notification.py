@@ -0,0 +1,72 @@
+import logging
+from bson import ObjectId
+from core.database import get_db
+from core.scheduler import get_scheduler
+from core.utils import to_utc_naive
+from features.notifications.models import Notification, ScheduledNotification
+from core.tracing import traced
+
+
+logger = logging.getLogger(__name__)
+
+@traced
+def schedule_notification(target, title, body, send_at, target_id=None, data=None,
+                          notification_type="general", related_id=None, required_order_status=None):
+    """
+    Programa una notificación para enviarse en una fecha futura.
+    
+    Args:
+        target (str): Destino ('user', 'courier' o 'all_couriers').
+        title (str): Título de la notificación.
+        body (str): Contenido de la notificación.
+        send_at (datetime|str): Fecha y hora de envío (UTC si no tiene zona horaria).
+        target_id (str, optional): ID del usuario o repartidor destinatario.
+        data (dict, optional): Datos adicionales.
+        notification_type (str, optional): Tipo de notificación.
+        related_id (str, optional): ID relacionado (ej. ID de pedido).
+        required_order_status (str, optional): Solo enviar si el pedido `related_id`
+            sigue en este estado al vencer.
+    
+    Returns:
+        dict: Datos de la notificación programada o None si hay error.
+    """
+    try:
+        db = get_db()
+        
+        if target not in (ScheduledNotification.TARGET_USER,
+                          ScheduledNotification.TARGET_COURIER,
+                          ScheduledNotification.TARGET_ALL_COURIERS):
+            logger.error(f"Destino de notificación programada no válido: {target}")
+            return None
+        
+        if target != ScheduledNotification.TARGET_ALL_COURIERS and not target_id:
+            logger.error(f"Notificación programada sin destinatario para {target}")
+            return None
+        
+        schedule = ScheduledNotification(
+            target=target,
+            target_id=ObjectId(target_id) if target_id else None,
+            title=title,
+            body=body,
+            send_at=to_utc_naive(send_at),
+            data=data,
+            notification_type=notification_type or Notification.TYPE_GENERAL,
+            related_id=str(related_id) if related_id else None,
+            required_order_status=required_order_status
+        )
+        schedule_dict = schedule.to_dict()
+        
+        result = db.scheduled_notifications.insert_one(schedule_dict)
+        schedule_dict['_id'] = result.inserted_id
+        
+        # Si vence dentro de la ventana cargada, se registra ya en la rueda
+        scheduler = get_scheduler()
+        if scheduler is not None:
+            scheduler.add(result.inserted_id, schedule.send_at)
+        
+        logger.info(f"Notificación programada {result.inserted_id} para {target} a las {schedule.send_at.isoformat()}")
+        return ScheduledNotification.serialize_for_api(schedule_dict)
+    
+    except Exception as e:
+        logger.error(f"Error al programar notificación: {str(e)}")
+        return None
@@ -1,13 +1,20 @@
 import logging
+from datetime import datetime
 from bson import ObjectId
 from core.database import get_db
-from features.notifications.models import Notification
-from core.firebase_admin import send_notification
+from core.identity_map import load_document, COURIERS
+from features.notifications.models import Notification, ScheduledNotification
+from features.notifications.services.schedule_notification import schedule_notification
+from features.notifications.services.push_to_devices import push_to_devices
+from features.auth.services.get_device_tokens import get_device_tokens
+from core.utils import to_utc_naive
+from core.tracing import traced
 
 
 logger = logging.getLogger(__name__)
 
-def send_courier_notification(courier_id, title, body, data=None, notification_type="general", related_id=None):
+@traced
+def send_courier_notification(courier_id, title, body, data=None, notification_type="general", related_id=None, send_at=None):
     """
     Envía una notificación a un repartidor y la guarda en la base de datos.
     
@@ -18,25 +25,44 @@ def send_courier_notification(courier_id, title, body, data=None, notification_t
         data (dict, optional): Datos adicionales.
         notification_type (str, optional): Tipo de notificación.
         related_id (str, optional): ID relacionado (ej. ID de pedido).
+        send_at (datetime, optional): Si es una fecha futura, la notificación se
+            programa en lugar de enviarse inmediatamente.
     
     Returns:
-        dict: Datos de la notificación guardada o None si hay error.
+        dict: Datos de la notificación guardada (o de la notificación programada
+            si se indicó send_at) o None si hay error.
     """
     try:
+        if send_at is not None and to_utc_naive(send_at) > datetime.utcnow():
+            return schedule_notification(
+                ScheduledNotification.TARGET_COURIER,
+                title,
+                body,
+                send_at,
+                target_id=courier_id,
+                data=data,
+                notification_type=notification_type,
+                related_id=related_id
+            )
+        
         db = get_db()
         
   
         courier_id_obj = ObjectId(courier_id)
         
-        # Obtener token FCM del repartidor
-        courier = db.couriers.find_one({"_id": courier_id_obj})
+        # Obtener el repartidor y los tokens de todos sus dispositivos
+        courier = load_document(COURIERS, courier_id_obj)
         
         if not courier:
             logger.error(f"Repartidor no encontrado: {courier_id}")
             return None
         
 
-        if not courier.get("fcm_token"):
+        # Incluye el token del documento para los que aún no tienen dispositivos registrados
+        tokens = get_device_tokens('courier', [courier_id_obj])[courier_id_obj] + [courier.get("fcm_token")]
+        tokens = [token for token in dict.fromkeys(tokens) if token]
+        
+        if not tokens:
             logger.error(f"Repartidor sin token FCM: {courier_id}")
             return None
         
@@ -46,15 +72,10 @@ def send_courier_notification(courier_id, title, body, data=None, notification_t
         if related_id:
             notification_data["related_id"] = related_id
         
-        # Enviar notificación push a través de Firebase
-        fcm_response = send_notification(
-            courier["fcm_token"],
-            title,
-            body,
-            notification_data
-        )
+        # Enviar notificación push a todos sus dispositivos
+        fcm_response = push_to_devices(tokens, title, body, notification_data)
         
-        if not fcm_response:
+        if not fcm_response or fcm_response.success_count == 0:
             logger.warning(f"No se pudo enviar notificación push al repartidor: {courier_id}")
 
         
@@ -1,45 +1,56 @@
 import logging
 from datetime import datetime
 from core.database import get_db
-from features.notifications.models import Notification
-from core.firebase_admin import send_multicast_notification, send_notifications_individually
+from features.notifications.models import Notification, ScheduledNotification
+from features.notifications.services.schedule_notification import schedule_notification
+from features.notifications.services.push_to_devices import push_to_devices
+from features.auth.services.get_device_tokens import get_device_tokens
+from core.utils import to_utc_naive
+from core.presence import online_courier_filter
+from core.tracing import traced
+from core.single_flight import coalesce
 
 logger = logging.getLogger(__name__)
 
-def send_notification_to_all_couriers(title, body, data=None, notification_type="general", related_id=None):
+@traced
+def send_notification_to_all_couriers(title, body, data=None, notification_type="general", related_id=None, send_at=None):
     """
     Envía una notificación a todos los repartidores disponibles.
     
+    Si COURIER_PRESENCE_WINDOW_SECONDS es mayor que 0, solo se incluyen los
+    repartidores que enviaron un heartbeat dentro de esa ventana.
+    
     Args:
         title (str): Título de la notificación.
         body (str): Contenido de la notificación.
         data (dict, optional): Datos adicionales.
         notification_type (str, optional): Tipo de notificación.
         related_id (str, optional): ID relacionado (ej. ID de pedido).
+        send_at (datetime, optional): Si es una fecha futura, la notificación se
+            programa en lugar de enviarse inmediatamente.
     
     Returns:
-        int: Número de repartidores notificados.
+        int: Número de repartidores notificados, o dict con la notificación
+            programada si se indicó send_at.
     """
     try:
-        db = get_db()
-        
-        # Obtener todos los repartidores disponibles con token FCM válido
-        couriers = list(db.couriers.find({
-            "available": True,
-            "active": True,
-            "fcm_token": {"$ne": None}
-        }))
+        if send_at is not None and to_utc_naive(send_at) > datetime.utcnow():
+            return schedule_notification(
+                ScheduledNotification.TARGET_ALL_COURIERS,
+                title,
+                body,
+                send_at,
+                data=data,
+                notification_type=notification_type,
+                related_id=related_id
+            )
         
-        # Filtrar repartidores y obtener tokens e IDs
-        courier_tokens = []
-        courier_ids = []
+        db = get_db()
         
-        for courier in couriers:
-            if courier.get("fcm_token"):
-                courier_tokens.append(courier.get("fcm_token"))
-                courier_ids.append(courier["_id"])
+        # Los pedidos creados a la vez comparten la consulta de destinatarios
+        courier_tokens, courier_ids = coalesce('couriers.available_tokens', _load_available_courier_tokens)
         
-        logger.info(f"Found {len(courier_tokens)} available couriers with FCM tokens")
+        logger.info(f"Found {len(courier_ids)} available couriers with {len(courier_tokens)} FCM tokens")
         
         if not courier_tokens:
             logger.warning("No hay repartidores disponibles con token FCM válido")
@@ -51,14 +62,8 @@ def send_notification_to_all_couriers(title, body, data=None, notification_type=
         if related_id:
             notification_data["related_id"] = str(related_id)
         
-        # Primero intentamos con multicast
-        response = None
-        try:
-            response = send_multicast_notification(courier_tokens, title, body, notification_data)
-        except Exception as e:
-            logger.warning(f"Error al enviar notificación multicast: {str(e)}")
-            logger.info("Intentando enviar notificaciones individualmente...")
-            response = send_notifications_individually(courier_tokens, title, body, notification_data)
+        # Un único envío multicast a todos los dispositivos
+        response = push_to_devices(courier_tokens, title, body, notification_data)
             
         if not response:
             logger.warning("Error al enviar notificaciones")
@@ -87,9 +92,42 @@ def send_notification_to_all_couriers(title, body, data=None, notification_type=
             db.notifications.insert_many(notifications)
         
         success_count = getattr(response, 'success_count', 0)
-        logger.info(f"Notificación enviada correctamente a {success_count} repartidores")
+        logger.info(f"Notificación enviada correctamente a {success_count} dispositivos")
         return success_count
     
     except Exception as e:
         logger.error(f"Error al enviar notificación a todos los repartidores: {str(e)}")
-        return 0
\ No newline at end of file
+        return 0
+
+def _load_available_courier_tokens():
+    db = get_db()
+    
+    # Obtener los repartidores disponibles con actividad reciente
+    couriers = list(db.couriers.find(
+        {"available": True, "active": True, **online_courier_filter()},
+        {"fcm_token": 1}
+    ))
+    
+    # Tokens de todos sus dispositivos con una sola consulta
+    devices = get_device_tokens('courier', [courier["_id"] for courier in couriers])
+    
+    # Filtrar repartidores y obtener tokens e IDs
+    courier_tokens = []
+    courier_ids = []
+    
+    seen_tokens = set()
+    
+    for courier in couriers:
+        tokens = [token for token in devices[courier["_id"]] + [courier.get("fcm_token")] if token]
+        if not tokens:
+            continue
+        # Todos reciben la notificación en la base de datos, aunque sus
+        # dispositivos ya figuren en otra cuenta
+        courier_ids.append(courier["_id"])
+        # Un dispositivo recibe un solo push aunque figure en varias cuentas
+        for token in tokens:
+            if token not in seen_tokens:
+                seen_tokens.add(token)
+                courier_tokens.append(token)
+    
+    return courier_tokens, courier_ids
@@ -1,13 +1,20 @@
 import logging
+from datetime import datetime
 from bson import ObjectId
 from core.database import get_db
-from features.notifications.models import Notification
-from core.firebase_admin import send_notification
+from core.identity_map import load_document, USERS
+from features.notifications.models import Notification, ScheduledNotification
+from features.notifications.services.schedule_notification import schedule_notification
+from features.notifications.services.push_to_devices import push_to_devices
+from features.auth.services.get_device_tokens import get_device_tokens
+from core.utils import to_utc_naive
+from core.tracing import traced
 
 
 logger = logging.getLogger(__name__)
 
-def send_user_notification(user_id, title, body, data=None, notification_type="general", related_id=None):
+@traced
+def send_user_notification(user_id, title, body, data=None, notification_type="general", related_id=None, send_at=None):
     """
     Envía una notificación a un usuario y la guarda en la base de datos.
     
@@ -18,25 +25,44 @@ def send_user_notification(user_id, title, body, data=None, notification_type="g
         data (dict, optional): Datos adicionales.
         notification_type (str, optional): Tipo de notificación.
         related_id (str, optional): ID relacionado (ej. ID de pedido).
+        send_at (datetime, optional): Si es una fecha futura, la notificación se
+            programa en lugar de enviarse inmediatamente.
     
     Returns:
-        dict: Datos de la notificación guardada o None si hay error.
+        dict: Datos de la notificación guardada (o de la notificación programada
+            si se indicó send_at) o None si hay error.
     """
     try:
+        if send_at is not None and to_utc_naive(send_at) > datetime.utcnow():
+            return schedule_notification(
+                ScheduledNotification.TARGET_USER,
+                title,
+                body,
+                send_at,
+                target_id=user_id,
+                data=data,
+                notification_type=notification_type,
+                related_id=related_id
+            )
+        
         db = get_db()
         
     
         user_id_obj = ObjectId(user_id)
         
-        # Obtener token FCM del usuario
-        user = db.users.find_one({"_id": user_id_obj})
+        # Obtener el usuario y los tokens de todos sus dispositivos
+        user = load_document(USERS, user_id_obj)
         
         if not user:
             logger.error(f"Usuario no encontrado: {user_id}")
             return None
         
        
-        if not user.get("fcm_token"):
+        # Incluye el token del documento para los que aún no tienen dispositivos registrados
+        tokens = get_device_tokens('user', [user_id_obj])[user_id_obj] + [user.get("fcm_token")]
+        tokens = [token for token in dict.fromkeys(tokens) if token]
+        
+        if not tokens:
             logger.error(f"Usuario sin token FCM: {user_id}")
             return None
         
@@ -46,15 +72,10 @@ def send_user_notification(user_id, title, body, data=None, notification_type="g
         if related_id:
             notification_data["related_id"] = related_id
         
-        # Enviar notificación push a través de Firebase
-        fcm_response = send_notification(
-            user["fcm_token"],
-            title,
-            body,
-            notification_data
-        )
+        # Enviar notificación push a todos sus dispositivos
+        fcm_response = push_to_devices(tokens, title, body, notification_data)
         
-        if not fcm_response:
+        if not fcm_response or fcm_response.success_count == 0:
             logger.warning(f"No se pudo enviar notificación push al usuario: {user_id}")
             
         notification = Notification(
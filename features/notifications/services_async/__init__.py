@@ -0,0 +1,6 @@
+# Versiones asíncronas (motor) de los servicios usados por la API ASGI
+
+from features.notifications.services_async.push_to_devices import push_to_devices
+from features.notifications.services_async.send_user_notification import send_user_notification
+from features.notifications.services_async.get_user_notifications import get_user_notifications
+from features.notifications.services_async.get_courier_notifications import get_courier_notifications
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from bson import ObjectId
+from core.async_database import get_async_db
+from features.notifications.models import Notification
+from core.tracing import traced
+
+
+logger = logging.getLogger(__name__)
+
+@traced
+async def get_user_notifications(user_id, limit=20, skip=0, unread_only=False):
+    """
+    Obtiene las notificaciones de un usuario.
+    Versión asíncrona de features.notifications.services.get_user_notifications.
+    
+    Args:
+        user_id (str): ID del usuario.
+        limit (int, optional): Límite de resultados. Por defecto 20.
+        skip (int, optional): Número de resultados a saltar (para paginación).
+        unread_only (bool, optional): Solo notificaciones no leídas.
+    
+    Returns:
+        dict: Diccionario con lista de notificaciones y metadatos de paginación.
+    """
+    try:
+        db = get_async_db()
+        
+        user_id_obj = ObjectId(user_id)
+        
+        query = {
+            "user_id": user_id_obj,
+            "role": Notification.ROLE_USER
+        }
+        
+        if unread_only:
+            query["read"] = False
+        
+        # La página y los dos conteos se consultan a la vez
+        notifications, total_count, unread_count = await asyncio.gather(
+            db.notifications.find(query).sort("created_at", -1).skip(skip).limit(limit).to_list(length=None),
+            db.notifications.count_documents(query),
+            db.notifications.count_documents({
+                "user_id": user_id_obj,
+                "role": Notification.ROLE_USER,
+                "read": False
+            })
+        )
+        
+        # Construir respuesta con metadatos
+        return {
+            "notifications": [Notification.serialize_for_api(notification) for notification in notifications],
+            "metadata": {
+                "total": total_count,
+                "unread": unread_count,
+                "limit": limit,
+                "skip": skip,
+                "has_more": (skip + limit) < total_count
+            }
+        }
+    
+    except Exception as e:
+        logger.error(f"Error al obtener notificaciones del usuario: {str(e)}")
+        return {
+            "notifications": [],
+            "metadata": {
+                "total": 0,
+                "unread": 0,
+                "limit": limit,
+                "skip": skip,
+                "has_more": False
+            }
+        }
@@ -0,0 +1,57 @@
+import asyncio
+import logging
+from quart import current_app
+from core.firebase_admin import send_multicast_notification_async, send_notifications_individually, get_unregistered_tokens, merge_send_results, messaging
+from core.async_middleware import sync_context
+from features.auth.services_async.remove_device_tokens import remove_device_tokens
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+@traced
+async def push_to_devices(tokens, title, body, data=None):
+    """
+    Envía una notificación push a un conjunto de dispositivos en un solo
+    envío multicast y da de baja los tokens que FCM ya no reconoce.
+    Versión asíncrona de features.notifications.services.push_to_devices.
+    
+    Args:
+        tokens (list): Tokens FCM de los dispositivos destino (sin duplicados).
+        title (str): Título de la notificación.
+        body (str): Cuerpo de la notificación.
+        data (dict, optional): Datos adicionales.
+    
+    Returns:
+        messaging.BatchResponse: Respuesta del envío o None si no se pudo enviar.
+    """
+    # Se filtran aquí y no en el envío, para que la respuesta quede
+    # alineada con la lista que se usa al dar de baja los tokens
+    tokens = [token for token in (tokens or []) if token and isinstance(token, str)]
+    if not tokens:
+        return None
+    
+    try:
+        # get_firebase_app lee la configuración de la aplicación Flask
+        with sync_context():
+            response = await send_multicast_notification_async(tokens, title, body, data)
+    except Exception as e:
+        # Los lotes ya entregados no se reenvían
+        delivered = getattr(e, 'responses', [])
+        logger.warning(f"Error al enviar notificación multicast: {str(e)}")
+        logger.info(f"Intentando enviar individualmente los {len(tokens) - len(delivered)} tokens restantes...")
+        
+        # El hilo no hereda el contexto: se abre uno propio
+        flask_app = current_app.extensions['flask_app']
+        
+        def send_individually():
+            with flask_app.app_context():
+                return send_notifications_individually(tokens[len(delivered):], title, body, data)
+        
+        response = await asyncio.to_thread(send_individually)
+        if delivered:
+            response = merge_send_results(messaging.BatchResponse(delivered), response)
+    
+    if response:
+        await remove_device_tokens(get_unregistered_tokens(tokens, response))
+    
+    return response
@@ -0,0 +1,81 @@
+import logging
+from bson import ObjectId
+from core.async_database import get_async_db
+from core.identity_map import USERS
+from features.notifications.models import Notification
+from features.notifications.services_async.push_to_devices import push_to_devices
+from features.auth.services_async.get_device_tokens import get_device_tokens
+from core.tracing import traced
+
+
+logger = logging.getLogger(__name__)
+
+@traced
+async def send_user_notification(user_id, title, body, data=None, notification_type="general", related_id=None):
+    """
+    Envía una notificación a un usuario y la guarda en la base de datos.
+    Versión asíncrona de features.notifications.services.send_user_notification,
+    sin envío diferido (send_at).
+    
+    Args:
+        user_id (str): ID del usuario.
+        title (str): Título de la notificación.
+        body (str): Contenido de la notificación.
+        data (dict, optional): Datos adicionales.
+        notification_type (str, optional): Tipo de notificación.
+        related_id (str, optional): ID relacionado (ej. ID de pedido).
+    
+    Returns:
+        dict: Datos de la notificación guardada o None si hay error.
+    """
+    try:
+        db = get_async_db()
+        
+        user_id_obj = ObjectId(user_id)
+        
+        # Obtener el usuario y los tokens de todos sus dispositivos
+        user = await db[USERS].find_one({"_id": user_id_obj}, {"fcm_token": 1})
+        
+        if not user:
+            logger.error(f"Usuario no encontrado: {user_id}")
+            return None
+        
+        # Incluye el token del documento para los que aún no tienen dispositivos registrados
+        tokens = (await get_device_tokens('user', [user_id_obj]))[user_id_obj] + [user.get("fcm_token")]
+        tokens = [token for token in dict.fromkeys(tokens) if token]
+        
+        if not tokens:
+            logger.error(f"Usuario sin token FCM: {user_id}")
+            return None
+        
+        notification_data = data or {}
+        notification_data["type"] = notification_type
+        if related_id:
+            notification_data["related_id"] = related_id
+        
+        # Enviar notificación push a todos sus dispositivos
+        fcm_response = await push_to_devices(tokens, title, body, notification_data)
+        
+        if not fcm_response or fcm_response.success_count == 0:
+            logger.warning(f"No se pudo enviar notificación push al usuario: {user_id}")
+        
+        notification = Notification(
+            user_id=user_id_obj,
+            role=Notification.ROLE_USER,
+            title=title,
+            body=body,
+            data=notification_data,
+            notification_type=notification_type,
+            related_id=related_id
+        )
+        
+        # Guardar en la base de datos; el documento insertado ya lleva su _id
+        notification_doc = notification.to_dict()
+        await db.notifications.insert_one(notification_doc)
+        
+        logger.info(f"Notificación enviada y guardada para el usuario {user_id}: {notification_doc['_id']}")
+        return Notification.serialize_for_api(notification_doc)
+    
+    except Exception as e:
+        logger.error(f"Error al enviar notificación al usuario: {str(e)}")
+        return None
@@ -0,0 +1,120 @@
+from quart import jsonify, g, request
+import logging
+from core.async_middleware import async_token_required
+from features.orders.services_async import (
+    assign_order,
+    get_order,
+    get_user_orders,
+    get_courier_orders,
+    get_pending_orders
+)
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Versiones asíncronas de los controladores de features.orders.controllers,
+# con las mismas comprobaciones de permisos y respuestas.
+
+@async_token_required
+async def get_order_controller(order_id):
+    """
+    Obtiene los detalles de un pedido.
+    
+    Args:
+        order_id (str): ID del pedido.
+        
+    Returns:
+        Response: Respuesta JSON con los detalles del pedido.
+    """
+    result = await get_order(order_id)
+    
+    if not result:
+        return jsonify({
+            "error": "Pedido no encontrado"
+        }), 404
+    
+    # Verificar si el usuario tiene acceso al pedido
+    if g.role == 'user' and str(result.get('user_id')) != str(g.user_id):
+        return jsonify({
+            "error": "No tienes permiso para ver este pedido"
+        }), 403
+    
+    # Si es repartidor, solo puede ver sus pedidos asignados o pedidos pendientes
+    if g.role == 'courier' and result.get('status') != 'pending' and str(result.get('courier_id', '')) != str(g.user_id):
+        return jsonify({
+            "error": "No tienes permiso para ver este pedido"
+        }), 403
+    
+    return jsonify({
+        "order": result
+    }), 200
+
+@async_token_required
+async def get_orders_controller():
+    """
+    Obtiene los pedidos del usuario o repartidor actual.
+    
+    Returns:
+        Response: Respuesta JSON con la lista de pedidos.
+    """
+    # Obtener parámetros de consulta
+    status = request.args.get('status')
+    limit = int(request.args.get('limit', 10))
+    skip = int(request.args.get('skip', 0))
+    
+    if g.role == 'user':
+        result = await get_user_orders(str(g.user_id), status, limit, skip)
+    else:  # courier
+        result = await get_courier_orders(str(g.user_id), status, limit, skip)
+    
+    return jsonify(result), 200
+
+@async_token_required
+async def get_pending_orders_controller():
+    """
+    Obtiene los pedidos pendientes (solo para repartidores).
+    
+    Returns:
+        Response: Respuesta JSON con la lista de pedidos pendientes.
+    """
+    # Solo los repartidores pueden ver pedidos pendientes
+    if g.role != 'courier':
+        return jsonify({
+            "error": "Solo los repartidores pueden ver pedidos pendientes"
+        }), 403
+    
+    # Obtener parámetros de consulta
+    limit = int(request.args.get('limit', 20))
+    skip = int(request.args.get('skip', 0))
+    
+    result = await get_pending_orders(limit, skip)
+    return jsonify(result), 200
+
+@async_token_required
+async def assign_order_controller(order_id):
+    """
+    Asigna un pedido a un repartidor.
+    
+    Args:
+        order_id (str): ID del pedido a asignar.
+        
+    Returns:
+        Response: Respuesta JSON con el resultado.
+    """
+    # Solo los repartidores pueden tomar pedidos
+    if g.role != 'courier':
+        return jsonify({
+            "error": "Solo los repartidores pueden tomar pedidos"
+        }), 403
+    
+    result = await assign_order(order_id, str(g.user_id))
+    
+    if result:
+        return jsonify({
+            "message": "Pedido asignado correctamente",
+            "order": result
+        }), 200
+    else:
+        return jsonify({
+            "error": "No se pudo asignar el pedido"
+        }), 400
@@ -0,0 +1,21 @@
+from quart import Blueprint
+from features.orders.async_controllers import (
+    get_order_controller,
+    get_orders_controller,
+    get_pending_orders_controller,
+    assign_order_controller
+)
+
+
+# Mismo nombre que el blueprint síncrono, para compartir endpoints y límites
+orders_async_bp = Blueprint('orders', __name__)
+
+# Rutas para listar pedidos
+orders_async_bp.route('/', methods=['GET'])(get_orders_controller)
+
+# Rutas para obtener pedidos pendientes (solo repartidores)
+orders_async_bp.route('/pending', methods=['GET'])(get_pending_orders_controller)
+
+# Rutas para operaciones sobre un pedido específico
+orders_async_bp.route('/<order_id>', methods=['GET'])(get_order_controller)
+orders_async_bp.route('/<order_id>/assign', methods=['POST'])(assign_order_controller)
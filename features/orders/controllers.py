@@ -28,7 +28,6 @@ def create_order_controller(validated_data):
     Returns:
         Response: Respuesta JSON con el resultado.
     """
-    print("controllller")
     if g.role != 'user':
         return jsonify({
             "error": "Solo los usuarios pueden crear pedidos"
@@ -39,7 +38,6 @@ def create_order_controller(validated_data):
         validated_data['notes'],
         validated_data['address']  # Añadir el parámetro de dirección
     )
-    print()
     if result:
         return jsonify({
             "order": result
@@ -122,7 +120,6 @@ def get_pending_orders_controller():
     skip = int(request.args.get('skip', 0))
     
     result = get_pending_orders(limit, skip)
-    print(result)
     return jsonify(result), 200
 
 @token_required
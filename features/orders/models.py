@@ -23,6 +23,12 @@ class Order:
     STATUS_PROCESSING = "processing"
     STATUS_COMPLETED = "completed"
     
+    # Sin __dict__ por instancia: se cargan miles de pedidos a la vez
+    __slots__ = (
+        "user_id", "notes", "address", "user_info", "status", "courier_id", "courier_info",
+        "created_at", "updated_at", "assigned_at", "completed_at"
+    )
+    
     def __init__(self, user_id, notes, address, user_info=None):
         """
         Inicializa un nuevo pedido.
@@ -71,6 +77,10 @@ class Order:
         """
         Crea una instancia de Order a partir de un diccionario.
         
+        Cada atributo se asigna una sola vez, sin pasar por __init__. Admite
+        documentos leídos con proyección: los campos ausentes toman su valor
+        por defecto.
+        
         Args:
             data (dict): Diccionario con datos del pedido.
             
@@ -80,19 +90,20 @@ class Order:
         if not data:
             return None
         
-        order = cls(
-            user_id=data.get("user_id"),
-            notes=data.get("notes"),
-            address=data.get("address"),
-            user_info=data.get("user_info", {})
-        )
-        order.status = data.get("status", cls.STATUS_PENDING)
-        order.courier_id = data.get("courier_id")
-        order.courier_info = data.get("courier_info", {})
-        order.created_at = data.get("created_at", datetime.utcnow())
-        order.updated_at = data.get("updated_at", datetime.utcnow())
-        order.assigned_at = data.get("assigned_at")
-        order.completed_at = data.get("completed_at")
+        get = data.get
+        now = datetime.utcnow()
+        order = cls.__new__(cls)
+        order.user_id = get("user_id")
+        order.notes = get("notes")
+        order.address = get("address")
+        order.user_info = get("user_info") or {}
+        order.status = get("status", cls.STATUS_PENDING)
+        order.courier_id = get("courier_id")
+        order.courier_info = get("courier_info", {})
+        order.created_at = get("created_at", now)
+        order.updated_at = get("updated_at", now)
+        order.assigned_at = get("assigned_at")
+        order.completed_at = get("completed_at")
         return order
     
     @staticmethod
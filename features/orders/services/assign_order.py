@@ -5,10 +5,12 @@ from core.database import get_db
 from features.orders.models import Order
 from features.auth.services import get_courier_info, update_courier_availability
 from features.notifications.services import send_user_notification
+from core.tracing import traced
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
+@traced
 def assign_order(order_id, courier_id):
     """
     Asigna un pedido a un repartidor.
@@ -5,10 +5,12 @@ from core.database import get_db
 from features.orders.models import Order
 from features.auth.services import update_courier_availability
 from features.notifications.services import send_user_notification
+from core.tracing import traced
 
 
 logger = logging.getLogger(__name__)
 
+@traced
 def complete_order(order_id, courier_id):
     """
     Marca un pedido como completado.
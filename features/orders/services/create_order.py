@@ -1,14 +1,18 @@
 import logging
 from bson import ObjectId
-from datetime import datetime
+from datetime import datetime, timedelta
+from flask import current_app
 from core.database import get_db
 from features.orders.models import Order
 from features.auth.services import get_user_info
-from features.notifications.services import send_notification_to_all_couriers
+from features.notifications.models import Notification, ScheduledNotification
+from features.notifications.services import send_notification_to_all_couriers, schedule_notification
+from core.tracing import traced
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
+@traced
 def create_order(user_id, notes, address):
     """
     Crea un nuevo pedido y envía notificaciones a los repartidores disponibles.
@@ -21,8 +25,6 @@ def create_order(user_id, notes, address):
     Returns:
         dict: Datos del pedido creado o None si hay error.
     """
-    print("SSSSSSSSSSSSSSSSSSSSSSSs")
-    print(notes,address)
     try:
         db = get_db()
 
@@ -63,8 +65,6 @@ def create_order(user_id, notes, address):
                 "order_id": str(order_id),
                 "type": "new_order"
             }
-            print("messaging")
-            print(notification_data)
             # Enviar notificación a todos los repartidores disponibles
             couriers_notified = send_notification_to_all_couriers(
                 title, 
@@ -79,6 +79,20 @@ def create_order(user_id, notes, address):
             # Si hay un error al enviar notificaciones, continuamos y solo lo registramos
             logger.error(f"Error al enviar notificaciones a repartidores: {str(e)}")
         
+        # Programar recordatorio si el pedido sigue pendiente pasado un tiempo
+        reminder_seconds = current_app.config.get('PENDING_ORDER_REMINDER_SECONDS', 0)
+        if reminder_seconds > 0:
+            schedule_notification(
+                ScheduledNotification.TARGET_ALL_COURIERS,
+                "Pedido pendiente",
+                f"El pedido de {user_data.get('name', 'un usuario')} sigue esperando repartidor",
+                datetime.utcnow() + timedelta(seconds=reminder_seconds),
+                data={"order_id": str(order_id)},
+                notification_type=Notification.TYPE_ORDER_PENDING_REMINDER,
+                related_id=str(order_id),
+                required_order_status=Order.STATUS_PENDING
+            )
+        
         return Order.serialize_for_api(order_dict)
     
     except Exception as e:
@@ -2,9 +2,11 @@ import logging
 from bson import ObjectId
 from core.database import get_db
 from features.orders.models import Order
+from core.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+@traced
 def get_courier_orders(courier_id, status=None, limit=10, skip=0):
     """
     Obtiene los pedidos de un repartidor, con filtro opcional por estado.
@@ -31,8 +33,9 @@ def get_courier_orders(courier_id, status=None, limit=10, skip=0):
  
         orders = db.orders.find(query).sort("created_at", -1).skip(skip).limit(limit)
         
-        # Serializar resultados
-        result = [Order.serialize_for_api(order) for order in orders]
+        # Sin copiar ni convertir cada documento: el proveedor JSON de la
+        # aplicación codifica ObjectId y fechas al responder
+        result = list(orders)
         
         # Obtener el total de pedidos para esta consulta (sin límites)
         total_count = db.orders.count_documents(query)
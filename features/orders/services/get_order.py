@@ -2,10 +2,12 @@ import logging
 from bson import ObjectId
 from core.database import get_db
 from features.orders.models import Order
+from core.tracing import traced
 
 
 logger = logging.getLogger(__name__)
 
+@traced
 def get_order(order_id):
     """
     Obtiene un pedido por su ID.
@@ -1,10 +1,13 @@
 import logging
 from core.database import get_db
 from features.orders.models import Order
+from core.tracing import traced
+from core.single_flight import coalesce
 
 
 logger = logging.getLogger(__name__)
 
+@traced
 def get_pending_orders(limit=20, skip=0):
     """
     Obtiene los pedidos pendientes disponibles para los repartidores.
@@ -17,33 +20,37 @@ def get_pending_orders(limit=20, skip=0):
         dict: Diccionario con lista de pedidos pendientes y metadatos de paginación.
     """
     try:
-        db = get_db()
-        
-        # Construir filtro para pedidos pendientes
-        query = {"status": Order.STATUS_PENDING}
-        
-        # Ejecutar consulta
-        pending_orders = db.orders.find(query).sort("created_at", 1).skip(skip).limit(limit)
-        
-        # Serializar resultados
-        result = [Order.serialize_for_api(order) for order in pending_orders]
-        
-        # Obtener el total de pedidos pendientes
-        total_count = db.orders.count_documents(query)
-        
-        # Construir respuesta con metadatos
-        response = {
-            "orders": result,
-            "metadata": {
-                "total": total_count,
-                "limit": limit,
-                "skip": skip,
-                "has_more": (skip + limit) < total_count
-            }
-        }
-        
-        return response
+        # La misma página es igual para todos los repartidores: las
+        # peticiones idénticas simultáneas comparten una sola consulta
+        return coalesce('orders.pending', _load_pending_orders, limit=limit, skip=skip)
     
     except Exception as e:
         logger.error(f"Error al obtener pedidos pendientes: {str(e)}")
-        return {"orders": [], "metadata": {"total": 0, "limit": limit, "skip": skip, "has_more": False}}
\ No newline at end of file
+        return {"orders": [], "metadata": {"total": 0, "limit": limit, "skip": skip, "has_more": False}}
+
+def _load_pending_orders(limit, skip):
+    db = get_db()
+    
+    # Construir filtro para pedidos pendientes
+    query = {"status": Order.STATUS_PENDING}
+    
+    # Ejecutar consulta
+    pending_orders = db.orders.find(query).sort("created_at", 1).skip(skip).limit(limit)
+    
+    # Sin copiar ni convertir cada documento: el proveedor JSON de la
+    # aplicación codifica ObjectId y fechas al responder
+    result = list(pending_orders)
+    
+    # Obtener el total de pedidos pendientes
+    total_count = db.orders.count_documents(query)
+    
+    # Construir respuesta con metadatos
+    return {
+        "orders": result,
+        "metadata": {
+            "total": total_count,
+            "limit": limit,
+            "skip": skip,
+            "has_more": (skip + limit) < total_count
+        }
+    }
@@ -2,10 +2,12 @@ import logging
 from bson import ObjectId
 from core.database import get_db
 from features.orders.models import Order
+from core.tracing import traced
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
+@traced
 def get_user_orders(user_id, status=None, limit=10, skip=0):
     """
     Obtiene los pedidos de un usuario, con filtro opcional por estado.
@@ -33,8 +35,9 @@ def get_user_orders(user_id, status=None, limit=10, skip=0):
         # Ejecutar consulta
         orders = db.orders.find(query).sort("created_at", -1).skip(skip).limit(limit)
         
-        # Serializar resultados
-        result = [Order.serialize_for_api(order) for order in orders]
+        # Sin copiar ni convertir cada documento: el proveedor JSON de la
+        # aplicación codifica ObjectId y fechas al responder
+        result = list(orders)
         
         # Obtener el total de pedidos para esta consulta (sin límites)
         total_count = db.orders.count_documents(query)
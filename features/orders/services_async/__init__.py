@@ -0,0 +1,7 @@
+# Versiones asíncronas (motor) de los servicios usados por la API ASGI
+
+from features.orders.services_async.assign_order import assign_order
+from features.orders.services_async.get_order import get_order
+from features.orders.services_async.get_user_orders import get_user_orders
+from features.orders.services_async.get_courier_orders import get_courier_orders
+from features.orders.services_async.get_pending_orders import get_pending_orders
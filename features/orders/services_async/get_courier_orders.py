@@ -0,0 +1,51 @@
+import asyncio
+import logging
+from bson import ObjectId
+from core.async_database import get_async_db
+from features.orders.models import Order
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+@traced
+async def get_courier_orders(courier_id, status=None, limit=10, skip=0):
+    """
+    Obtiene los pedidos de un repartidor, con filtro opcional por estado.
+    Versión asíncrona de features.orders.services.get_courier_orders.
+    
+    Args:
+        courier_id (str): ID del repartidor.
+        status (str, optional): Estado de los pedidos a filtrar.
+        limit (int, optional): Límite de resultados. Por defecto 10.
+        skip (int, optional): Número de resultados a saltar (para paginación).
+    
+    Returns:
+        dict: Diccionario con lista de pedidos y metadatos de paginación.
+    """
+    try:
+        db = get_async_db()
+        
+        # Construir filtro
+        query = {"courier_id": ObjectId(courier_id)}
+        if status and status in [Order.STATUS_PROCESSING, Order.STATUS_COMPLETED]:
+            query["status"] = status
+        
+        # La página y el total se consultan a la vez
+        orders, total_count = await asyncio.gather(
+            db.orders.find(query).sort("created_at", -1).skip(skip).limit(limit).to_list(length=None),
+            db.orders.count_documents(query)
+        )
+        
+        return {
+            "orders": [Order.serialize_for_api(order) for order in orders],
+            "metadata": {
+                "total": total_count,
+                "limit": limit,
+                "skip": skip,
+                "has_more": (skip + limit) < total_count
+            }
+        }
+    
+    except Exception as e:
+        logger.error(f"Error al obtener pedidos del repartidor: {str(e)}")
+        return {"orders": [], "metadata": {"total": 0, "limit": limit, "skip": skip, "has_more": False}}
@@ -0,0 +1,35 @@
+import logging
+from bson import ObjectId
+from core.async_database import get_async_db
+from features.orders.models import Order
+from core.tracing import traced
+
+
+logger = logging.getLogger(__name__)
+
+@traced
+async def get_order(order_id):
+    """
+    Obtiene un pedido por su ID.
+    Versión asíncrona de features.orders.services.get_order.
+    
+    Args:
+        order_id (str): ID del pedido.
+    
+    Returns:
+        dict: Datos del pedido o None si no se encuentra.
+    """
+    try:
+        db = get_async_db()
+        
+        order = await db.orders.find_one({"_id": ObjectId(order_id)})
+        
+        if not order:
+            logger.warning(f"Pedido no encontrado: {order_id}")
+            return None
+        
+        return Order.serialize_for_api(order)
+    
+    except Exception as e:
+        logger.error(f"Error al obtener pedido: {str(e)}")
+        return None
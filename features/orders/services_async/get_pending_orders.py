@@ -0,0 +1,52 @@
+import asyncio
+import logging
+from core.async_database import get_async_db, coalesce_async
+from features.orders.models import Order
+from core.tracing import traced
+
+
+logger = logging.getLogger(__name__)
+
+@traced
+async def get_pending_orders(limit=20, skip=0):
+    """
+    Obtiene los pedidos pendientes disponibles para los repartidores.
+    Versión asíncrona de features.orders.services.get_pending_orders.
+    
+    Args:
+        limit (int, optional): Límite de resultados. Por defecto 20.
+        skip (int, optional): Número de resultados a saltar (para paginación).
+    
+    Returns:
+        dict: Diccionario con lista de pedidos pendientes y metadatos de paginación.
+    """
+    try:
+        # Las peticiones idénticas simultáneas comparten una sola consulta
+        return await coalesce_async('orders.pending', _load_pending_orders, limit=limit, skip=skip)
+    
+    except Exception as e:
+        logger.error(f"Error al obtener pedidos pendientes: {str(e)}")
+        return {"orders": [], "metadata": {"total": 0, "limit": limit, "skip": skip, "has_more": False}}
+
+
+async def _load_pending_orders(limit, skip):
+    db = get_async_db()
+    
+    # Construir filtro para pedidos pendientes
+    query = {"status": Order.STATUS_PENDING}
+    
+    # La página y el total se consultan a la vez
+    pending_orders, total_count = await asyncio.gather(
+        db.orders.find(query).sort("created_at", 1).skip(skip).limit(limit).to_list(length=None),
+        db.orders.count_documents(query)
+    )
+    
+    return {
+        "orders": [Order.serialize_for_api(order) for order in pending_orders],
+        "metadata": {
+            "total": total_count,
+            "limit": limit,
+            "skip": skip,
+            "has_more": (skip + limit) < total_count
+        }
+    }
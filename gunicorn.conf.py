@@ -0,0 +1,105 @@
+"""
+Configuración de gunicorn para producción.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Todos los valores se pueden ajustar con variables de entorno.
+"""
+import multiprocessing
+import os
+
+# Servidor
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+backlog = int(os.getenv('GUNICORN_BACKLOG', 2048))
+
+# Workers: procesos con hilos (gthread), ya que la mayor parte del tiempo de
+# una petición es espera de MongoDB o FCM
+worker_class = 'gthread'
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+# Conexiones
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+
+# Reciclar workers periódicamente para acotar fugas de memoria;
+# el jitter evita que todos se reinicien a la vez
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Al recibir SIGTERM se deja de aceptar conexiones y se espera a que terminen
+# las peticiones en curso durante este tiempo
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+# Con preload la aplicación se crea en el master antes de hacer fork; los
+# clientes de MongoDB/Firebase y el pool de hashing se recrean en cada worker
+preload_app = os.getenv('GUNICORN_PRELOAD', 'False') == 'True'
+
+# Los hilos en segundo plano no se arrancan en el master: un lock tomado por
+# uno de ellos durante el fork quedaría bloqueado en el worker. Se arrancan
+# en post_worker_init
+if preload_app:
+    os.environ['BACKGROUND_SERVICES_AUTOSTART'] = 'False'
+
+# Logs
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.getenv('GUNICORN_ERROR_LOG', '-')
+loglevel = os.getenv('LOG_LEVEL', 'INFO').lower()
+
+
+def on_starting(server):
+    """
+    Vacía el directorio de métricas multiproceso de Prometheus
+    (PROMETHEUS_MULTIPROC_DIR) para no mezclar valores de ejecuciones anteriores.
+    """
+    metrics_dir = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if not metrics_dir:
+        return
+    os.makedirs(metrics_dir, exist_ok=True)
+    for name in os.listdir(metrics_dir):
+        if name.endswith('.db'):
+            os.remove(os.path.join(metrics_dir, name))
+
+
+def post_fork(server, worker):
+    """
+    Descarta los clientes de MongoDB y Firebase heredados del master (solo
+    existen con preload_app), ya que no son seguros tras un fork.
+    """
+    from core.database import reset_client
+    from core.firebase_admin import reset_firebase
+
+    reset_client()
+    reset_firebase()
+
+
+def post_worker_init(worker):
+    """
+    Arranca en el worker los hilos en segundo plano. Con preload_app no se
+    arrancaron en el master; sin preload ya están en marcha y no se repiten.
+    """
+    from app import start_background_services
+
+    start_background_services(worker.wsgi)
+
+
+def worker_exit(server, worker):
+    """
+    Detiene los trabajadores en segundo plano y libera los recursos
+    del worker tras el cierre ordenado.
+    """
+    from app import shutdown_app
+
+    app = getattr(worker, 'wsgi', None)
+    if app is not None:
+        shutdown_app(app)
+
+
+def child_exit(server, worker):
+    """
+    Descarta los gauges del worker terminado de las métricas multiproceso.
+    """
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,6 +1,37 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app
 from functools import wraps
 from marshmallow import ValidationError
+from core.tracing import start_span
+from schemas.compiler import compile_schema
+import threading
+
+# schema_class -> (schema.load, función compilada o schema.load)
+_loaders = {}
+_loaders_lock = threading.Lock()
+
+
+def get_schema_loader(schema_class, compiled=True):
+    """
+    Obtiene la función de carga de un esquema. La instancia del esquema se
+    crea una sola vez por proceso y se comparte entre hilos: Marshmallow no
+    guarda estado de la carga en la instancia.
+    
+    Args:
+        schema_class: La clase de esquema Marshmallow.
+        compiled (bool): Usar el validador compilado si el esquema lo admite.
+    
+    Returns:
+        function: Función `load(data)` que lanza ValidationError.
+    """
+    loaders = _loaders.get(schema_class)
+    if loaders is None:
+        with _loaders_lock:
+            loaders = _loaders.get(schema_class)
+            if loaders is None:
+                schema = schema_class()
+                loaders = (schema.load, compile_schema(schema) or schema.load)
+                _loaders[schema_class] = loaders
+    return loaders[1] if compiled else loaders[0]
 
 def validate_schema(schema_class):
     """
@@ -15,8 +46,7 @@ def validate_schema(schema_class):
     def decorator(f):
         @wraps(f)
         def wrapper(*args, **kwargs):
-            # Crear instancia del esquema
-            schema = schema_class()
+            load = get_schema_loader(schema_class, current_app.config.get('SCHEMA_COMPILED_VALIDATORS', True))
             # Obtener datos de la petición según el método
             if request.method == 'GET':
                 data = request.args.to_dict()
@@ -29,7 +59,8 @@ def validate_schema(schema_class):
             
             try:
                 # Validar datos
-                validated_data = schema.load(data)
+                with start_span('validate_schema', {"schema": schema_class.__name__}):
+                    validated_data = load(data)
                 
                 # Añadir los datos validados a los argumentos
                 kwargs['validated_data'] = validated_data
@@ -37,7 +68,6 @@ def validate_schema(schema_class):
                 return f(*args, **kwargs)
             
             except ValidationError as err:
-                print(err)
                 # Devolver errores de validación
                 return jsonify({
                     "error": "Error de validación",
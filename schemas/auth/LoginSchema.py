@@ -1,4 +1,5 @@
-from marshmallow import Schema, fields, validates, ValidationError
+from marshmallow import Schema, fields, validate, validates, ValidationError
+from features.auth.models import DeviceToken
 
 class LoginSchema(Schema):
     """
@@ -8,6 +9,7 @@ class LoginSchema(Schema):
     email = fields.Email(required=True, error_messages={"required": "El correo electrónico es obligatorio"})
     password = fields.Str(required=True, error_messages={"required": "La contraseña es obligatoria"})
     fcm_token = fields.Str(required=True, error_messages={"required": "El token FCM es obligatorio"})
+    platform = fields.Str(required=False, validate=validate.OneOf(DeviceToken.PLATFORMS))
     
     @validates('fcm_token')
     def validate_fcm_token(self, value):
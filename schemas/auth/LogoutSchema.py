@@ -0,0 +1,8 @@
+from marshmallow import Schema, fields
+
+class LogoutSchema(Schema):
+    """
+    Esquema para validar el cierre de sesión.
+    El token de refresco es opcional; si se envía, también se revoca.
+    """
+    refresh_token = fields.Str(required=False)
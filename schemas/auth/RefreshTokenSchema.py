@@ -0,0 +1,7 @@
+from marshmallow import Schema, fields
+
+class RefreshTokenSchema(Schema):
+    """
+    Esquema para validar el canje de un token de refresco.
+    """
+    refresh_token = fields.Str(required=True, error_messages={"required": "El token de refresco es obligatorio"})
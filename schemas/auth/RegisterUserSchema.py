@@ -1,4 +1,5 @@
 from marshmallow import Schema, fields, validate, validates, ValidationError
+from features.auth.models import DeviceToken
 import re
 
 class RegisterUserSchema(Schema):
@@ -14,6 +15,7 @@ class RegisterUserSchema(Schema):
     password = fields.Str(required=True, validate=validate.Length(min=6), 
                          error_messages={"required": "La contraseña es obligatoria"})
     fcm_token = fields.Str(required=True, error_messages={"required": "El token FCM es obligatorio"})
+    platform = fields.Str(required=False, validate=validate.OneOf(DeviceToken.PLATFORMS))
     
     @validates('phone')
     def validate_phone(self, value):
@@ -1,10 +1,12 @@
-from marshmallow import Schema, fields, validates, ValidationError
+from marshmallow import Schema, fields, validate, validates, ValidationError
+from features.auth.models import DeviceToken
 
 class UpdateFCMTokenSchema(Schema):
     """
     Esquema para validar la actualización del token FCM.
     """
     fcm_token = fields.Str(required=True, error_messages={"required": "El token FCM es obligatorio"})
+    platform = fields.Str(required=False, validate=validate.OneOf(DeviceToken.PLATFORMS))
     
     @validates('fcm_token')
     def validate_fcm_token(self, value):
@@ -1,4 +1,6 @@
 from schemas.auth.LoginSchema import LoginSchema
+from schemas.auth.LogoutSchema import LogoutSchema
+from schemas.auth.RefreshTokenSchema import RefreshTokenSchema
 from schemas.auth.RegisterCourierSchema import RegisterCourierSchema
 from schemas.auth.RegisterUserSchema import RegisterUserSchema
 from schemas.auth.UpdateFCMTokenSchema import UpdateFCMTokenSchema
\ No newline at end of file
@@ -0,0 +1,120 @@
+from collections.abc import Mapping
+from marshmallow import ValidationError, RAISE, INCLUDE, fields
+from marshmallow.decorators import VALIDATES
+from marshmallow.error_store import merge_errors
+from marshmallow.utils import missing
+
+
+def compile_schema(schema):
+    """
+    Compila una instancia de esquema en una función de carga equivalente a
+    `schema.load(data)` para el caso sencillo (sin many, partial ni hooks
+    pre_load/post_load/validates_schema).
+
+    La función precalcula la lista de campos, sus claves y los hooks
+    @validates, y llama directamente a `field.deserialize`, así que los
+    mensajes de error son los mismos que los de Marshmallow. Se evita el
+    recorrido genérico de Schema._do_load en cada petición.
+
+    Args:
+        schema (Schema): Instancia del esquema, compartida entre hilos.
+
+    Returns:
+        function: Función `load(data) -> dict` que lanza ValidationError,
+            o None si el esquema usa algo que el compilador no soporta.
+    """
+    hooks = dict(schema._hooks)
+    if any(hooks.get(tag) for tag in hooks if tag != VALIDATES):
+        return None
+    if any(getattr(field, 'attribute', None) and '.' in field.attribute for field in schema.load_fields.values()):
+        return None
+
+    # (clave de entrada, clave de salida, función de carga)
+    plan = []
+    for attr_name, field in schema.load_fields.items():
+        data_key = field.data_key if field.data_key is not None else attr_name
+        plan.append((data_key, field.attribute or attr_name, _field_loader(field)))
+
+    known_keys = frozenset(data_key for data_key, _, _ in plan)
+    unknown = schema.unknown
+    invalid_input = [schema.error_messages["type"]]
+    unknown_field = [schema.error_messages["unknown"]]
+
+    # (clave en el resultado, clave del error, validador ligado a la instancia)
+    validators = []
+    for attr_name in hooks.get(VALIDATES, []):
+        validator = getattr(schema, attr_name)
+        field_name = validator.__marshmallow_hook__[VALIDATES]["field_name"]
+        field = schema.fields.get(field_name)
+        if field is None:
+            if field_name in schema.declared_fields:
+                continue
+            return None
+        data_key = field.data_key if field.data_key is not None else field_name
+        validators.append((field.attribute or field_name, data_key, validator))
+
+    def load(data):
+        if not isinstance(data, Mapping):
+            raise ValidationError({"_schema": invalid_input}, data=data, valid_data={})
+
+        result = {}
+        errors = None
+
+        for data_key, output_key, loader in plan:
+            try:
+                value = loader(data.get(data_key, missing), data_key, data)
+            except ValidationError as error:
+                errors = _store(errors, data_key, error.messages)
+                value = error.valid_data or missing
+            if value is not missing:
+                result[output_key] = value
+
+        if unknown == RAISE:
+            for key in data.keys() - known_keys:
+                errors = _store(errors, key, unknown_field)
+        elif unknown == INCLUDE:
+            for key in data.keys() - known_keys:
+                result[key] = data[key]
+
+        for output_key, error_key, validator in validators:
+            if output_key not in result:
+                continue
+            try:
+                validator(result[output_key])
+            except ValidationError as error:
+                errors = _store(errors, error_key, error.messages)
+                result.pop(output_key, None)
+
+        if errors:
+            raise ValidationError(errors, data=data, valid_data=result)
+        return result
+
+    return load
+
+def _field_loader(field):
+    """
+    Devuelve la función de carga de un campo. Para los String con un valor
+    str (el caso habitual) se evita el recorrido genérico de
+    `field.deserialize`; el resto de casos, incluidos los errores, los
+    resuelve Marshmallow.
+    """
+    if type(field) is not fields.String:
+        return field.deserialize
+
+    deserialize = field.deserialize
+    validate = field._validate if field.validators else None
+
+    def load_string(value, attr, data):
+        if value.__class__ is not str:
+            return deserialize(value, attr, data)
+        if validate is not None:
+            validate(value)
+        return value
+
+    return load_string
+
+def _store(errors, key, messages):
+    if errors is None:
+        errors = {}
+    errors[key] = merge_errors(errors[key], messages) if key in errors else messages
+    return errors